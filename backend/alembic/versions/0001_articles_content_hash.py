@@ -0,0 +1,48 @@
+"""Add articles.content_hash
+
+Articles point at their deduplicated text in article_texts. Databases
+created since this column exists already have it (tables are created at
+startup), so each step is skipped when already applied.
+
+Revision ID: 0001_articles_content_hash
+Revises:
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.article_text import ArticleText
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001_articles_content_hash'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # The column references article_texts, which older databases do not have yet
+    ArticleText.__table__.create(bind, checkfirst=True)
+
+    inspector = sa.inspect(bind)
+    if "content_hash" not in {column["name"] for column in inspector.get_columns("articles")}:
+        # Batch mode lets SQLite (which cannot ALTER constraints) rebuild the table
+        with op.batch_alter_table("articles") as batch:
+            batch.add_column(sa.Column("content_hash", sa.String(64), nullable=True))
+            batch.create_foreign_key(
+                "fk_articles_content_hash_article_texts", "article_texts", ["content_hash"], ["hash"]
+            )
+    if "ix_articles_content_hash" not in {index["name"] for index in inspector.get_indexes("articles")}:
+        op.create_index("ix_articles_content_hash", "articles", ["content_hash"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_articles_content_hash", table_name="articles")
+    # The foreign key goes with the column (whatever it was named by create_all)
+    with op.batch_alter_table("articles") as batch:
+        batch.drop_column("content_hash")
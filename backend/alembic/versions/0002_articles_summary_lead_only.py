@@ -0,0 +1,36 @@
+"""Add articles.summary_lead_only
+
+Lazy extractions summarize the lead section only; the flag tells those
+articles apart. Existing rows were summarized from the whole page. Skipped
+when the column already exists (tables are created at startup).
+
+Revision ID: 0002_articles_summary_lead_only
+Revises: 0001_articles_content_hash
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002_articles_summary_lead_only'
+down_revision: Union[str, None] = '0001_articles_content_hash'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "summary_lead_only" not in {column["name"] for column in inspector.get_columns("articles")}:
+        with op.batch_alter_table("articles") as batch:
+            batch.add_column(
+                sa.Column("summary_lead_only", sa.Boolean(), nullable=False, server_default=sa.false())
+            )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("articles") as batch:
+        batch.drop_column("summary_lead_only")
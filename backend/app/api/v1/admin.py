@@ -1,5 +1,12 @@
-# Admin routes: get_statistics, manage_users, delete_user
-from fastapi import APIRouter
+# Admin routes: get_statistics, manage_users, delete_user, cache_stats, purge_translation_cache, llm_rate_limits
+import asyncio
+from fastapi import APIRouter, Depends
+from app.api.deps import get_current_admin
+from app.services.article_cache import article_cache
+from app.services.title_cache import title_cache
+from app.services.llm_cache import llm_cache
+from app.services.llm_service import get_async_llm_service
+from app.services.translation_memory import translation_memory
 
 router = APIRouter()
 
@@ -12,3 +19,32 @@ async def get_statistics():
 async def get_users():
     """Get all users"""
     return {"message": "Get users endpoint"}
+
+@router.get("/cache")
+async def get_cache_stats(current_admin = Depends(get_current_admin)):
+    """Get hit/miss counters of the article, title and LLM result caches and of the translation memory"""
+    return {
+        "articles": article_cache.stats(),
+        "titles": title_cache.stats(),
+        "llm": llm_cache.stats(),
+        "translation_memory": translation_memory.stats()
+    }
+
+@router.delete("/cache/translations")
+async def purge_translation_cache(current_admin = Depends(get_current_admin)):
+    """Drop every cached translation and the sentence translation memory (e.g. after a translation quality issue)"""
+    return {
+        "purged": await asyncio.to_thread(llm_cache.purge, "translation"),
+        "translation_memory_purged": await asyncio.to_thread(translation_memory.purge),
+    }
+
+@router.get("/llm/limits")
+async def get_llm_rate_limits(current_admin = Depends(get_current_admin)):
+    """Per-provider LLM load (in-flight calls, concurrency limit, queue, waits, 429s) and translation batching savings"""
+    service = get_async_llm_service()
+    return {**service.rate_limit_stats(), "translation_batching": service.translation_batcher.stats()}
+
+@router.get("/llm/breakers")
+async def get_llm_breakers(current_admin = Depends(get_current_admin)):
+    """Per-provider circuit breaker state (closed, open, half_open), consecutive failures, fast-failed calls"""
+    return get_async_llm_service().breaker_stats()
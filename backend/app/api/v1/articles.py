@@ -1,21 +1,39 @@
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, status
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Path, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Dict, Optional, List
+from typing import Annotated, Dict, Literal, Optional, List
 from pydantic import BaseModel
 import tempfile
+import json
 import os
 
 # App Imports
 from app.api.deps import get_db, get_current_user
+from app.core.config import settings
 from app.services.pdf_service import extract_text_from_pdf
-from app.services.content_extractor import get_wikipedia_content
-from app.services.llm_service import LLMService
-from app.schemas.article import WikiRequest
+from app.services.content_extractor import (
+    SUMMARY_TYPES,
+    get_wikipedia_content,
+    get_wikipedia_outline,
+    get_wikipedia_section,
+    iter_wikipedia_contents,
+    normalize_wikipedia_url
+)
+from app.services.job_queue import job_queue
+from app.services.llm_service import get_async_llm_service
+from app.services.text_store import store_article_text
+from app.services.wikipedia_client import LANGUAGE_PATTERN
+from app.schemas.article import WikiRequest, WikiBatchRequest
 from app.models.user import User
 from app.models.article import Article, ActionType
+from app.core.exceptions import AppException
+from app.utils.singleflight import SingleFlight
+from app.utils.sse import SSE_HEADERS, sse_text_stream
 
 router = APIRouter()
-llm_service = LLMService()
+
+# Concurrent extractions of the same article share one pipeline run
+wiki_pipeline = SingleFlight()
 
 # --- Schemas ---
 class TranslationRequest(BaseModel):
@@ -24,43 +42,140 @@ class TranslationRequest(BaseModel):
 
 # --- Routes ---
 
+async def _save_pdf_upload(file: UploadFile) -> str:
+    if not file.filename.lower().endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="Only PDF files are allowed")
+
+    # Save to a temp file, removed by the caller once the extraction is over
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
+        temp_file.write(await file.read())
+        return temp_file.name
+
+
+def _remove_pdf_upload(temp_path: str) -> None:
+    try:
+        os.remove(temp_path)
+    except FileNotFoundError:
+        pass
+
+
+async def run_pdf_extraction(temp_path: str, filename: str, user_id: int, db: Session) -> Dict:
+    """Extract, summarize and save an uploaded PDF (request or background job); the file is kept"""
+    # Process
+    extraction_result = await extract_text_from_pdf(temp_path, clean_up=False)
+    await _add_summaries(extraction_result, extraction_result["full_text"])
+
+    # Save to DB
+    new_article = Article(
+        user_id=user_id,
+        url=f"pdf://{filename}",
+        title=filename,
+        action=ActionType.SUMMARY,
+        content_hash=store_article_text(db, extraction_result["full_text"])
+    )
+    db.add(new_article)
+    db.commit()
+    db.refresh(new_article)
+
+    return {
+        "status": "success",
+        "article_id": new_article.id,
+        "data": extraction_result
+    }
+
+
 @router.post("/extract-pdf")
 async def extract_pdf(
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ) -> Dict:
-    if not file.filename.lower().endswith('.pdf'):
-        raise HTTPException(status_code=400, detail="Only PDF files are allowed")
+    temp_path = await _save_pdf_upload(file)
+    try:
+        return await run_pdf_extraction(temp_path, file.filename, current_user.id, db)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"PDF Processing failed: {str(e)}")
+    finally:
+        _remove_pdf_upload(temp_path)
+
 
+@router.post("/extract-pdf/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def submit_pdf_extraction(
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_user)
+) -> Dict:
+    """
+    Same work as /extract-pdf, run by a background worker: returns a job
+    id at once; poll /jobs/{job_id} or follow /jobs/{job_id}/events.
+    """
+    temp_path = await _save_pdf_upload(file)
     try:
-        # Save and Read Temp File
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-            temp_file.write(await file.read())
-            temp_path = temp_file.name
-
-        # Process
-        extraction_result = await extract_text_from_pdf(temp_path, clean_up=True)
-        
-        # Save to DB
-        new_article = Article(
-            user_id=current_user.id,
-            url=f"pdf://{file.filename}",
-            title=file.filename,
-            action=ActionType.SUMMARY
+        job = await job_queue.submit(
+            "extract_pdf", current_user.id, {"temp_path": temp_path, "filename": file.filename}
         )
-        db.add(new_article)
-        db.commit()
-        db.refresh(new_article)
+    except Exception:
+        # No job will ever own the file
+        _remove_pdf_upload(temp_path)
+        raise
+    return _accepted(job)
 
-        return {
-            "status": "success",
-            "article_id": new_article.id,
-            "data": extraction_result
-        }
-        
+
+async def _add_summaries(content: Dict, text: str) -> None:
+    # Summarize the whole text (map-reduced when long) under one deadline,
+    # served from the LLM result cache when already generated. Fail silently
+    # if AI fails to keep app running: whichever summaries are ready are added.
+    try:
+        summaries = await get_async_llm_service().summarize_document(
+            text,
+            SUMMARY_TYPES,
+            timeout=settings.SUMMARY_DEADLINE_SECONDS
+        )
+        for summary_type, summary in summaries.items():
+            content[f"ai_summary_{summary_type}"] = summary
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"PDF Processing failed: {str(e)}")
+        print(f"AI Summary warning: {e}")
+
+
+async def _extract_and_summarize(url: str, lazy_sections: bool = False) -> Dict:
+    # 1. Extract (lead + table of contents only in lazy mode)
+    if lazy_sections:
+        wiki_content = await get_wikipedia_outline(url)
+    else:
+        wiki_content = await get_wikipedia_content(url)
+
+    # 2. Generate Summaries (of the lead alone in lazy mode: say so to the client)
+    await _add_summaries(wiki_content, wiki_content["content"])
+    wiki_content["summary_lead_only"] = lazy_sections
+
+    return wiki_content
+
+
+async def run_wiki_extraction(url: str, lazy_sections: bool, user_id: int, db: Session) -> Dict:
+    """Extract, summarize and save a Wikipedia article (request or background job)"""
+    # 1-2. Extract and summarize, coalesced by normalized URL
+    wiki_content = dict(await wiki_pipeline.do(
+        (normalize_wikipedia_url(url), lazy_sections),
+        lambda: _extract_and_summarize(url, lazy_sections)
+    ))
+
+    # 3. Save to DB
+    new_article = Article(
+        user_id=user_id,
+        url=url,
+        title=wiki_content.get("title", "Unknown Title"),
+        action=ActionType.SUMMARY,
+        content_hash=store_article_text(db, wiki_content.get("content")),
+        summary_lead_only=wiki_content.get("summary_lead_only", False)
+    )
+    db.add(new_article)
+    db.commit()
+    db.refresh(new_article)
+
+    return {
+        "status": "success",
+        "article_id": new_article.id,
+        "data": wiki_content
+    }
 
 
 @router.post("/extract-wiki")
@@ -70,36 +185,102 @@ async def extract_wikipedia(
     db: Session = Depends(get_db)
 ) -> Dict:
     try:
-        # 1. Extract
-        wiki_content = get_wikipedia_content(str(request.url))
-        
-        # 2. Generate Summaries (Fail silently if AI fails to keep app running)
-        try:
-            content_snippet = wiki_content["content"][:8000]
-            wiki_content["ai_summary_short"] = llm_service.generate_summary(content_snippet, "short")
-            wiki_content["ai_summary_medium"] = llm_service.generate_summary(content_snippet, "medium")
-        except Exception as e:
-            print(f"AI Summary warning: {e}")
-
-        # 3. Save to DB
-        new_article = Article(
-            user_id=current_user.id,
-            url=str(request.url),
-            title=wiki_content.get("title", "Unknown Title"),
-            action=ActionType.SUMMARY
-        )
-        db.add(new_article)
-        db.commit()
-        db.refresh(new_article)
+        return await run_wiki_extraction(str(request.url), request.lazy_sections, current_user.id, db)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Wiki extraction failed: {str(e)}")
 
-        return {
-            "status": "success",
-            "article_id": new_article.id,
-            "data": wiki_content
-        }
 
+@router.post("/extract-wiki/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def submit_wikipedia_extraction(
+    request: WikiRequest,
+    current_user: User = Depends(get_current_user)
+) -> Dict:
+    """
+    Same work as /extract-wiki, run by a background worker: returns a job
+    id at once; poll /jobs/{job_id} or follow /jobs/{job_id}/events.
+    """
+    job = await job_queue.submit(
+        "extract_wiki", current_user.id, {"url": str(request.url), "lazy_sections": request.lazy_sections}
+    )
+    return _accepted(job)
+
+
+def _accepted(job: Dict) -> Dict:
+    return {
+        "status": job["status"],
+        "job_id": job["job_id"],
+        "status_url": f"/api/v1/jobs/{job['job_id']}",
+        "events_url": f"/api/v1/jobs/{job['job_id']}/events"
+    }
+
+
+async def _wiki_job(payload: Dict, user_id: int, db: Session) -> Dict:
+    return await run_wiki_extraction(payload["url"], payload["lazy_sections"], user_id, db)
+
+
+async def _pdf_job(payload: Dict, user_id: int, db: Session) -> Dict:
+    return await run_pdf_extraction(payload["temp_path"], payload["filename"], user_id, db)
+
+
+def _pdf_job_cleanup(payload: Dict) -> None:
+    """The upload is kept while the job may still run (retries after a requeue), then removed"""
+    _remove_pdf_upload(payload["temp_path"])
+
+
+job_queue.register("extract_wiki", _wiki_job)
+job_queue.register("extract_pdf", _pdf_job, cleanup=_pdf_job_cleanup)
+
+
+@router.post("/extract-wiki/batch")
+async def extract_wikipedia_batch(
+    request: WikiBatchRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> StreamingResponse:
+    """
+    Extracts a list of Wikipedia articles (e.g. a whole syllabus) and
+    streams one NDJSON line per article as soon as it is ready.
+    """
+    async def stream():
+        async for result in iter_wikipedia_contents([str(url) for url in request.urls]):
+            if result["status"] == "success":
+                new_article = Article(
+                    user_id=current_user.id,
+                    url=result["url"],
+                    title=result["data"].get("title", "Unknown Title"),
+                    action=ActionType.SUMMARY,
+                    content_hash=store_article_text(db, result["data"].get("content"))
+                )
+                db.add(new_article)
+                db.commit()
+                result["article_id"] = new_article.id
+            yield json.dumps(result, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@router.get("/wiki/{language}/{title:path}/sections/{index}")
+async def get_wikipedia_article_section(
+    language: Annotated[str, Path(pattern=LANGUAGE_PATTERN)],
+    title: str,
+    index: int,
+    current_user: User = Depends(get_current_user)
+) -> Dict:
+    """
+    Returns the plain text of a single section of a Wikipedia article,
+    as listed in the "sections" of a lazy /extract-wiki response.
+    """
+    try:
+        section = await get_wikipedia_section(language, title, index)
+    except AppException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Wiki extraction failed: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Section extraction failed: {str(e)}")
+
+    return {
+        "status": "success",
+        "data": section
+    }
 
 
 @router.post("/translate")
@@ -113,7 +294,7 @@ async def translate_text(
     """
     try:
         # 1. Call the LLM Service
-        translated_text = llm_service.get_translation(
+        translated_text = await get_async_llm_service().get_translation(
             text=request.text, 
             target_language=request.target_language
         )
@@ -137,6 +318,9 @@ async def translate_text(
             "article_id": new_article.id
         }
 
+    except AppException:
+        # e.g. LLM rate limit queue timeout: 503, retryable
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Translation failed: {str(e)}")
 
@@ -175,4 +359,50 @@ async def get_article(
     if not article:
         raise HTTPException(status_code=404, detail="Article not found")
     
-    return {"article": article}
\ No newline at end of file
+    return {"article": article}
+
+
+@router.get("/{article_id}/content")
+async def get_article_content(
+    article_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Extracted text of an article, decompressed on request"""
+    article = db.query(Article).filter(
+        Article.id == article_id,
+        Article.user_id == current_user.id
+    ).first()
+
+    if not article:
+        raise HTTPException(status_code=404, detail="Article not found")
+    if article.content_hash is None:
+        raise HTTPException(status_code=404, detail="No stored text for this article")
+
+    return {"article_id": article.id, "content_hash": article.content_hash, "content": article.content}
+
+
+@router.get("/{article_id}/summary/stream")
+async def stream_article_summary(
+    article_id: int,
+    summary_type: Literal["short", "medium"] = "short",
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> StreamingResponse:
+    """Summary of a stored article, streamed as Server-Sent Events"""
+    article = db.query(Article).filter(
+        Article.id == article_id,
+        Article.user_id == current_user.id
+    ).first()
+
+    if not article:
+        raise HTTPException(status_code=404, detail="Article not found")
+    if article.content_hash is None:
+        raise HTTPException(status_code=404, detail="No stored text for this article")
+
+    chunks = get_async_llm_service().stream_document_summary(article.content, summary_type)
+    return StreamingResponse(
+        sse_text_stream(chunks, {"article_id": article.id, "summary_type": summary_type}),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
@@ -1,8 +1,13 @@
 # Content routes: summarize, translate, export_pdf, export_txt
-from fastapi import APIRouter, HTTPException, Depends
+import json
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from app.services.llm_service import LLMService
+from app.services.llm_service import get_async_llm_service
 from app.api.deps import get_current_user
+from app.core.exceptions import AppException
+from app.schemas.article import SummaryStreamRequest
+from app.utils.sse import SSE_HEADERS, sse_text_stream
 
 router = APIRouter()
 
@@ -19,6 +24,22 @@ async def summarize():
     """Summarize content"""
     return {"message": "Summarize endpoint"}
 
+@router.post("/summarize/stream")
+async def summarize_stream(
+    request: SummaryStreamRequest,
+    current_user = Depends(get_current_user)
+) -> StreamingResponse:
+    """
+    Summarize text with Groq, streaming the summary as Server-Sent Events
+    ("token" events, then "done") as soon as it is generated.
+    """
+    chunks = get_async_llm_service().stream_document_summary(request.text, request.summary_type)
+    return StreamingResponse(
+        sse_text_stream(chunks, {"summary_type": request.summary_type}),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
 @router.post("/translate", response_model=TranslationResponse)
 async def translate(
     request: TranslationRequest,
@@ -26,8 +47,7 @@ async def translate(
 ):
     """Translate content using Gemini AI"""
     try:
-        llm_service = LLMService()
-        translated_text = llm_service.get_translation(
+        translated_text = await get_async_llm_service().get_translation(
             text=request.text,
             target_language=request.target_language
         )
@@ -36,5 +56,38 @@ async def translate(
             translated_text=translated_text,
             target_language=request.target_language
         )
+    except AppException:
+        # e.g. LLM rate limit queue timeout: 503, retryable
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Translation failed: {str(e)}")
+
+
+@router.post("/translate/stream")
+async def translate_stream(
+    request: TranslationRequest,
+    http_request: Request,
+    current_user = Depends(get_current_user)
+) -> StreamingResponse:
+    """
+    Translate content using Gemini, streaming NDJSON lines as the
+    translation is generated: {"type": "chunk", "text": ...} lines, then
+    {"type": "done"} (or {"type": "error"}). Generation stops as soon as
+    the client disconnects.
+    """
+    async def stream():
+        chunks = get_async_llm_service().stream_translation(request.text, request.target_language)
+        try:
+            async for text in chunks:
+                if await http_request.is_disconnected():
+                    break
+                yield json.dumps({"type": "chunk", "text": text}, ensure_ascii=False) + "\n"
+            else:
+                yield json.dumps({"type": "done", "target_language": request.target_language}) + "\n"
+        except Exception as e:
+            yield json.dumps({"type": "error", "detail": f"Translation failed: {str(e)}"}, ensure_ascii=False) + "\n"
+        finally:
+            # Closes the Gemini stream when the loop ended early (disconnect, cancellation)
+            await chunks.aclose()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
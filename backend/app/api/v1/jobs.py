@@ -0,0 +1,48 @@
+# Job routes: get_job, job_events
+from typing import Dict
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from app.api.deps import get_current_user
+from app.models.user import User
+from app.services.job_queue import job_queue
+from app.utils.sse import SSE_HEADERS, sse_event
+
+router = APIRouter()
+
+@router.get("/{job_id}")
+async def get_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+) -> Dict:
+    """Status of a background job, with its result once succeeded or its error once failed"""
+    job = await job_queue.get(job_id, current_user.id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.get("/{job_id}/events")
+async def get_job_events(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+) -> StreamingResponse:
+    """
+    Server-Sent Events for a background job: a "status" event on each
+    change, then "done" (with the result) or "error" once it finishes.
+    Comments are sent while nothing changes to keep proxies from closing
+    the idle connection.
+    """
+    if await job_queue.get(job_id, current_user.id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def stream():
+        async for job in job_queue.watch(job_id, current_user.id):
+            if job is None:
+                yield ": keepalive\n\n"
+            elif job["status"] == "succeeded":
+                yield sse_event("done", job)
+            elif job["status"] == "failed":
+                yield sse_event("error", job)
+            else:
+                yield sse_event("status", job)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers=SSE_HEADERS)
@@ -34,7 +34,88 @@ class Settings(BaseSettings):
     GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
     GOOGLE_API_KEY: str = os.getenv("GOOGLE_API_KEY", "")
     GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "")
-    
+
+    # Wikipedia API
+    WIKIPEDIA_TIMEOUT_SECONDS: float = 10.0
+    WIKIPEDIA_MAX_CONNECTIONS: int = 20
+    # Language hosts kept with a pooled client; the least recently used one is closed beyond this
+    WIKIPEDIA_MAX_LANGUAGE_CLIENTS: int = 16
+    WIKIPEDIA_BATCH_CONCURRENCY: int = 8
+    WIKIPEDIA_BATCH_MAX_URLS: int = 200
+    # Serve only ingested dumps (air-gapped classrooms, exam periods)
+    WIKIPEDIA_OFFLINE_ONLY: bool = False
+
+    # Article cache
+    ARTICLE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    SECTION_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    TITLE_CACHE_MAX_BYTES: int = 4 * 1024 * 1024
+    # Redirect targets rarely move; missing pages may be created at any time
+    TITLE_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    TITLE_CACHE_NEGATIVE_TTL_SECONDS: int = 6 * 3600
+
+    # Cache warmer (run before peak hours)
+    CACHE_WARMER_WINDOW_HOURS: int = 7 * 24
+    CACHE_WARMER_TOP_N: int = 100
+    CACHE_WARMER_MAX_UPSTREAM_CALLS: int = 200
+    CACHE_WARMER_MAX_LLM_TOKENS: int = 500_000
+
+    # Shared deadline for the summaries of one extraction
+    SUMMARY_DEADLINE_SECONDS: float = 20.0
+
+    # Tokens one Groq request may use (prompt + completion). Groq rejects
+    # requests above the per-minute token limit, well below the model context.
+    GROQ_MAX_REQUEST_TOKENS: int = 6000
+
+    # Per-provider LLM rate limits: set to the account's tier limits
+    GROQ_RPM: int = 1000
+    GROQ_TPM: int = 250_000
+    GROQ_MAX_CONCURRENCY: int = 16
+    GEMINI_RPM: int = 1000
+    GEMINI_TPM: int = 1_000_000
+    GEMINI_MAX_CONCURRENCY: int = 16
+    # Longest a call queues for a slot before failing with 503, and pause after a 429 without Retry-After
+    LLM_QUEUE_MAX_WAIT_SECONDS: float = 30.0
+    LLM_THROTTLE_COOLDOWN_SECONDS: float = 5.0
+
+    # Retries of transient LLM errors (timeouts, 429, 5xx) with jittered exponential backoff
+    LLM_RETRY_ATTEMPTS: int = 3
+    LLM_RETRY_BASE_DELAY_SECONDS: float = 0.5
+    LLM_RETRY_MAX_DELAY_SECONDS: float = 8.0
+    # Per-provider circuit breaker: consecutive failures before failing fast, and how long
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5
+    LLM_BREAKER_RESET_SECONDS: float = 30.0
+    # Provider used when the primary one is down ("groq", "gemini", or empty to disable)
+    LLM_SUMMARY_FALLBACK: str = "gemini"
+    LLM_TRANSLATION_FALLBACK: str = "groq"
+
+    # Map-reduce summarization of texts that do not fit one request
+    SUMMARY_CHUNK_OVERLAP_TOKENS: int = 50
+    SUMMARY_MAP_CONCURRENCY: int = 4
+
+    # LLM result cache (summaries...)
+    LLM_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    LLM_CACHE_TTL_SECONDS: int = 30 * 24 * 3600
+    LLM_CACHE_MAX_ROWS: int = 100_000
+
+    # Sentence-level translation memory
+    TRANSLATION_MEMORY_MAX_BYTES: int = 16 * 1024 * 1024
+    TRANSLATION_MEMORY_FUZZY_THRESHOLD: float = 0.92
+    TRANSLATION_MEMORY_MAX_CANDIDATES: int = 200
+
+    # Micro-batching of short translations: requests for the same language
+    # arriving within the window share one Gemini call (0 disables)
+    TRANSLATION_BATCH_WINDOW_MS: float = 5.0
+    TRANSLATION_BATCH_MAX_ITEMS: int = 16
+    TRANSLATION_BATCH_MAX_ITEM_TOKENS: int = 200
+    TRANSLATION_BATCH_MAX_TOKENS: int = 2000
+
+    # Background jobs (long extractions): local workers, time limit per job,
+    # and how often waiters re-read a job run by another process
+    JOB_WORKERS: int = 2
+    JOB_TIMEOUT_SECONDS: float = 600.0
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_EVENTS_MAX_SECONDS: float = 900.0
+
     class Config:
         env_file = ".env"
         case_sensitive = True
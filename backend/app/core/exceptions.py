@@ -18,3 +18,53 @@ class UserNotFoundException(AppException):
     """Exception raised when user is not found"""
     def __init__(self, detail: str = "User not found"):
         super().__init__(detail, status_code=404)
+
+
+class WikipediaPageNotFoundException(AppException):
+    """Exception raised when a Wikipedia title does not exist"""
+    def __init__(self, title: str):
+        self.title = title
+        super().__init__(f"Page Wikipedia introuvable pour le titre: {title}", status_code=404)
+
+
+class WikipediaDisambiguationException(AppException):
+    """Exception raised when a Wikipedia title is a disambiguation page"""
+    def __init__(self, options: list):
+        self.options = options
+        super().__init__(
+            f"Titre ambigu. Veuillez préciser parmi ces options : {', '.join(options[:5])}",
+            status_code=409
+        )
+
+
+class InvalidWikipediaLanguageException(AppException):
+    """Exception raised when a Wikipedia language code is malformed"""
+    def __init__(self, language: str):
+        self.language = language
+        super().__init__(f"Code de langue Wikipedia invalide: {language}", status_code=422)
+
+
+class WikipediaSectionNotFoundException(AppException):
+    """Exception raised when an article has no section at the requested index"""
+    def __init__(self, title: str, index: int):
+        super().__init__(f"Section {index} introuvable pour le titre: {title}", status_code=404)
+
+
+class LLMRateLimitException(AppException):
+    """Exception raised when an LLM call waited too long for the provider's rate limits"""
+    def __init__(self, provider: str):
+        self.provider = provider
+        super().__init__(
+            f"Service d'IA saturé ({provider}), veuillez réessayer dans quelques instants",
+            status_code=503
+        )
+
+
+class LLMProviderUnavailableException(AppException):
+    """Exception raised when an LLM provider's circuit breaker is open"""
+    def __init__(self, provider: str):
+        self.provider = provider
+        super().__init__(
+            f"Service d'IA indisponible ({provider}), veuillez réessayer plus tard",
+            status_code=503
+        )
@@ -4,16 +4,29 @@ FastAPI main application entry point
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.api.v1 import auth, users, articles, quiz, content, admin
+from app.api.v1 import auth, users, articles, quiz, content, admin, jobs
 from app.middleware.error_handler import add_exception_handlers
 from app.middleware.logging import add_logging_middleware
 from app.database import engine
-from app.models import user, article, quiz_attempt
+from app.models import user, article, article_text, quiz_attempt, cached_article, offline_article, title_resolution, llm_cache_entry, translation_memory_entry, job
+from app.services.wikipedia_client import wikipedia_client
+from app.services.llm_service import get_async_llm_service, close_async_llm_service
+from app.services.job_queue import job_queue
 
 # Create database tables
 user.Base.metadata.create_all(bind=engine)
+article_text.Base.metadata.create_all(bind=engine)
 article.Base.metadata.create_all(bind=engine)
 quiz_attempt.Base.metadata.create_all(bind=engine)
+cached_article.Base.metadata.create_all(bind=engine)
+offline_article.Base.metadata.create_all(bind=engine)
+title_resolution.Base.metadata.create_all(bind=engine)
+llm_cache_entry.Base.metadata.create_all(bind=engine)
+translation_memory_entry.Base.metadata.create_all(bind=engine)
+job.Base.metadata.create_all(bind=engine)
+
+# create_all does not alter existing tables: columns added later come with an
+# Alembic migration (alembic upgrade head, see README)
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -45,6 +58,24 @@ app.include_router(articles.router, prefix="/api/v1/articles", tags=["Articles"]
 app.include_router(quiz.router, prefix="/api/v1/quiz", tags=["Quiz"])
 app.include_router(content.router, prefix="/api/v1/content", tags=["Content"])
 app.include_router(admin.router, prefix="/api/v1/admin", tags=["Admin"])
+app.include_router(jobs.router, prefix="/api/v1/jobs", tags=["Jobs"])
+
+@app.on_event("startup")
+async def create_llm_clients():
+    """Build the pooled LLM provider clients once"""
+    get_async_llm_service()
+
+@app.on_event("startup")
+async def start_job_workers():
+    """Start the background job workers, resuming jobs left in the table"""
+    await job_queue.start()
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    """Stop the job workers, then release pooled connections to Wikipedia and the LLM providers"""
+    await job_queue.stop()
+    await wikipedia_client.aclose()
+    await close_async_llm_service()
 
 @app.get("/")
 async def root():
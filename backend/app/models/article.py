@@ -1,9 +1,10 @@
-# Article model: id, url, title, action, created_at, user_id
+# Article model: id, url, title, action, content_hash, summary_lead_only, created_at, user_id
 import enum
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum, DateTime
+from sqlalchemy import Boolean, Column, Integer, String, ForeignKey, Enum, DateTime, false
 from sqlalchemy.orm import relationship
 from ..database import Base
+from .article_text import ArticleText  # noqa: F401 - target of Article.stored_text
 
 class ActionType(str, enum.Enum):
     SUMMARY = "summary"
@@ -18,8 +19,17 @@ class Article(Base):
     url = Column(String, nullable=False)
     title = Column(String, nullable=False)
     action = Column(Enum(ActionType), nullable=False)
+    content_hash = Column(String(64), ForeignKey("article_texts.hash"), nullable=True, index=True)
+    # Lazy extractions store and summarize the lead section only, not the whole page
+    summary_lead_only = Column(Boolean, nullable=False, default=False, server_default=false())
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationships
     user = relationship("User", back_populates="articles")
-    quiz_attempts = relationship("QuizAttempt", back_populates="article", cascade="all, delete-orphan")
\ No newline at end of file
+    quiz_attempts = relationship("QuizAttempt", back_populates="article", cascade="all, delete-orphan")
+    stored_text = relationship("ArticleText")
+
+    @property
+    def content(self):
+        """Extracted text, loaded and decompressed only when accessed"""
+        return self.stored_text.read() if self.stored_text is not None else None
\ No newline at end of file
@@ -0,0 +1,21 @@
+# ArticleText model: extracted article bodies stored once per content hash
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, LargeBinary, DateTime
+from sqlalchemy.orm import deferred
+from ..database import Base
+from ..utils.compression import decompress_text
+
+class ArticleText(Base):
+    __tablename__ = "article_texts"
+
+    hash = Column(String(64), primary_key=True)  # SHA-256 of the UTF-8 text
+    codec = Column(String(8), nullable=False)
+    # Loaded only when the text is read, not with the row
+    data = deferred(Column(LargeBinary, nullable=False))
+    size_bytes = Column(Integer, nullable=False)
+    compressed_bytes = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def read(self) -> str:
+        """Decompressed text"""
+        return decompress_text(self.codec, self.data)
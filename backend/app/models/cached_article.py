@@ -0,0 +1,19 @@
+# CachedArticle model: persistent tier of the Wikipedia article cache
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, DateTime, UniqueConstraint
+from ..database import Base
+
+class CachedArticle(Base):
+    __tablename__ = "cached_articles"
+    __table_args__ = (
+        UniqueConstraint("language", "title", name="uq_cached_articles_language_title"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    language = Column(String(16), nullable=False)
+    title = Column(String, nullable=False)
+    revision_id = Column(Integer, nullable=True)
+    payload = Column(Text, nullable=False)
+    size_bytes = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
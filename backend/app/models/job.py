@@ -0,0 +1,25 @@
+# Job model: background work (extractions, summaries) run by the local worker pool
+import enum
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Enum, DateTime
+from ..database import Base
+
+class JobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(String(32), primary_key=True)  # random hex, unguessable
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    kind = Column(String(32), nullable=False)  # handler name, e.g. "extract_wiki"
+    status = Column(Enum(JobStatus), nullable=False, default=JobStatus.QUEUED, index=True)
+    payload = Column(Text, nullable=False, default="{}")  # JSON arguments of the handler
+    result = Column(Text, nullable=True)  # JSON result once succeeded
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
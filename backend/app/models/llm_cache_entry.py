@@ -0,0 +1,18 @@
+# LLMCacheEntry model: persistent tier of the LLM result cache
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, DateTime, UniqueConstraint
+from ..database import Base
+
+class LLMCacheEntry(Base):
+    __tablename__ = "llm_cache"
+    __table_args__ = (
+        UniqueConstraint("namespace", "key", name="uq_llm_cache_namespace_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    namespace = Column(String(32), nullable=False)  # e.g. "summary"
+    key = Column(String(64), nullable=False)  # SHA-256 of the request parameters
+    value = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    last_used_at = Column(DateTime, default=datetime.utcnow, index=True)
@@ -0,0 +1,20 @@
+# OfflineArticle model: pages ingested from a Wikipedia XML dump
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, DateTime, UniqueConstraint
+from ..database import Base
+
+class OfflineArticle(Base):
+    __tablename__ = "offline_articles"
+    __table_args__ = (
+        UniqueConstraint("language", "title", name="uq_offline_articles_language_title"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    language = Column(String(16), nullable=False)
+    title = Column(String, nullable=False)
+    page_id = Column(Integer, nullable=True)
+    revision_id = Column(Integer, nullable=True)
+    redirect_to = Column(String, nullable=True)
+    content = Column(Text, nullable=False, default="")
+    sections = Column(Text, nullable=False, default="[]")
+    ingested_at = Column(DateTime, default=datetime.utcnow)
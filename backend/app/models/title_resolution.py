@@ -0,0 +1,18 @@
+# TitleResolution model: raw Wikipedia titles mapped to their canonical page
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, DateTime, UniqueConstraint
+from ..database import Base
+
+class TitleResolution(Base):
+    __tablename__ = "title_resolutions"
+    __table_args__ = (
+        UniqueConstraint("language", "raw_title", name="uq_title_resolutions_language_raw_title"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    language = Column(String(16), nullable=False)
+    raw_title = Column(String, nullable=False)
+    status = Column(String(16), nullable=False)  # resolved, missing, disambiguation
+    canonical_title = Column(String, nullable=True)
+    options = Column(Text, nullable=True)  # JSON list for disambiguation pages
+    resolved_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,21 @@
+# TranslationMemoryEntry model: translated sentences reused across translations
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, DateTime, UniqueConstraint, Index
+from ..database import Base
+
+class TranslationMemoryEntry(Base):
+    __tablename__ = "translation_memory"
+    __table_args__ = (
+        UniqueConstraint("target_language", "model", "source_hash", name="uq_translation_memory_source"),
+        # Fuzzy lookups scan sentences of similar length
+        Index("ix_translation_memory_length", "target_language", "model", "length"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    target_language = Column(String(32), nullable=False)
+    model = Column(String(64), nullable=False)
+    source_hash = Column(String(64), nullable=False)  # SHA-256 of the normalized sentence
+    source_text = Column(Text, nullable=False)
+    translation = Column(Text, nullable=False)
+    length = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
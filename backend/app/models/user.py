@@ -21,4 +21,8 @@ class User(Base):
 
     # Relationships using string names to prevent circular imports
     articles = relationship("Article", back_populates="user", cascade="all, delete-orphan")
-    quiz_attempts = relationship("QuizAttempt", back_populates="user", cascade="all, delete-orphan")
\ No newline at end of file
+    quiz_attempts = relationship("QuizAttempt", back_populates="user", cascade="all, delete-orphan")
+
+    @property
+    def is_admin(self) -> bool:
+        return self.role == UserRole.ADMIN
\ No newline at end of file
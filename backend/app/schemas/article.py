@@ -1,12 +1,34 @@
 # Article schemas: ArticleCreate, ArticleResponse, ArticleHistory
 # schemas.py
-from pydantic import BaseModel, HttpUrl, field_validator
+from typing import List, Literal
+from pydantic import BaseModel, Field, HttpUrl, field_validator
+from app.core.config import settings
+from app.services.wikipedia_client import is_wikipedia_host
 
 class WikiRequest(BaseModel):
     url: HttpUrl
+    # Return the lead and table of contents only; sections are fetched on demand.
+    # Summaries then cover the lead alone ("summary_lead_only" in the response)
+    lazy_sections: bool = False
 
     @field_validator('url')
     def validate_wiki_url(cls, v):
-        if "wikipedia.org" not in str(v):
+        if not is_wikipedia_host(v.host):
             raise ValueError("L'URL doit provenir de Wikipedia")
-        return v
\ No newline at end of file
+        return v
+
+
+class WikiBatchRequest(BaseModel):
+    urls: List[HttpUrl] = Field(..., min_length=1, max_length=settings.WIKIPEDIA_BATCH_MAX_URLS)
+
+    @field_validator('urls')
+    def validate_wiki_urls(cls, v):
+        for url in v:
+            if not is_wikipedia_host(url.host):
+                raise ValueError(f"L'URL doit provenir de Wikipedia: {url}")
+        return v
+
+
+class SummaryStreamRequest(BaseModel):
+    text: str = Field(..., min_length=1)
+    summary_type: Literal["short", "medium"] = "short"
@@ -0,0 +1,171 @@
+# Two-tier cache for extracted Wikipedia articles (in-process LRU + database)
+import asyncio
+import json
+import logging
+import threading
+from typing import Callable, Dict, Iterator, Optional, Tuple
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.cached_article import CachedArticle
+from app.services.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+
+class ArticleCache:
+    """
+    Cache for the dicts returned by get_wikipedia_content.
+
+    Entries are identified by (language, normalized title, revision id).
+    Lookups may pin a revision; otherwise the latest cached revision is
+    served. Reads go to the in-process LRU first, then to the
+    cached_articles table, promoting persistent hits into memory. Async
+    callers use aget/aset, which answer memory hits inline and run the
+    database tier in a worker thread.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = settings.ARTICLE_CACHE_MAX_BYTES,
+        session_factory: Optional[Callable[[], Session]] = SessionLocal,
+    ):
+        self.memory = LRUCache(max_bytes)
+        self.session_factory = session_factory
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+
+    def get(self, language: str, title: str, revision_id: Optional[int] = None) -> Optional[Dict]:
+        """Return a cached article or None on a miss"""
+        content = self._memory_hit(language, title, revision_id)
+        if content is None:
+            content = self._persistent_hit(language, title, revision_id, self._load(language, title))
+        return content
+
+    async def aget(self, language: str, title: str, revision_id: Optional[int] = None) -> Optional[Dict]:
+        """get() without blocking the event loop on the database"""
+        content = self._memory_hit(language, title, revision_id)
+        if content is None:
+            loaded = await asyncio.to_thread(self._load, language, title)
+            content = self._persistent_hit(language, title, revision_id, loaded)
+        return content
+
+    def set(self, language: str, title: str, content: Dict) -> None:
+        """Store an article in both tiers"""
+        content = dict(content)
+        self.memory.set((language, title), content)
+        self._store(language, title, content)
+
+    async def aset(self, language: str, title: str, content: Dict) -> None:
+        """set() writing the database tier from a worker thread"""
+        content = dict(content)
+        self.memory.set((language, title), content)
+        await asyncio.to_thread(self._store, language, title, content)
+
+    def invalidate(self, language: str, title: str) -> None:
+        """Drop an article from both tiers"""
+        self.memory.pop((language, title))
+        if self.session_factory is None:
+            return
+        try:
+            with self.session_factory() as db:
+                db.query(CachedArticle).filter(
+                    CachedArticle.language == language,
+                    CachedArticle.title == title
+                ).delete()
+                db.commit()
+        except SQLAlchemyError as e:
+            logger.warning(f"Article cache invalidation failed: {e}")
+
+    def cached_revisions(self, batch_size: int = 1000) -> Iterator[Tuple[str, str, Optional[int]]]:
+        """Yield (language, title, revision_id) for every persisted article"""
+        if self.session_factory is None:
+            return
+        with self.session_factory() as db:
+            rows = db.query(
+                CachedArticle.language, CachedArticle.title, CachedArticle.revision_id
+            ).order_by(CachedArticle.language, CachedArticle.id).yield_per(batch_size)
+            for language, title, revision_id in rows:
+                yield language, title, revision_id
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and memory usage, used to size the cache"""
+        hits = self.memory_hits + self.persistent_hits
+        lookups = hits + self.misses
+        return {
+            "hits": hits,
+            "memory_hits": self.memory_hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self.memory),
+            "size_bytes": self.memory.size_bytes,
+            "max_bytes": self.memory.max_bytes,
+            "evictions": self.memory.evictions,
+        }
+
+    @staticmethod
+    def _matches(content: Dict, revision_id: Optional[int]) -> bool:
+        return revision_id is None or content.get("revision_id") == revision_id
+
+    def _memory_hit(self, language: str, title: str, revision_id: Optional[int]) -> Optional[Dict]:
+        content = self.memory.get((language, title))
+        if content is not None and self._matches(content, revision_id):
+            self._count("memory_hits")
+            return dict(content)
+        return None
+
+    def _persistent_hit(
+        self, language: str, title: str, revision_id: Optional[int], content: Optional[Dict]
+    ) -> Optional[Dict]:
+        """Promote an article loaded from the database into memory, or count the miss"""
+        if content is not None and self._matches(content, revision_id):
+            self.memory.set((language, title), content)
+            self._count("persistent_hits")
+            return dict(content)
+        self._count("misses")
+        return None
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _load(self, language: str, title: str) -> Optional[Dict]:
+        if self.session_factory is None:
+            return None
+        try:
+            with self.session_factory() as db:
+                row = db.query(CachedArticle).filter(
+                    CachedArticle.language == language,
+                    CachedArticle.title == title
+                ).first()
+                return json.loads(row.payload) if row else None
+        except SQLAlchemyError as e:
+            logger.warning(f"Article cache read failed: {e}")
+            return None
+
+    def _store(self, language: str, title: str, content: Dict) -> None:
+        if self.session_factory is None:
+            return
+        payload = json.dumps(content, ensure_ascii=False)
+        try:
+            with self.session_factory() as db:
+                row = db.query(CachedArticle).filter(
+                    CachedArticle.language == language,
+                    CachedArticle.title == title
+                ).first()
+                if row is None:
+                    row = CachedArticle(language=language, title=title)
+                    db.add(row)
+                row.revision_id = content.get("revision_id")
+                row.payload = payload
+                row.size_bytes = len(payload.encode("utf-8"))
+                db.commit()
+        except SQLAlchemyError as e:
+            logger.warning(f"Article cache write failed: {e}")
+
+
+article_cache = ArticleCache()
@@ -0,0 +1,100 @@
+# Revision-aware refresh of cached Wikipedia articles (nightly job)
+import argparse
+import asyncio
+import logging
+from dataclasses import dataclass
+from itertools import groupby
+from typing import List, Optional, Tuple
+from app.core.config import settings
+from app.services.article_cache import ArticleCache, article_cache
+from app.services.wikipedia_client import WikipediaClient, wikipedia_client, MAX_TITLES_PER_QUERY
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RefreshStats:
+    """Counters reported at the end of a refresh run"""
+    checked: int = 0
+    changed: int = 0
+    refreshed: int = 0
+    removed: int = 0
+    failed: int = 0
+    revision_requests: int = 0
+
+
+async def refresh_cached_articles(
+    cache: ArticleCache = article_cache,
+    client: WikipediaClient = wikipedia_client,
+    concurrency: int = settings.WIKIPEDIA_BATCH_CONCURRENCY,
+) -> RefreshStats:
+    """
+    Bring every persisted article up to date with Wikipedia.
+
+    Only the latest revision ids are requested, MAX_TITLES_PER_QUERY titles
+    per lightweight query; full content is re-fetched for the pages whose
+    revision changed, and pages that no longer exist are evicted.
+    """
+    stats = RefreshStats()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def refetch(language: str, title: str, canonical: str) -> None:
+        try:
+            async with semaphore:
+                content = await client.fetch_page(language, canonical)
+            cache.set(language, title, content)
+            stats.refreshed += 1
+        except Exception as e:
+            logger.warning(f"Refresh of {language}:{title} failed: {e}")
+            stats.failed += 1
+
+    async def check(language: str, entries: List[Tuple[str, Optional[int]]]) -> None:
+        titles = [title for title, _ in entries]
+        try:
+            async with semaphore:
+                latest = await client.resolve_titles(language, titles)
+            stats.revision_requests += 1
+        except Exception as e:
+            logger.warning(f"Revision check failed for {len(titles)} {language} titles: {e}")
+            stats.failed += len(titles)
+            return
+
+        refetches = []
+        for title, cached_revision in entries:
+            stats.checked += 1
+            page = latest[title]
+            if page["missing"] or page["disambiguation"]:
+                cache.invalidate(language, title)
+                stats.removed += 1
+            elif page["revision_id"] != cached_revision:
+                stats.changed += 1
+                refetches.append(refetch(language, title, page["title"]))
+        await asyncio.gather(*refetches)
+
+    batches = []
+    for language, rows in groupby(cache.cached_revisions(), key=lambda row: row[0]):
+        entries = [(title, revision_id) for _, title, revision_id in rows]
+        for i in range(0, len(entries), MAX_TITLES_PER_QUERY):
+            batches.append(check(language, entries[i:i + MAX_TITLES_PER_QUERY]))
+    await asyncio.gather(*batches)
+    return stats
+
+
+def main():
+    argparse.ArgumentParser(description="Re-fetch cached Wikipedia articles whose revision changed").parse_args()
+
+    async def run() -> RefreshStats:
+        try:
+            return await refresh_cached_articles()
+        finally:
+            await wikipedia_client.aclose()
+
+    stats = asyncio.run(run())
+    print(
+        f"Checked {stats.checked} articles with {stats.revision_requests} revision requests: "
+        f"{stats.changed} changed, {stats.refreshed} refreshed, {stats.removed} removed, {stats.failed} failed"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+# Popularity-driven cache warming for Wikipedia articles (run before peak hours)
+import argparse
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, List, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.article import Article
+from app.services.content_extractor import (
+    SUMMARY_TYPES,
+    get_wikipedia_content,
+    normalize_wikipedia_url,
+    peek_wikipedia_content
+)
+from app.services.llm_service import (
+    CHUNK_SUMMARY_MAX_TOKENS,
+    SUMMARY_MAX_TOKENS,
+    split_for_summary,
+    summary_token_budget
+)
+from app.services.preprocessor import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WarmStats:
+    """Counters reported at the end of a warming run"""
+    candidates: int = 0
+    already_cached: int = 0
+    fetched: int = 0
+    summarized: int = 0
+    upstream_calls: int = 0
+    llm_tokens: int = 0
+    skipped: int = 0
+    failed: int = 0
+
+
+def estimate_summary_tokens(text: str, summary_count: int = 1) -> int:
+    """
+    Token cost of summarizing text, output caps charged in full. The
+    summaries are requested in one call, so the text is counted once;
+    long texts add the notes of each chunk, written then read back.
+    """
+    tokens = estimate_tokens(text)
+    chunks = len(split_for_summary(text)) if tokens > summary_token_budget() else 0
+    return tokens + 2 * chunks * CHUNK_SUMMARY_MAX_TOKENS + summary_count * SUMMARY_MAX_TOKENS
+
+
+def popular_urls(db: Session, since: datetime, limit: int) -> List[Tuple[str, int]]:
+    """
+    Most extracted Wikipedia URLs since a given time, most requested first.
+    Different spellings of the same article are counted together.
+    """
+    rows = db.query(Article.url, func.count(Article.id)).filter(
+        Article.created_at >= since,
+        Article.url.like("%wikipedia.org/wiki/%")
+    ).group_by(Article.url).all()
+
+    counts = {}
+    for url, count in rows:
+        key = normalize_wikipedia_url(url)
+        counts[key] = counts.get(key, 0) + count
+    return sorted(counts.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+
+async def warm_popular_articles(
+    session_factory: Callable[[], Session] = SessionLocal,
+    llm_service=None,
+    window_hours: int = settings.CACHE_WARMER_WINDOW_HOURS,
+    limit: int = settings.CACHE_WARMER_TOP_N,
+    max_upstream_calls: int = settings.CACHE_WARMER_MAX_UPSTREAM_CALLS,
+    max_llm_tokens: int = settings.CACHE_WARMER_MAX_LLM_TOKENS,
+    concurrency: int = settings.WIKIPEDIA_BATCH_CONCURRENCY,
+) -> WarmStats:
+    """
+    Pre-fetch the most requested articles of the last window_hours into the
+    article cache and, when an AsyncLLMService is given, pre-generate the AI
+    summaries served by extract-wiki into the LLM result cache.
+
+    Articles are handled in popularity order. Each uncached article reserves
+    one upstream request and each summarization its estimated token cost;
+    once a budget is spent, the remaining (less popular) work is skipped.
+    """
+    stats = WarmStats()
+    with session_factory() as db:
+        ranked = popular_urls(db, datetime.utcnow() - timedelta(hours=window_hours), limit)
+    stats.candidates = len(ranked)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    budget = {"upstream": max_upstream_calls, "tokens": max_llm_tokens}
+
+    async def warm(url: str) -> None:
+        async with semaphore:
+            content = await peek_wikipedia_content(url)
+            if content is not None:
+                stats.already_cached += 1
+            elif budget["upstream"] <= 0:
+                stats.skipped += 1
+                return
+            else:
+                budget["upstream"] -= 1
+                stats.upstream_calls += 1
+                try:
+                    content = await get_wikipedia_content(url)
+                except Exception as e:
+                    logger.warning(f"Warming {url} failed: {e}")
+                    stats.failed += 1
+                    return
+                stats.fetched += 1
+
+            if llm_service is None:
+                return
+            text = content["content"]
+            missing = [t for t in SUMMARY_TYPES if not llm_service.is_document_summarized(text, t)]
+            if not missing:
+                return
+            cost = estimate_summary_tokens(text, len(missing))
+            if cost > budget["tokens"]:
+                stats.skipped += 1
+                return
+            budget["tokens"] -= cost
+            stats.llm_tokens += cost
+
+            try:
+                summaries = await llm_service.summarize_document(text, missing)
+            except Exception as e:
+                summaries = {}
+                logger.warning(f"Summarizing {url} failed: {e}")
+            if len(summaries) < len(missing):
+                stats.failed += 1
+                return
+            stats.summarized += 1
+
+    await asyncio.gather(*(warm(url) for url, _ in ranked))
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-fetch and pre-summarize the most requested Wikipedia articles")
+    parser.add_argument("--window-hours", type=int, default=settings.CACHE_WARMER_WINDOW_HOURS)
+    parser.add_argument("--top", type=int, default=settings.CACHE_WARMER_TOP_N)
+    parser.add_argument("--max-upstream-calls", type=int, default=settings.CACHE_WARMER_MAX_UPSTREAM_CALLS)
+    parser.add_argument("--max-llm-tokens", type=int, default=settings.CACHE_WARMER_MAX_LLM_TOKENS)
+    parser.add_argument("--no-summaries", action="store_true", help="Only warm the article cache")
+    args = parser.parse_args()
+
+    from app.services.llm_service import AsyncLLMService
+    from app.services.wikipedia_client import wikipedia_client
+    llm_service = None if args.no_summaries else AsyncLLMService()
+
+    async def run() -> WarmStats:
+        try:
+            return await warm_popular_articles(
+                llm_service=llm_service,
+                window_hours=args.window_hours,
+                limit=args.top,
+                max_upstream_calls=args.max_upstream_calls,
+                max_llm_tokens=args.max_llm_tokens,
+            )
+        finally:
+            await wikipedia_client.aclose()
+            if llm_service is not None:
+                await llm_service.aclose()
+
+    stats = asyncio.run(run())
+    print(
+        f"Warmed {stats.candidates} popular articles: {stats.already_cached} already cached, "
+        f"{stats.fetched} fetched ({stats.upstream_calls} upstream calls), {stats.summarized} summarized "
+        f"(~{stats.llm_tokens} tokens), {stats.skipped} skipped over budget, {stats.failed} failed"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,59 +1,343 @@
 #extracting content from Wikipedia articles
-import wikipedia
-import requests
-from urllib.parse import urlparse, unquote
+from urllib.parse import urlparse, unquote, quote
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import asyncio
 import re
+from app.core.config import settings
+from app.core.exceptions import (
+    AppException,
+    WikipediaPageNotFoundException,
+    WikipediaDisambiguationException,
+    WikipediaSectionNotFoundException
+)
+from app.services.article_cache import article_cache
+from app.services.cache import LRUCache
+from app.services.offline_store import offline_store
+from app.services.title_cache import title_cache, MISSING, DISAMBIGUATION
+from app.services.wikipedia_client import wikipedia_client, validate_language, MAX_TITLES_PER_QUERY
+from app.services.wikitext import extract_sections
 
-def get_wikipedia_content(url: str, language: str = None):
+# Outlines and section bodies served by the lazy extraction mode
+section_cache = LRUCache(settings.SECTION_CACHE_MAX_BYTES)
+
+# AI summaries generated for each extracted article
+SUMMARY_TYPES = ("short", "medium")
+
+
+def normalize_title(raw_title: str) -> str:
     """
-    Extract content from Wikipedia URL
-    
+    Normalize a Wikipedia title the way MediaWiki does: decode the URL,
+    turn underscores into spaces, collapse whitespace and capitalize the
+    first letter.
+    """
+    title = unquote(raw_title).replace("_", " ")
+    title = re.sub(r"\s+", " ", title).strip()
+    return title[:1].upper() + title[1:]
+
+
+def parse_wikipedia_url(url: str, language: str = None) -> Tuple[str, str]:
+    """
+    Split a Wikipedia URL into (language, normalized title)
+
     Args:
         url: Wikipedia article URL
         language: Wikipedia language code (optional, auto-detected from URL)
-    
-    Returns:
-        dict with title, content, url, and summary
     """
-    # 1. Parse URL to extract language and title
     parsed_url = urlparse(str(url))
-    
+
     # Auto-detect language from URL (e.g., en.wikipedia.org -> "en")
     if language is None:
-        hostname = parsed_url.netloc
-        if 'wikipedia.org' in hostname:
+        hostname = (parsed_url.hostname or "").lower()
+        if hostname.endswith('wikipedia.org'):
             language = hostname.split('.')[0]  # Extract "en" from "en.wikipedia.org"
         else:
             language = "en"  # Default to English
-    
-    # 2. Configuration du User-Agent (OBLIGATOIRE pour ne pas être bloqué)
-    session = requests.Session()
-    session.headers.update({
-        "User-Agent": "WikiSmartEdu/1.0 (Educational Project; contact@wikismartedu.com)"
-    })
-    wikipedia.requests = session
-    
-    # 3. Configuration de la langue
-    wikipedia.set_lang(language)
-
-    # 4. Extraction du titre via urllib
+    # The language becomes the API host: reject anything but a language code (422)
+    validate_language(language)
+
+    # Extraction du titre via urllib
     raw_title = parsed_url.path.split("/")[-1]
-    title = unquote(raw_title).replace("_", " ")
+    return language, normalize_title(raw_title)
+
+
+def normalize_wikipedia_url(url: str, language: str = None) -> str:
+    """
+    Canonical form of an article URL, identical for every spelling of the
+    same article (mobile host, underscores vs spaces, percent-encoding...)
+    """
+    language, title = parse_wikipedia_url(url, language)
+    return f"https://{language}.wikipedia.org/wiki/{quote(title.replace(' ', '_'))}"
+
+
+async def _resolve_known_title(language: str, title: str) -> str:
+    """
+    Apply a cached title resolution: returns the canonical title of a known
+    redirect, raises for titles already known to be missing or ambiguous.
+    """
+    resolution = await title_cache.aget(language, title)
+    if resolution is None:
+        return title
+    if resolution["status"] == MISSING:
+        raise WikipediaPageNotFoundException(title)
+    if resolution["status"] == DISAMBIGUATION:
+        raise WikipediaDisambiguationException(resolution["options"])
+    return resolution["title"]
+
+
+async def _remember_failure(language: str, title: str, error: Exception) -> None:
+    """Record missing and disambiguation pages so the next lookup stays local"""
+    # The title cache writes through to the database: keep that off the event loop
+    if isinstance(error, WikipediaPageNotFoundException):
+        await asyncio.to_thread(title_cache.remember_missing, language, title)
+    elif isinstance(error, WikipediaDisambiguationException):
+        await asyncio.to_thread(title_cache.remember_disambiguation, language, title, error.options)
+
+
+async def _remember_article(language: str, requested_title: str, content: Dict) -> None:
+    """Cache an article under its canonical title and map the requested title to it"""
+    await asyncio.to_thread(title_cache.remember_resolved, language, requested_title, content["title"])
+    await article_cache.aset(language, content["title"], content)
+
+
+async def get_wikipedia_content(url: str, language: str = None):
+    """
+    Extract content from Wikipedia URL
+
+    Args:
+        url: Wikipedia article URL
+        language: Wikipedia language code (optional, auto-detected from URL)
+
+    Returns:
+        dict with title, content, url, summary, language and revision_id
+    """
+    # 1. Langue et titre normalisé depuis l'URL
+    language, requested_title = parse_wikipedia_url(url, language)
+
+    # 2. Résolution déjà connue : redirection, page absente ou titre ambigu
+    title = await _resolve_known_title(language, requested_title)
+
+    # 3. Cache (mémoire puis base de données), indexé par titre canonique
+    cached = await article_cache.aget(language, title)
+    if cached is not None:
+        if title == requested_title:
+            # Canonical title: remember it in memory so the next lookup skips the database
+            title_cache.remember_resolved(language, title, cached["title"])
+        return cached
+
+    # 4. Dump Wikipedia ingéré localement (aucun accès réseau)
+    offline = await asyncio.to_thread(offline_store.get, language, title)
+    if offline is not None:
+        await _remember_article(language, requested_title, offline)
+        return offline
+    if settings.WIKIPEDIA_OFFLINE_ONLY:
+        raise WikipediaPageNotFoundException(title)
 
     try:
-        # 5. Récupération de la page
-        page = wikipedia.page(title, auto_suggest=False)
-        return {
-            "title": page.title,
-            "content": page.content,
-            "summary": page.summary,
-            "url": page.url,
-            "language": language
-        }
-    except wikipedia.exceptions.PageError:
-        raise Exception(f"Page Wikipedia introuvable pour le titre: {title}")
-    except wikipedia.exceptions.DisambiguationError as e:
-        # Retourner les options pour permettre à l'utilisateur de choisir
-        raise Exception(f"Titre ambigu. Veuillez préciser parmi ces options : {', '.join(e.options[:5])}")
+        # 5. Récupération de la page (client asynchrone, langue par requête)
+        content = await wikipedia_client.fetch_page(language, title)
+        await _remember_article(language, requested_title, content)
+        return content
+    except AppException as e:
+        # Page introuvable ou titre ambigu : message déjà explicite
+        await _remember_failure(language, requested_title, e)
+        raise
     except Exception as e:
-        raise Exception(f"Erreur lors de l'extraction Wikipedia: {str(e)}")# Temp change
+        raise Exception(f"Erreur lors de l'extraction Wikipedia: {str(e)}")
+
+
+async def peek_wikipedia_content(url: str, language: str = None) -> Optional[Dict]:
+    """Cached copy of an article, or None; never contacts Wikipedia"""
+    language, title = parse_wikipedia_url(url, language)
+    try:
+        title = await _resolve_known_title(language, title)
+    except AppException:
+        return None
+    return await article_cache.aget(language, title)
+
+
+def _outline_from_content(content: Dict) -> Dict:
+    sections = extract_sections(content["content"])
+    lead_end = sections[1]["offset"] if len(sections) > 1 else len(content["content"])
+    return {
+        **content,
+        "content": content["content"][:lead_end].strip(),
+        "sections": [
+            {"index": s["index"], "title": s["title"], "level": s["level"]} for s in sections
+        ],
+    }
+
+
+def _section_from_content(content: Dict, index: int) -> Dict:
+    text = content["content"]
+    sections = extract_sections(text)
+    if not 0 <= index < len(sections):
+        raise WikipediaSectionNotFoundException(content["title"], index)
+    section = sections[index]
+    # Like action=parse, a section includes its subsections
+    end = len(text)
+    for following in sections[index + 1:]:
+        if index == 0 or following["level"] <= section["level"]:
+            end = following["offset"]
+            break
+    return {
+        "title": content["title"],
+        "language": content["language"],
+        "index": index,
+        "heading": section["title"],
+        "content": text[section["offset"]:end].strip(),
+        "revision_id": content.get("revision_id"),
+    }
+
+
+async def get_wikipedia_outline(url: str, language: str = None) -> Dict:
+    """
+    Lazy counterpart of get_wikipedia_content: returns the lead section as
+    content plus the table of contents ("sections"), without section bodies.
+    Bodies are loaded on demand with get_wikipedia_section.
+    """
+    language, requested_title = parse_wikipedia_url(url, language)
+    title = await _resolve_known_title(language, requested_title)
+    key = ("outline", language, title)
+    cached = section_cache.get(key)
+    if cached is not None:
+        return dict(cached)
+
+    offline = await asyncio.to_thread(offline_store.get, language, title)
+    if offline is not None:
+        outline = _outline_from_content(offline)
+    elif settings.WIKIPEDIA_OFFLINE_ONLY:
+        raise WikipediaPageNotFoundException(title)
+    else:
+        try:
+            outline = await wikipedia_client.fetch_outline(language, title)
+        except AppException as e:
+            await _remember_failure(language, requested_title, e)
+            raise
+        except Exception as e:
+            raise Exception(f"Erreur lors de l'extraction Wikipedia: {str(e)}")
+
+    await asyncio.to_thread(title_cache.remember_resolved, language, requested_title, outline["title"])
+    section_cache.set(key, outline)
+    return dict(outline)
+
+
+async def get_wikipedia_section(language: str, title: str, index: int) -> Dict:
+    """
+    Plain text of one section of an article (0 is the lead)
+
+    Returns:
+        dict with title, language, index, heading, content and revision_id
+    """
+    validate_language(language)
+    requested_title = normalize_title(title)
+    title = await _resolve_known_title(language, requested_title)
+    key = ("section", language, title, index)
+    cached = section_cache.get(key)
+    if cached is not None:
+        return dict(cached)
+
+    offline = await asyncio.to_thread(offline_store.get, language, title)
+    if offline is not None:
+        section = _section_from_content(offline, index)
+    elif settings.WIKIPEDIA_OFFLINE_ONLY:
+        raise WikipediaPageNotFoundException(title)
+    else:
+        try:
+            section = await wikipedia_client.fetch_section(language, title, index)
+        except AppException as e:
+            await _remember_failure(language, requested_title, e)
+            raise
+        except Exception as e:
+            raise Exception(f"Erreur lors de l'extraction Wikipedia: {str(e)}")
+
+    section_cache.set(key, section)
+    return dict(section)
+
+
+async def iter_wikipedia_contents(
+    urls: List[str],
+    concurrency: int = settings.WIKIPEDIA_BATCH_CONCURRENCY
+) -> AsyncIterator[Dict]:
+    """
+    Extract many Wikipedia articles, yielding one result per URL as soon
+    as it is ready.
+
+    Cached articles, and titles already known to be missing or ambiguous,
+    are answered first. The remaining titles are grouped by
+    language and resolved MAX_TITLES_PER_QUERY at a time with multi-title
+    queries, so missing and disambiguation pages never cost a content
+    request. Full content is then fetched page by page (MediaWiki only
+    returns whole-article extracts for one page per request), with at most
+    `concurrency` upstream requests in flight.
+
+    Yields:
+        {"url", "status": "success", "data"} or {"url", "status": "error", "detail"}
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    results: asyncio.Queue = asyncio.Queue()
+
+    # Duplicate URLs share one extraction
+    pending: Dict[Tuple[str, str], List[str]] = {}
+    for url in urls:
+        language, title = parse_wikipedia_url(url)
+        try:
+            key = (language, await _resolve_known_title(language, title))
+        except AppException as e:
+            yield {"url": url, "status": "error", "detail": str(e)}
+            continue
+        cached = await article_cache.aget(*key) if key not in pending else None
+        if cached is not None:
+            yield {"url": url, "status": "success", "data": cached}
+        else:
+            pending.setdefault(key, []).append(url)
+
+    def publish(key: Tuple[str, str], content: Dict = None, error: Exception = None) -> None:
+        for url in pending[key]:
+            if error is None:
+                results.put_nowait({"url": url, "status": "success", "data": dict(content)})
+            else:
+                results.put_nowait({"url": url, "status": "error", "detail": str(error)})
+
+    async def run_page(language: str, title: str, page: Dict) -> None:
+        key = (language, title)
+        try:
+            if page["missing"]:
+                raise WikipediaPageNotFoundException(title)
+            if page["disambiguation"]:
+                async with semaphore:
+                    options = await wikipedia_client.disambiguation_options(language, page["title"])
+                raise WikipediaDisambiguationException(options)
+            async with semaphore:
+                content = await wikipedia_client.fetch_page(language, page["title"])
+            await _remember_article(language, title, content)
+            publish(key, content=content)
+        except Exception as e:
+            await _remember_failure(language, title, e)
+            publish(key, error=e)
+
+    async def run_chunk(language: str, titles: List[str]) -> None:
+        try:
+            async with semaphore:
+                pages = await wikipedia_client.resolve_titles(language, titles)
+        except Exception as e:
+            for title in titles:
+                publish((language, title), error=Exception(f"Erreur lors de l'extraction Wikipedia: {str(e)}"))
+            return
+        await asyncio.gather(*(run_page(language, title, pages[title]) for title in titles))
+
+    by_language: Dict[str, List[str]] = {}
+    for language, title in pending:
+        by_language.setdefault(language, []).append(title)
+    chunks = [
+        (language, titles[i:i + MAX_TITLES_PER_QUERY])
+        for language, titles in by_language.items()
+        for i in range(0, len(titles), MAX_TITLES_PER_QUERY)
+    ]
+
+    runner = asyncio.ensure_future(asyncio.gather(*(run_chunk(*chunk) for chunk in chunks)))
+    try:
+        for _ in range(sum(len(group) for group in pending.values())):
+            yield await results.get()
+    finally:
+        # Stop upstream work if the consumer goes away early
+        runner.cancel()
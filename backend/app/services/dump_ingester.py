@@ -0,0 +1,173 @@
+# Streaming ingestion of Wikipedia pages-articles XML dumps into the offline store
+import argparse
+import bz2
+import json
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from typing import Callable, Dict, IO, Iterator, List
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models.offline_article import OfflineArticle
+from app.services.content_extractor import normalize_title
+from app.services.wikitext import wikitext_to_text, extract_sections
+
+
+@dataclass
+class IngestStats:
+    """Counters reported at the end of an ingestion run"""
+    pages: int = 0
+    redirects: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages / self.seconds if self.seconds else 0.0
+
+
+def _open_dump(path: str) -> IO[bytes]:
+    return bz2.open(path, "rb") if path.endswith(".bz2") else open(path, "rb")
+
+
+def _local(tag: str) -> str:
+    """Strip the export namespace: '{http://...export-0.10/}page' -> 'page'"""
+    return tag.rsplit("}", 1)[-1]
+
+
+def iter_dump_pages(path: str) -> Iterator[Dict]:
+    """
+    Parse a pages-articles dump page by page.
+
+    Each <page> element is discarded as soon as it has been read, so memory
+    stays bounded regardless of the dump size.
+
+    Yields:
+        dict with title, ns, page_id, revision_id, redirect_to and wikitext
+    """
+    with _open_dump(path) as dump:
+        context = ET.iterparse(dump, events=("start", "end"))
+        _, root = next(context)
+        for event, elem in context:
+            if event != "end" or _local(elem.tag) != "page":
+                continue
+
+            page = {"title": None, "ns": None, "page_id": None, "revision_id": None,
+                    "redirect_to": None, "wikitext": ""}
+            for child in elem:
+                name = _local(child.tag)
+                if name == "title":
+                    page["title"] = child.text
+                elif name == "ns":
+                    page["ns"] = int(child.text)
+                elif name == "id":
+                    page["page_id"] = int(child.text)
+                elif name == "redirect":
+                    page["redirect_to"] = child.get("title")
+                elif name == "revision":
+                    for field in child:
+                        field_name = _local(field.tag)
+                        if field_name == "id":
+                            page["revision_id"] = int(field.text)
+                        elif field_name == "text":
+                            page["wikitext"] = field.text or ""
+            yield page
+
+            elem.clear()
+            root.clear()
+
+
+def _upsert_batch(db: Session, language: str, rows: List[Dict]) -> None:
+    titles = [row["title"] for row in rows]
+    existing = {
+        article.title: article
+        for article in db.query(OfflineArticle).filter(
+            OfflineArticle.language == language,
+            OfflineArticle.title.in_(titles)
+        )
+    }
+    for row in rows:
+        article = existing.get(row["title"])
+        if article is None:
+            article = OfflineArticle(language=language, title=row["title"])
+            db.add(article)
+            existing[row["title"]] = article
+        for field, value in row.items():
+            setattr(article, field, value)
+    db.commit()
+
+
+def ingest_dump(
+    path: str,
+    language: str,
+    session_factory: Callable[[], Session] = SessionLocal,
+    batch_size: int = 500,
+    progress: Callable[[IngestStats], None] = None,
+) -> IngestStats:
+    """
+    Load a pages-articles dump (.xml or .xml.bz2) into offline_articles.
+
+    Only main-namespace pages are kept. Content is converted to plain text
+    with "== Heading ==" lines and its section structure stored alongside;
+    redirects are recorded so lookups can follow them.
+    """
+    stats = IngestStats()
+    started = time.perf_counter()
+    batch: List[Dict] = []
+
+    with session_factory() as db:
+        for page in iter_dump_pages(path):
+            if page["ns"] != 0 or not page["title"]:
+                stats.skipped += 1
+                continue
+
+            row = {
+                "title": normalize_title(page["title"]),
+                "page_id": page["page_id"],
+                "revision_id": page["revision_id"],
+                "redirect_to": normalize_title(page["redirect_to"]) if page["redirect_to"] else None,
+                "content": "",
+                "sections": "[]",
+            }
+            if row["redirect_to"]:
+                stats.redirects += 1
+            else:
+                content = wikitext_to_text(page["wikitext"])
+                row["content"] = content
+                row["sections"] = json.dumps(extract_sections(content), ensure_ascii=False)
+            batch.append(row)
+            stats.pages += 1
+
+            if len(batch) >= batch_size:
+                _upsert_batch(db, language, batch)
+                batch = []
+                stats.seconds = time.perf_counter() - started
+                if progress:
+                    progress(stats)
+
+        if batch:
+            _upsert_batch(db, language, batch)
+
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest a Wikipedia pages-articles dump for offline extraction")
+    parser.add_argument("path", help="Path to the .xml or .xml.bz2 dump")
+    parser.add_argument("--language", required=True, help="Wikipedia language code of the dump (e.g. fr)")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    def report(stats: IngestStats) -> None:
+        print(f"{stats.pages} pages ingested ({stats.pages_per_second:.0f} pages/s)")
+
+    stats = ingest_dump(args.path, args.language, batch_size=args.batch_size, progress=report)
+    print(
+        f"Done: {stats.pages} pages ({stats.redirects} redirects, {stats.skipped} skipped) "
+        f"in {stats.seconds:.1f}s - {stats.pages_per_second:.0f} pages/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+# Background jobs: persistent job table, local worker pool, completion notifications
+import asyncio
+import json
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.exceptions import AppException
+from app.database import SessionLocal
+from app.models.job import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+# handler(payload, user_id, db) -> JSON-serializable result
+JobHandler = Callable[[Dict, int, Session], Awaitable[Dict]]
+# cleanup(payload): releases what the payload points at (temp files) once the job has finished
+JobCleanup = Callable[[Dict], None]
+
+FINISHED = (JobStatus.SUCCEEDED.value, JobStatus.FAILED.value)
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def job_to_dict(job: Job) -> Dict:
+    return {
+        "job_id": job.id,
+        "kind": job.kind,
+        "status": job.status.value,
+        "created_at": _isoformat(job.created_at),
+        "started_at": _isoformat(job.started_at),
+        "finished_at": _isoformat(job.finished_at),
+        "result": json.loads(job.result) if job.result else None,
+        "error": job.error,
+    }
+
+
+class JobQueue:
+    """
+    Runs long work (extractions and their summaries) outside the request
+    that asked for it.
+
+    submit() stores a queued row in the jobs table, hands its id to the
+    local workers and returns at once; callers poll get() or follow
+    watch(). A worker claims a job with a conditional update (queued ->
+    running), so each job runs once even when several processes share the
+    table, then runs its handler under a time limit and stores the JSON
+    result or the error. On start, queued jobs and jobs left running past
+    the time limit (process killed) are picked up again; jobs interrupted
+    by a clean shutdown go back to the queue. A kind's cleanup runs only
+    once its job has succeeded or failed, so a requeued job still finds
+    its inputs.
+
+    Database access runs in worker threads, so bookkeeping never blocks
+    the event loop (nor the time limit of the jobs running on it).
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        workers: int = settings.JOB_WORKERS,
+        timeout: float = settings.JOB_TIMEOUT_SECONDS,
+        poll_interval: float = settings.JOB_POLL_INTERVAL_SECONDS,
+    ):
+        self.session_factory = session_factory
+        self.workers = workers
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.handlers: Dict[str, JobHandler] = {}
+        self.cleanups: Dict[str, JobCleanup] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._changed = asyncio.Event()
+
+    def register(self, kind: str, handler: JobHandler, cleanup: Optional[JobCleanup] = None) -> None:
+        self.handlers[kind] = handler
+        if cleanup is not None:
+            self.cleanups[kind] = cleanup
+
+    async def start(self) -> None:
+        """Start the workers and queue the jobs waiting in the table"""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+        for job_id in await asyncio.to_thread(self._recover):
+            self._queue.put_nowait(job_id)
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    async def submit(self, kind: str, user_id: int, payload: Dict) -> Dict:
+        """Store a new job and queue it; returns the queued job"""
+        if kind not in self.handlers:
+            raise ValueError(f"Type de tâche inconnu: {kind}")
+        queued = await asyncio.to_thread(self._insert, kind, user_id, payload)
+        if self._queue is not None:
+            self._queue.put_nowait(queued["job_id"])
+        self._notify()
+        return queued
+
+    async def get(self, job_id: str, user_id: Optional[int] = None) -> Optional[Dict]:
+        """The job, or None when it does not exist (or belongs to another user)"""
+        return await asyncio.to_thread(self._load, job_id, user_id)
+
+    async def watch(
+        self, job_id: str, user_id: Optional[int] = None, max_seconds: Optional[float] = None
+    ) -> AsyncIterator[Optional[Dict]]:
+        """
+        Yields the job each time its status changes, ending once it has
+        finished (or after max_seconds). Yields None when a poll interval
+        passes without change, so callers can keep idle connections alive.
+        Jobs run by this process wake watchers at once; others are re-read
+        every poll interval.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (settings.JOB_EVENTS_MAX_SECONDS if max_seconds is None else max_seconds)
+        status = None
+        while True:
+            changed = self._changed
+            job = await self.get(job_id, user_id)
+            if job is None:
+                return
+            if job["status"] != status:
+                status = job["status"]
+                yield job
+                if status in FINISHED:
+                    return
+            else:
+                yield None
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            try:
+                await asyncio.wait_for(changed.wait(), min(self.poll_interval, remaining))
+            except asyncio.TimeoutError:
+                pass
+
+    def _notify(self) -> None:
+        """Wake every watcher; the next change gets a fresh event"""
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def _insert(self, kind: str, user_id: int, payload: Dict) -> Dict:
+        with self.session_factory() as db:
+            job = Job(
+                id=uuid.uuid4().hex,
+                user_id=user_id,
+                kind=kind,
+                status=JobStatus.QUEUED,
+                payload=json.dumps(payload, ensure_ascii=False),
+            )
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+            return job_to_dict(job)
+
+    def _load(self, job_id: str, user_id: Optional[int]) -> Optional[Dict]:
+        with self.session_factory() as db:
+            job = db.get(Job, job_id)
+            if job is None or (user_id is not None and job.user_id != user_id):
+                return None
+            return job_to_dict(job)
+
+    def _recover(self) -> List[str]:
+        stale = datetime.utcnow() - timedelta(seconds=self.timeout)
+        try:
+            with self.session_factory() as db:
+                db.query(Job).filter(Job.status == JobStatus.RUNNING, Job.started_at < stale).update(
+                    {"status": JobStatus.QUEUED, "started_at": None}, synchronize_session=False
+                )
+                db.commit()
+                return [job_id for (job_id,) in
+                        db.query(Job.id).filter(Job.status == JobStatus.QUEUED).order_by(Job.created_at)]
+        except SQLAlchemyError as e:
+            logger.warning(f"Job recovery failed: {e}")
+            return []
+
+    async def _work(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except SQLAlchemyError as e:
+                logger.warning(f"Job {job_id} bookkeeping failed: {e}")
+
+    async def _run(self, job_id: str) -> None:
+        claimed = await asyncio.to_thread(self._claim, job_id)
+        if claimed is None:
+            return
+        self._notify()
+        kind, payload, user_id = claimed
+        try:
+            handler = self.handlers.get(kind)
+            if handler is None:
+                raise ValueError(f"Type de tâche inconnu: {kind}")
+            with self.session_factory() as db:
+                result = await asyncio.wait_for(handler(payload, user_id, db), self.timeout)
+        except asyncio.CancelledError:
+            # Shutdown: the next start runs it again (shielded, so the row is requeued despite the cancel)
+            await asyncio.shield(asyncio.to_thread(self._update, job_id, status=JobStatus.QUEUED, started_at=None))
+            raise
+        except asyncio.TimeoutError:
+            await asyncio.to_thread(self._update, job_id, status=JobStatus.FAILED, finished_at=datetime.utcnow(),
+                                    error=f"Délai dépassé ({self.timeout:.0f} s)")
+        except Exception as e:
+            logger.warning(f"Job {job_id} ({kind}) failed: {e}")
+            await asyncio.to_thread(self._update, job_id, status=JobStatus.FAILED, finished_at=datetime.utcnow(),
+                                    error=e.detail if isinstance(e, AppException) else str(e))
+        else:
+            await asyncio.to_thread(self._update, job_id, status=JobStatus.SUCCEEDED, finished_at=datetime.utcnow(),
+                                    result=json.dumps(result, ensure_ascii=False, default=str))
+        self._cleanup(kind, payload)
+        self._notify()
+
+    def _cleanup(self, kind: str, payload: Dict) -> None:
+        """Release a finished job's inputs"""
+        cleanup = self.cleanups.get(kind)
+        if cleanup is None:
+            return
+        try:
+            cleanup(payload)
+        except Exception as e:
+            logger.warning(f"Cleanup of a {kind} job failed: {e}")
+
+    def _claim(self, job_id: str) -> Optional[Tuple[str, Dict, int]]:
+        """Mark a queued job running; None when it is gone or another worker got it first"""
+        with self.session_factory() as db:
+            claimed = db.query(Job).filter(Job.id == job_id, Job.status == JobStatus.QUEUED).update(
+                {"status": JobStatus.RUNNING, "started_at": datetime.utcnow()}, synchronize_session=False
+            )
+            db.commit()
+            if not claimed:
+                return None
+            job = db.get(Job, job_id)
+            return job.kind, json.loads(job.payload), job.user_id
+
+    def _update(self, job_id: str, **values) -> None:
+        with self.session_factory() as db:
+            db.query(Job).filter(Job.id == job_id).update(values, synchronize_session=False)
+            db.commit()
+
+
+job_queue = JobQueue()
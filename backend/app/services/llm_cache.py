@@ -0,0 +1,184 @@
+# Two-tier cache for LLM results (in-process LRU + database), with TTL
+import hashlib
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.llm_cache_entry import LLMCacheEntry
+from app.services.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Persistent rows are pruned (expired first, then least recently used) every N writes
+PRUNE_EVERY = 100
+
+
+def make_cache_key(*parts) -> str:
+    """Stable key for a set of request parameters (input hash, type, model, prompt version...)"""
+    return hashlib.sha256("\x1f".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class LLMResultCache:
+    """
+    Cache of LLM outputs, grouped by namespace ("summary", ...).
+
+    Entries expire after ttl_seconds in both tiers. The in-process tier is
+    an LRU bounded in bytes; the llm_cache table is kept under max_rows by
+    evicting the least recently used rows.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = settings.LLM_CACHE_MAX_BYTES,
+        ttl_seconds: int = settings.LLM_CACHE_TTL_SECONDS,
+        max_rows: int = settings.LLM_CACHE_MAX_ROWS,
+        session_factory: Optional[Callable[[], Session]] = SessionLocal,
+    ):
+        self.memory = LRUCache(max_bytes)
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.max_rows = max_rows
+        self.session_factory = session_factory
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def get(self, namespace: str, key: str) -> Optional[str]:
+        """Return a cached result or None on a miss (counted in stats)"""
+        value = self._lookup(namespace, key)
+        self._count(namespace, "hits" if value is not None else "misses")
+        return value
+
+    def peek(self, namespace: str, key: str) -> Optional[str]:
+        """Return a cached result or None, without touching the counters"""
+        return self._lookup(namespace, key)
+
+    def has(self, namespace: str, key: str) -> bool:
+        """Whether a result is cached, without touching the counters"""
+        return self.peek(namespace, key) is not None
+
+    def set(self, namespace: str, key: str, value: str) -> None:
+        expires_at = datetime.utcnow() + self.ttl
+        self.memory.set((namespace, key), (value, expires_at))
+        self._store(namespace, key, value, expires_at)
+
+    def purge(self, namespace: Optional[str] = None) -> int:
+        """Drop every entry (of one namespace), returning the number of entries removed"""
+        in_memory = [k for k in self.memory.keys() if namespace is None or k[0] == namespace]
+        for cache_key in in_memory:
+            self.memory.pop(cache_key)
+        if self.session_factory is None:
+            return len(in_memory)
+        try:
+            with self.session_factory() as db:
+                query = db.query(LLMCacheEntry)
+                if namespace is not None:
+                    query = query.filter(LLMCacheEntry.namespace == namespace)
+                removed = query.delete()
+                db.commit()
+                # The persistent tier holds every entry still in memory
+                return max(removed, len(in_memory))
+        except SQLAlchemyError as e:
+            logger.warning(f"LLM cache purge failed: {e}")
+            return len(in_memory)
+
+    def stats(self) -> Dict:
+        namespaces = {}
+        for namespace, counters in self._counters.items():
+            lookups = counters["hits"] + counters["misses"]
+            namespaces[namespace] = {
+                **counters,
+                "hit_rate": round(counters["hits"] / lookups, 4) if lookups else 0.0,
+            }
+        return {
+            "namespaces": namespaces,
+            "entries": len(self.memory),
+            "size_bytes": self.memory.size_bytes,
+            "max_bytes": self.memory.max_bytes,
+            "evictions": self.memory.evictions,
+        }
+
+    def _lookup(self, namespace: str, key: str) -> Optional[str]:
+        now = datetime.utcnow()
+        entry = self.memory.get((namespace, key))
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at > now:
+                return value
+            self.memory.pop((namespace, key))
+
+        entry = self._load(namespace, key, now)
+        if entry is None:
+            return None
+        self.memory.set((namespace, key), entry)
+        return entry[0]
+
+    def _count(self, namespace: str, counter: str) -> None:
+        with self._lock:
+            counters = self._counters.setdefault(namespace, {"hits": 0, "misses": 0})
+            counters[counter] += 1
+
+    def _load(self, namespace: str, key: str, now: datetime):
+        if self.session_factory is None:
+            return None
+        try:
+            with self.session_factory() as db:
+                row = db.query(LLMCacheEntry).filter(
+                    LLMCacheEntry.namespace == namespace,
+                    LLMCacheEntry.key == key,
+                    LLMCacheEntry.expires_at > now
+                ).first()
+                if row is None:
+                    return None
+                # Only persistent hits touch the row; memory hits stay in process
+                row.last_used_at = now
+                db.commit()
+                return row.value, row.expires_at
+        except SQLAlchemyError as e:
+            logger.warning(f"LLM cache read failed: {e}")
+            return None
+
+    def _store(self, namespace: str, key: str, value: str, expires_at: datetime) -> None:
+        if self.session_factory is None:
+            return
+        try:
+            with self.session_factory() as db:
+                row = db.query(LLMCacheEntry).filter(
+                    LLMCacheEntry.namespace == namespace,
+                    LLMCacheEntry.key == key
+                ).first()
+                if row is None:
+                    row = LLMCacheEntry(namespace=namespace, key=key)
+                    db.add(row)
+                row.value = value
+                row.expires_at = expires_at
+                row.last_used_at = datetime.utcnow()
+                db.commit()
+
+                with self._lock:
+                    self._writes += 1
+                    prune = self._writes % PRUNE_EVERY == 0
+                if prune:
+                    self._prune(db)
+        except SQLAlchemyError as e:
+            logger.warning(f"LLM cache write failed: {e}")
+
+    def _prune(self, db: Session) -> None:
+        db.query(LLMCacheEntry).filter(LLMCacheEntry.expires_at <= datetime.utcnow()).delete()
+        excess = db.query(LLMCacheEntry).count() - self.max_rows
+        if excess > 0:
+            oldest = db.query(LLMCacheEntry.id).order_by(LLMCacheEntry.last_used_at, LLMCacheEntry.id).limit(excess)
+            db.query(LLMCacheEntry).filter(
+                LLMCacheEntry.id.in_([row_id for row_id, in oldest])
+            ).delete(synchronize_session=False)
+        db.commit()
+
+
+llm_cache = LLMResultCache()
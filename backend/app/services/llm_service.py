@@ -1,91 +1,919 @@
 # Base LLM service interface
+import asyncio
+import json
 import os
-from groq import Groq
+from contextlib import AsyncExitStack
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from groq import Groq, AsyncGroq
 from app.core.config import settings
+from app.services.llm_cache import llm_cache, make_cache_key, text_hash
+from app.services.preprocessor import estimate_tokens, split_into_token_chunks, split_sentences, truncate_to_tokens
+from app.services.rate_limiter import ProviderRateLimiter, gemini_rate_limiter, groq_rate_limiter
+from app.services.resilience import CircuitBreaker, call_with_retry, fallback_provider, is_outage
+from app.services.translation_batcher import TranslationBatcher
+from app.services.translation_memory import translation_memory
 from google import genai
 from google.genai import types
 
+# Bump when the summary prompts change so cached summaries are not reused
+SUMMARY_PROMPT_VERSION = 1
+CHUNK_SUMMARY_PROMPT_VERSION = 1
+TRANSLATION_PROMPT_VERSION = 1
+
+# Output caps of a summary and of the notes written for one chunk of a long text
+SUMMARY_MAX_TOKENS = 1024
+CHUNK_SUMMARY_MAX_TOKENS = 512
+# Chat framing tokens per message, and safety margin on estimated token counts
+MESSAGE_OVERHEAD_TOKENS = 8
+TOKEN_ESTIMATE_MARGIN = 0.1
+# Notes still too long for one request after this many condensing passes are truncated
+MAX_CONDENSE_PASSES = 3
+
+GROQ_MODEL = "llama-3.1-8b-instant"
+GEMINI_MODEL = "gemini-3-flash-preview"
+
+
+SUMMARY_INSTRUCTIONS = {
+    "short": "Provide a concise summary in 3-5 bullet points. Focus on the absolute key facts.",
+    "medium": "Provide a medium-length summary (2-3 paragraphs). Cover the main history, key concepts, and significant details.",
+}
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You are an expert educational assistant named WikiSmart. "
+    "Your goal is to summarize complex academic content into clear, easy-to-understand text. "
+    "Do not add any conversational filler (like 'Here is the summary'). Just output the summary."
+)
+
+
+def summary_instruction(summary_type: str) -> str:
+    summary_type = summary_type.lower()
+    return SUMMARY_INSTRUCTIONS["short" if summary_type == "short" else "medium"]
+
+
+def summary_messages(text: str, summary_type: str) -> List[Dict[str, str]]:
+    """Chat messages asking Groq for a 'short' or 'medium' summary"""
+    user_prompt = f"""
+        Instructions: {summary_instruction(summary_type)}
+
+        Source Text:
+        {text}
+        """
+
+    return [
+        {
+            "role": "system",
+            "content": SUMMARY_SYSTEM_PROMPT,
+        },
+        {
+            "role": "user",
+            "content": user_prompt,
+        }
+    ]
+
+
+def combined_summary_messages(text: str, summary_types: Sequence[str]) -> List[Dict[str, str]]:
+    """Chat messages asking Groq for several summaries at once, as one JSON object"""
+    keys = "\n".join(
+        f'        - "{summary_type.lower()}": {summary_instruction(summary_type)}' for summary_type in summary_types
+    )
+    user_prompt = f"""
+        Instructions: Write each of the following summaries of the source text.
+        Answer with a JSON object whose keys are the summary names and whose values are the summaries as plain strings:
+{keys}
+
+        Source Text:
+        {text}
+        """
+
+    return [
+        {
+            "role": "system",
+            "content": SUMMARY_SYSTEM_PROMPT,
+        },
+        {
+            "role": "user",
+            "content": user_prompt,
+        }
+    ]
+
+
+def chunk_summary_messages(chunk: str) -> List[Dict[str, str]]:
+    """Chat messages asking Groq for dense notes on one part of a long text"""
+    user_prompt = f"""
+        Instructions: This is one part of a longer document. Write dense notes (at most 250 words) covering every key fact, name, date and concept of this part, in the order they appear.
+
+        Source Text:
+        {chunk}
+        """
+
+    return [
+        {
+            "role": "system",
+            "content": SUMMARY_SYSTEM_PROMPT,
+        },
+        {
+            "role": "user",
+            "content": user_prompt,
+        }
+    ]
+
+
+def parse_combined_summaries(output: str, summary_types: Sequence[str]) -> Dict[str, str]:
+    """Validate a combined summary answer, raising ValueError unless every summary is a non-empty string"""
+    try:
+        parsed = json.loads(output)
+    except (TypeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Réponse de résumé invalide: {e}")
+    if not isinstance(parsed, dict):
+        raise ValueError("Réponse de résumé invalide: objet JSON attendu")
+
+    summaries = {}
+    for summary_type in summary_types:
+        summary = parsed.get(summary_type.lower())
+        if isinstance(summary, list) and all(isinstance(item, str) for item in summary):
+            # Bullet points are sometimes returned as an array
+            summary = "\n".join(f"- {item}" for item in summary)
+        if not isinstance(summary, str) or not summary.strip():
+            raise ValueError(f"Résumé '{summary_type}' manquant dans la réponse")
+        summaries[summary_type] = summary.strip()
+    return summaries
+
+
+def translation_config(json_output: bool = False) -> types.GenerateContentConfig:
+    return types.GenerateContentConfig(
+        system_instruction="You are an expert translator",
+        temperature=1.0,
+        top_p=0.95,
+        top_k=60,
+        response_mime_type="application/json" if json_output else None
+    )
+
+
+def summary_fallback_config(
+    messages: List[Dict[str, str]], temperature: float, max_tokens: int, json_output: bool = False
+) -> types.GenerateContentConfig:
+    """Gemini settings for a Groq summary prompt (system + user messages) sent to Gemini instead"""
+    return types.GenerateContentConfig(
+        system_instruction=messages[0]["content"],
+        temperature=temperature,
+        max_output_tokens=max_tokens,
+        response_mime_type="application/json" if json_output else None
+    )
+
+
+def translation_fallback_messages(prompt: str) -> List[Dict[str, str]]:
+    """Groq messages for a Gemini translation prompt sent to Groq instead"""
+    return [
+        {"role": "system", "content": "You are an expert translator"},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def text_translation_prompt(text: str, target_language: str) -> str:
+    return f"Translate the text to {target_language} : {text}"
+
+
+def sentences_translation_prompt(sentences: List[str], target_language: str) -> str:
+    return (
+        f"Translate each sentence of this JSON array to {target_language}. "
+        "Sentences are consecutive parts of the same text. "
+        "Answer with a JSON array of strings, exactly one translation per sentence, in the same order.\n"
+        f"{json.dumps(sentences, ensure_ascii=False)}"
+    )
+
+
+def batch_translation_prompt(texts: List[str], target_language: str) -> str:
+    return (
+        f"Translate each text of this JSON array to {target_language}. "
+        "The texts are unrelated: translate each one on its own. "
+        "Answer with a JSON array of strings, exactly one translation per text, in the same order.\n"
+        f"{json.dumps(texts, ensure_ascii=False)}"
+    )
+
+
+def parse_sentence_translations(output: str, expected: int) -> List[str]:
+    """Validate a JSON array answer, raising ValueError unless it has one string per sentence"""
+    try:
+        translated = json.loads(output)
+    except (TypeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Réponse de traduction invalide: {e}")
+    if not isinstance(translated, list) or len(translated) != expected \
+            or not all(isinstance(item, str) for item in translated):
+        raise ValueError("Réponse de traduction non alignée sur les phrases")
+    return translated
+
+
+def summary_cache_key(model: str, text: str, summary_type: str) -> str:
+    return make_cache_key(text_hash(text), summary_type.lower(), model, SUMMARY_PROMPT_VERSION)
+
+
+def chunk_summary_cache_key(model: str, chunk: str) -> str:
+    return make_cache_key(text_hash(chunk), "chunk", model, CHUNK_SUMMARY_PROMPT_VERSION)
+
+
+def prompt_tokens(messages: List[Dict[str, str]]) -> int:
+    return sum(estimate_tokens(message["content"]) + MESSAGE_OVERHEAD_TOKENS for message in messages)
+
+
+def request_tokens(messages: List[Dict[str, str]], max_output_tokens: int) -> int:
+    """Tokens a Groq request counts against the per-minute limit (completion cap included)"""
+    return prompt_tokens(messages) + max_output_tokens
+
+
+def translation_request_tokens(prompt: str) -> int:
+    """Tokens of a Gemini translation request; the translation is about as long as the text"""
+    return 2 * estimate_tokens(prompt)
+
+
+def source_token_budget(messages: List[Dict[str, str]], max_output_tokens: int) -> int:
+    """
+    Tokens left for the source text in a Groq request built from messages
+    with an empty source, once the prompt and the completion are reserved.
+    """
+    available = settings.GROQ_MAX_REQUEST_TOKENS - request_tokens(messages, max_output_tokens)
+    return int(available * (1 - TOKEN_ESTIMATE_MARGIN))
+
+
+def summary_token_budget() -> int:
+    """
+    Source tokens of a summary request. Sized for the largest one (every
+    summary type in one combined call) so a text is fitted the same way
+    whichever summaries are requested, and cache keys stay stable.
+    """
+    summary_types = tuple(SUMMARY_INSTRUCTIONS)
+    return source_token_budget(
+        combined_summary_messages("", summary_types), SUMMARY_MAX_TOKENS * len(summary_types)
+    )
+
+
+def fit_summary_input(text: str) -> str:
+    """The text itself when it fits one summary request, else its leading sentences that do"""
+    return truncate_to_tokens(text, summary_token_budget())
+
+
+def split_for_summary(text: str) -> List[str]:
+    """Chunks summarized separately in the map step of a long text, each filling one request"""
+    budget = source_token_budget(chunk_summary_messages(""), CHUNK_SUMMARY_MAX_TOKENS)
+    return split_into_token_chunks(text, budget, settings.SUMMARY_CHUNK_OVERLAP_TOKENS)
+
+
+def translation_cache_key(model: str, text: str, target_language: str) -> str:
+    return make_cache_key(text_hash(text), target_language.strip().lower(), model, TRANSLATION_PROMPT_VERSION)
+
+
+def assemble_translation(segments: List[Tuple[str, str]], translations: Dict[int, str]) -> str:
+    """Put translated sentences back together with the original separators"""
+    return "".join(translations[index] + separator for index, (_, separator) in enumerate(segments))
+
+
 class LLMService:
     def __init__(self):
         self.client = Groq(
             api_key=os.getenv("GROQ_API_KEY"),
-            
+
         )
 
-       
-        self.model = "llama-3.1-8b-instant" 
-        self.gemini_model_name = "gemini-3-flash-preview"
+
+        self.model = GROQ_MODEL
+        self.gemini_model_name = GEMINI_MODEL
         self.google_api_key = settings.GOOGLE_API_KEY
-         
+        self._gemini_client = None
+
+    @property
+    def gemini_client(self) -> genai.Client:
+        """Gemini client, created on first use and reused afterwards"""
+        if self._gemini_client is None:
+            self._gemini_client = genai.Client(api_key=self.google_api_key)
+        return self._gemini_client
+
+    def summary_cache_key(self, text: str, summary_type: str) -> str:
+        return summary_cache_key(self.model, text, summary_type)
 
     def generate_summary(self, text: str, summary_type: str) -> str:
         """
         Generates a summary using Groq.
         summary_type: 'short' or 'medium'
-        """
-        
-
-        if summary_type.lower() == "short":
-            instruction = "Provide a concise summary in 3-5 bullet points. Focus on the absolute key facts."
-        else:
-            instruction = "Provide a medium-length summary (2-3 paragraphs). Cover the main history, key concepts, and significant details."
-
 
-        system_prompt = (
-            "You are an expert educational assistant named WikiSmart. "
-            "Your goal is to summarize complex academic content into clear, easy-to-understand text. "
-            "Do not add any conversational filler (like 'Here is the summary'). Just output the summary."
-        )
-
-        user_prompt = f"""
-        Instructions: {instruction}
-        
-        Source Text:
-        {text}
+        Identical requests (same text, type, model and prompt version) are
+        answered from the LLM result cache. Texts longer than one request
+        allows are cut at the last sentence that fits.
         """
+        text = fit_summary_input(text)
+        cache_key = self.summary_cache_key(text, summary_type)
+        cached = llm_cache.get("summary", cache_key)
+        if cached is not None:
+            return cached
 
         try:
-          
+
             chat_completion = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": system_prompt,
-                    },
-                    {
-                        "role": "user",
-                        "content": user_prompt,
-                    }
-                ],
+                messages=summary_messages(text, summary_type),
                 model=self.model,
                 temperature=0.5,
-                max_tokens=1024,
+                max_tokens=SUMMARY_MAX_TOKENS,
             )
 
-            return chat_completion.choices[0].message.content
+            summary = chat_completion.choices[0].message.content
 
         except Exception as e:
             print(f"Error generating summary: {e}")
             raise e
-        
+
+        if summary:
+            llm_cache.set("summary", cache_key, summary)
+        return summary
+
+    def translation_cache_key(self, text: str, target_language: str) -> str:
+        return translation_cache_key(self.gemini_model_name, text, target_language)
+
     def get_translation(self, text: str, target_language: str) -> str:
-     
-        client = genai.Client(api_key=self.google_api_key)
-        
-        prompt = f"Translate the text to {target_language} : {text}"
+        """
+        Translates text using Gemini. Identical requests (same text, target
+        language, model and prompt version) are answered from the LLM
+        result cache, shared by every translate route.
+
+        Sentence reuse through the translation memory is done by
+        AsyncLLMService, which serves the routes.
+        """
+        cache_key = self.translation_cache_key(text, target_language)
+        cached = llm_cache.get("translation", cache_key)
+        if cached is not None:
+            return cached
+
+        translation = self._generate_translation(text_translation_prompt(text, target_language))
+        if translation:
+            llm_cache.set("translation", cache_key, translation)
+        return translation
 
+    def _generate_translation(self, prompt: str) -> str:
         try:
-            response = client.models.generate_content(
+            response = self.gemini_client.models.generate_content(
                 model=self.gemini_model_name, # Pass the string name, not a model object
-                config=types.GenerateContentConfig(
-                    system_instruction="You are an expert translator",
-                    temperature=1.0,
-                    top_p=0.95,
-                    top_k=60
-                ),
+                config=translation_config(),
                 contents=prompt,
             )
             return response.text
         except Exception as e:
             print(f"Error generating translation: {e}")
-            raise e
\ No newline at end of file
+            raise e
+
+
+class AsyncLLMService:
+    """
+    Awaitable counterpart of LLMService for async routes.
+
+    Provider clients (AsyncGroq, Gemini's async client) are built once and
+    reused, so their HTTP connection pools are shared by every request and
+    a slow LLM call no longer blocks the event loop. Caches and prompts
+    are shared with LLMService; only this service batches summaries and
+    reuses sentences through the translation memory.
+
+    Every provider call goes through that provider's ProviderRateLimiter,
+    so traffic spikes queue (boundedly) instead of drawing 429s.
+
+    Transient provider errors are retried with jittered backoff behind a
+    per-provider CircuitBreaker. While a provider is down, its work goes
+    to the fallback provider (LLM_SUMMARY_FALLBACK: Gemini summarizes,
+    LLM_TRANSLATION_FALLBACK: Groq translates). Fallback answers are
+    returned but never cached, since cache keys name the primary model.
+
+    Short translations go through a TranslationBatcher: concurrent
+    requests for the same language share one JSON-array Gemini call.
+    """
+
+    def __init__(
+        self,
+        groq_client: Optional[AsyncGroq] = None,
+        gemini_client=None,
+        groq_limiter: Optional[ProviderRateLimiter] = None,
+        gemini_limiter: Optional[ProviderRateLimiter] = None,
+    ):
+        self.client = groq_client or AsyncGroq(api_key=os.getenv("GROQ_API_KEY"))
+        self._gemini_client = gemini_client
+        self.groq_limiter = groq_limiter or groq_rate_limiter()
+        self.gemini_limiter = gemini_limiter or gemini_rate_limiter()
+        self.breakers = {"groq": CircuitBreaker("groq"), "gemini": CircuitBreaker("gemini")}
+        self.translation_batcher = TranslationBatcher(self._translate_batch)
+        self.model = GROQ_MODEL
+        self.gemini_model_name = GEMINI_MODEL
+
+    @property
+    def gemini_client(self):
+        """Async Gemini client, created on first use so that startup does not need a Gemini key"""
+        if self._gemini_client is None:
+            # None lets the SDK read GOOGLE_API_KEY / GEMINI_API_KEY from the environment itself
+            api_key = settings.GOOGLE_API_KEY or settings.GEMINI_API_KEY or None
+            self._gemini_client = genai.Client(api_key=api_key).aio
+        return self._gemini_client
+
+    def rate_limit_stats(self) -> Dict:
+        return {"groq": self.groq_limiter.stats(), "gemini": self.gemini_limiter.stats()}
+
+    def breaker_stats(self) -> Dict:
+        return {name: breaker.stats() for name, breaker in self.breakers.items()}
+
+    async def _groq_create(self, **request):
+        """Groq chat completion, admitted by the Groq rate limiter, retried on transient errors"""
+        async def attempt():
+            async with self.groq_limiter.slot(request_tokens(request["messages"], request["max_tokens"])):
+                return await self.client.chat.completions.create(**request)
+
+        return await call_with_retry(attempt, self.breakers["groq"])
+
+    async def _gemini_generate(self, prompt: str, config: types.GenerateContentConfig, tokens: int):
+        """Gemini generation, admitted by the Gemini rate limiter, retried on transient errors"""
+        async def attempt():
+            async with self.gemini_limiter.slot(tokens):
+                return await self.gemini_client.models.generate_content(
+                    model=self.gemini_model_name,
+                    config=config,
+                    contents=prompt,
+                )
+
+        return await call_with_retry(attempt, self.breakers["gemini"])
+
+    async def _open_stream(self, provider: str, tokens: int, open_stream) -> Tuple[object, AsyncExitStack]:
+        """
+        Open a provider stream, retried like any other call. The returned
+        exit stack holds the rate limiter slot: enter it around consuming
+        the stream, which counts as one call in flight.
+        """
+        limiter = self.groq_limiter if provider == "groq" else self.gemini_limiter
+
+        async def attempt():
+            async with AsyncExitStack() as stack:
+                await stack.enter_async_context(limiter.slot(tokens))
+                stream = await open_stream()
+                return stream, stack.pop_all()
+
+        return await call_with_retry(attempt, self.breakers[provider])
+
+    def _can_fall_back(self, task: str, error: Exception) -> bool:
+        """Whether a failed summary (to Gemini) or translation (to Groq) call should go to the other provider"""
+        return is_outage(error) and fallback_provider(task) == ("gemini" if task == "summary" else "groq")
+
+    async def _complete_summary(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        json_output: bool = False
+    ) -> Tuple[str, bool]:
+        """Groq completion of a summary prompt, or the fallback's while Groq is down, as (text, from Groq)"""
+        request = dict(messages=messages, model=self.model, temperature=temperature, max_tokens=max_tokens)
+        if json_output:
+            request["response_format"] = {"type": "json_object"}
+        try:
+            chat_completion = await self._groq_create(**request)
+            return chat_completion.choices[0].message.content, True
+        except Exception as e:
+            if not self._can_fall_back("summary", e):
+                print(f"Error generating summary: {e}")
+                raise e
+            return await self._fallback_summary(messages, temperature, max_tokens, json_output, e), False
+
+    async def _fallback_summary(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        json_output: bool,
+        error: Exception
+    ) -> str:
+        print(f"LLM fallback: Groq unavailable ({error}), summarizing with Gemini")
+        try:
+            response = await self._gemini_generate(
+                messages[1]["content"],
+                summary_fallback_config(messages, temperature, max_tokens, json_output),
+                request_tokens(messages, max_tokens),
+            )
+        except Exception as e:
+            print(f"LLM fallback failed: {e}")
+            raise error
+        return response.text
+
+    def summary_cache_key(self, text: str, summary_type: str) -> str:
+        return summary_cache_key(self.model, text, summary_type)
+
+    def is_summary_cached(self, text: str, summary_type: str) -> bool:
+        return llm_cache.has("summary", self.summary_cache_key(fit_summary_input(text), summary_type))
+
+    async def generate_summary(self, text: str, summary_type: str) -> str:
+        """Generates a 'short' or 'medium' summary using Groq (input fitted to one request)"""
+        text = fit_summary_input(text)
+        cache_key = self.summary_cache_key(text, summary_type)
+        cached = llm_cache.get("summary", cache_key)
+        if cached is not None:
+            return cached
+
+        summary, from_groq = await self._complete_summary(
+            summary_messages(text, summary_type), temperature=0.5, max_tokens=SUMMARY_MAX_TOKENS
+        )
+        if summary and from_groq:
+            llm_cache.set("summary", cache_key, summary)
+        return summary
+
+    async def generate_summaries(
+        self,
+        text: str,
+        summary_types: Sequence[str] = ("short", "medium"),
+        timeout: Optional[float] = None
+    ) -> Dict[str, str]:
+        """
+        Generates several summaries of the same text under one shared
+        deadline. Returns the summaries that succeeded in time, by type;
+        failed or late ones are left out (and late ones cancelled).
+
+        Summaries missing from the cache are requested together in one
+        JSON-mode call; if that answer cannot be parsed, they are generated
+        concurrently with one call each, within what is left of the deadline.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout is not None else None
+
+        text = fit_summary_input(text)
+        summaries = {}
+        for summary_type in summary_types:
+            cached = llm_cache.get("summary", self.summary_cache_key(text, summary_type))
+            if cached is not None:
+                summaries[summary_type] = cached
+
+        missing = [summary_type for summary_type in summary_types if summary_type not in summaries]
+        if len(missing) > 1:
+            try:
+                summaries.update(
+                    await asyncio.wait_for(self._generate_combined_summaries(text, missing), timeout)
+                )
+                return summaries
+            except asyncio.TimeoutError:
+                print(f"AI Summary warning: summaries exceeded the {timeout}s deadline")
+                return summaries
+            except ValueError as e:
+                print(f"Combined summary fallback: {e}")
+            except Exception as e:
+                print(f"AI Summary warning: combined summary failed: {e}")
+                return summaries
+
+        remaining = max(deadline - loop.time(), 0) if deadline is not None else None
+        summaries.update(await self._generate_each(text, missing, remaining, timeout))
+        return summaries
+
+    async def _generate_combined_summaries(self, text: str, summary_types: Sequence[str]) -> Dict[str, str]:
+        output, from_groq = await self._complete_summary(
+            combined_summary_messages(text, summary_types),
+            temperature=0.5,
+            max_tokens=SUMMARY_MAX_TOKENS * len(summary_types),
+            json_output=True,
+        )
+        summaries = parse_combined_summaries(output, summary_types)
+        if from_groq:
+            for summary_type, summary in summaries.items():
+                llm_cache.set("summary", self.summary_cache_key(text, summary_type), summary)
+        return summaries
+
+    async def _generate_each(
+        self,
+        text: str,
+        summary_types: Sequence[str],
+        remaining: Optional[float],
+        timeout: Optional[float]
+    ) -> Dict[str, str]:
+        """One concurrent call per summary type, cancelled once `remaining` seconds have passed"""
+        if not summary_types:
+            return {}
+        tasks = {
+            asyncio.ensure_future(self.generate_summary(text, summary_type)): summary_type
+            for summary_type in summary_types
+        }
+        done, pending = await asyncio.wait(tasks, timeout=remaining)
+        for task in pending:
+            task.cancel()
+            print(f"AI Summary warning: {tasks[task]} summary exceeded the {timeout}s deadline")
+
+        summaries = {}
+        for task in done:
+            if task.exception() is not None:
+                print(f"AI Summary warning: {tasks[task]} summary failed: {task.exception()}")
+            else:
+                summaries[tasks[task]] = task.result()
+        return summaries
+
+    def is_document_summarized(self, text: str, summary_type: str) -> bool:
+        """Whether summarize_document would answer this summary from the cache alone"""
+        for _ in range(MAX_CONDENSE_PASSES):
+            if estimate_tokens(text) <= summary_token_budget():
+                break
+            notes = [llm_cache.peek("chunk_summary", chunk_summary_cache_key(self.model, chunk))
+                     for chunk in split_for_summary(text)]
+            if any(note is None for note in notes):
+                return False
+            text = "\n\n".join(notes)
+        return self.is_summary_cached(text, summary_type)
+
+    async def summarize_document(
+        self,
+        text: str,
+        summary_types: Sequence[str] = ("short", "medium"),
+        timeout: Optional[float] = None
+    ) -> Dict[str, str]:
+        """
+        Summaries of a text of any length, by type (see generate_summaries).
+
+        Texts too long for one summary request (by estimated tokens) are
+        map-reduced: each token-budgeted chunk is condensed to notes
+        concurrently (SUMMARY_MAP_CONCURRENCY calls at most, each cached by
+        chunk), and the notes, in document order, are summarized to the
+        requested lengths. Notes still too long are condensed again. The
+        deadline covers every step.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout is not None else None
+
+        def remaining() -> Optional[float]:
+            return max(deadline - loop.time(), 0) if deadline is not None else None
+
+        try:
+            notes = await asyncio.wait_for(self.reduce_to_summary_input(text), remaining())
+        except asyncio.TimeoutError:
+            print(f"AI Summary warning: chunk summaries exceeded the {timeout}s deadline")
+            return {}
+        except ValueError as e:
+            print(f"AI Summary warning: {e}")
+            return {}
+
+        return await self.generate_summaries(notes, summary_types, remaining())
+
+    async def reduce_to_summary_input(self, text: str) -> str:
+        """
+        The text itself when it fits one summary request, else the notes of
+        its chunks (map step, repeated while still too long). Raises
+        ValueError when no chunk could be condensed.
+        """
+        notes = text
+        for _ in range(MAX_CONDENSE_PASSES):
+            if estimate_tokens(notes) <= summary_token_budget():
+                break
+            notes = await self._condense(notes)
+        return notes
+
+    async def stream_document_summary(self, text: str, summary_type: str) -> AsyncIterator[str]:
+        """stream_summary for a text of any length: long texts are condensed first (see summarize_document)"""
+        notes = await self.reduce_to_summary_input(text)
+        async for delta in self.stream_summary(notes, summary_type):
+            yield delta
+
+    async def stream_summary(self, text: str, summary_type: str) -> AsyncIterator[str]:
+        """
+        Yields a summary as Groq generates it, for Server-Sent Events.
+
+        A cached summary is yielded whole. A stream that completes is stored
+        in the summary cache under the same key as generate_summary; one
+        abandoned by the consumer (client gone) is closed and not cached.
+        If Groq is down, the fallback provider's summary is yielded whole.
+        """
+        text = fit_summary_input(text)
+        cache_key = self.summary_cache_key(text, summary_type)
+        cached = llm_cache.get("summary", cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+        messages = summary_messages(text, summary_type)
+        parts = []
+        try:
+            stream, slot = await self._open_stream(
+                "groq",
+                request_tokens(messages, SUMMARY_MAX_TOKENS),
+                lambda: self.client.chat.completions.create(
+                    messages=messages,
+                    model=self.model,
+                    temperature=0.5,
+                    max_tokens=SUMMARY_MAX_TOKENS,
+                    stream=True,
+                ),
+            )
+        except Exception as e:
+            if not self._can_fall_back("summary", e):
+                print(f"Error generating summary: {e}")
+                raise e
+            yield await self._fallback_summary(messages, 0.5, SUMMARY_MAX_TOKENS, False, e)
+            return
+
+        # The slot is held for the whole stream: it is one call in flight
+        async with slot:
+            try:
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        parts.append(delta)
+                        yield delta
+            finally:
+                await stream.close()
+
+        summary = "".join(parts)
+        if summary:
+            llm_cache.set("summary", cache_key, summary)
+
+    async def summarize_chunk(self, chunk: str) -> str:
+        """Dense notes on one chunk of a long text (map step)"""
+        cache_key = chunk_summary_cache_key(self.model, chunk)
+        cached = llm_cache.get("chunk_summary", cache_key)
+        if cached is not None:
+            return cached
+
+        notes, from_groq = await self._complete_summary(
+            chunk_summary_messages(chunk), temperature=0.3, max_tokens=CHUNK_SUMMARY_MAX_TOKENS
+        )
+        if notes and from_groq:
+            llm_cache.set("chunk_summary", cache_key, notes)
+        return notes
+
+    async def _condense(self, text: str) -> str:
+        """Replace text by the notes of its chunks, skipping chunks that failed"""
+        semaphore = asyncio.Semaphore(settings.SUMMARY_MAP_CONCURRENCY)
+
+        async def summarize(chunk: str) -> str:
+            async with semaphore:
+                return await self.summarize_chunk(chunk)
+
+        results = await asyncio.gather(*(summarize(chunk) for chunk in split_for_summary(text)), return_exceptions=True)
+        notes = []
+        for index, result in enumerate(results):
+            if isinstance(result, BaseException):
+                print(f"AI Summary warning: chunk {index} summary failed: {result}")
+            elif result:
+                notes.append(result)
+        if not notes:
+            raise ValueError("Aucun extrait du texte n'a pu être résumé")
+        return "\n\n".join(notes)
+
+    async def get_translation(self, text: str, target_language: str) -> str:
+        """Translates text using Gemini (result cache, then translation memory)"""
+        cache_key = translation_cache_key(self.gemini_model_name, text, target_language)
+        cached = llm_cache.get("translation", cache_key)
+        if cached is not None:
+            return cached
+
+        segments = split_sentences(text)
+        if len(segments) > 1:
+            translation, from_gemini = await self._translate_with_memory(segments, target_language)
+        elif self.translation_batcher.accepts(text):
+            translation, from_gemini = await self.translation_batcher.submit(text, target_language)
+        else:
+            translation, from_gemini = await self._generate_translation(text_translation_prompt(text, target_language))
+
+        if translation and from_gemini:
+            llm_cache.set("translation", cache_key, translation)
+        return translation
+
+    async def stream_translation(self, text: str, target_language: str) -> AsyncIterator[str]:
+        """
+        Yields a translation as Gemini generates it (streaming generation).
+
+        A cached translation is yielded whole. A completed stream is stored
+        in the translation result cache; the translation memory is not used
+        since it works on whole, aligned sentence lists. Closing the
+        iterator (client gone) closes the Gemini stream, which stops
+        generation, and nothing is cached. If Gemini is down, the fallback
+        provider's translation is yielded whole.
+        """
+        cache_key = translation_cache_key(self.gemini_model_name, text, target_language)
+        cached = llm_cache.get("translation", cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+        prompt = text_translation_prompt(text, target_language)
+        parts = []
+        try:
+            stream, slot = await self._open_stream(
+                "gemini",
+                translation_request_tokens(prompt),
+                lambda: self.gemini_client.models.generate_content_stream(
+                    model=self.gemini_model_name,
+                    config=translation_config(),
+                    contents=prompt,
+                ),
+            )
+        except Exception as e:
+            if not self._can_fall_back("translation", e):
+                print(f"Error generating translation: {e}")
+                raise e
+            yield await self._fallback_translation(prompt, e)
+            return
+
+        async with slot:
+            try:
+                async for chunk in stream:
+                    if chunk.text:
+                        parts.append(chunk.text)
+                        yield chunk.text
+            finally:
+                await stream.aclose()
+
+        translation = "".join(parts)
+        if translation:
+            llm_cache.set("translation", cache_key, translation)
+
+    async def _translate_batch(self, target_language: str, texts: List[str]) -> List[object]:
+        """
+        Translations of unrelated short texts, as (text, from Gemini) per
+        text: one JSON-array call, or one call per text if its answer is
+        not aligned (a failed text then gets its own exception).
+        """
+        if len(texts) == 1:
+            return [await self._generate_translation(text_translation_prompt(texts[0], target_language))]
+        try:
+            output, from_gemini = await self._generate_translation(
+                batch_translation_prompt(texts, target_language), json_output=True
+            )
+            return [(translation, from_gemini) for translation in parse_sentence_translations(output, len(texts))]
+        except ValueError as e:
+            print(f"Batch translation fallback: {e}")
+        return await asyncio.gather(*(
+            self._generate_translation(text_translation_prompt(text, target_language)) for text in texts
+        ), return_exceptions=True)
+
+    async def _translate_with_memory(
+        self, segments: List[Tuple[str, str]], target_language: str
+    ) -> Tuple[str, bool]:
+        language = target_language.strip().lower()
+        sentences = [sentence for sentence, _ in segments]
+        # Database lookups and fuzzy scoring block: keep them off the event loop
+        translations = await asyncio.to_thread(translation_memory.lookup, language, self.gemini_model_name, sentences)
+
+        from_gemini = True
+        missing = [index for index in range(len(sentences)) if index not in translations]
+        if missing:
+            try:
+                output, from_gemini = await self._generate_translation(
+                    sentences_translation_prompt([sentences[i] for i in missing], target_language), json_output=True
+                )
+                translated = parse_sentence_translations(output, len(missing))
+            except ValueError as e:
+                print(f"Sentence translation fallback: {e}")
+                text = "".join(s + sep for s, sep in segments)
+                return await self._generate_translation(text_translation_prompt(text, target_language))
+            translations.update(zip(missing, translated))
+            if from_gemini:
+                await asyncio.to_thread(
+                    translation_memory.store,
+                    language, self.gemini_model_name, [(sentences[i], translations[i]) for i in missing]
+                )
+
+        return assemble_translation(segments, translations), from_gemini
+
+    async def _generate_translation(self, prompt: str, json_output: bool = False) -> Tuple[str, bool]:
+        """Gemini translation, or the fallback's while Gemini is down, as (text, from Gemini)"""
+        try:
+            response = await self._gemini_generate(
+                prompt, translation_config(json_output), translation_request_tokens(prompt)
+            )
+            return response.text, True
+        except Exception as e:
+            if not self._can_fall_back("translation", e):
+                print(f"Error generating translation: {e}")
+                raise e
+            return await self._fallback_translation(prompt, e), False
+
+    async def _fallback_translation(self, prompt: str, error: Exception) -> str:
+        print(f"LLM fallback: Gemini unavailable ({error}), translating with Groq")
+        try:
+            # Groq's JSON mode only returns objects: sentence arrays are asked for in plain text
+            chat_completion = await self._groq_create(
+                messages=translation_fallback_messages(prompt),
+                model=self.model,
+                temperature=0.3,
+                max_tokens=max(translation_request_tokens(prompt) - estimate_tokens(prompt), 1),
+            )
+        except Exception as e:
+            print(f"LLM fallback failed: {e}")
+            raise error
+        return chat_completion.choices[0].message.content
+
+    async def aclose(self) -> None:
+        """Close the pooled Groq connections and the Gemini client, if one was created"""
+        await self.client.close()
+        gemini, self._gemini_client = self._gemini_client, None
+        # Older google-genai releases open a session per request and have nothing to close
+        close = getattr(gemini, "aclose", None)
+        if close is not None:
+            await close()
+
+
+_async_llm_service: Optional[AsyncLLMService] = None
+
+
+def get_async_llm_service() -> AsyncLLMService:
+    """Process-wide AsyncLLMService, built on first use (application startup)"""
+    global _async_llm_service
+    if _async_llm_service is None:
+        _async_llm_service = AsyncLLMService()
+    return _async_llm_service
+
+
+async def close_async_llm_service() -> None:
+    global _async_llm_service
+    if _async_llm_service is not None:
+        await _async_llm_service.aclose()
+        _async_llm_service = None
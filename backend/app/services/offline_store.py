@@ -0,0 +1,61 @@
+# Local article store fed by Wikipedia dump ingestion
+import logging
+from typing import Callable, Dict, Optional
+from urllib.parse import quote
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models.offline_article import OfflineArticle
+from app.services.wikipedia_client import extract_intro
+
+logger = logging.getLogger(__name__)
+
+# Redirect chains longer than this are treated as broken
+MAX_REDIRECTS = 3
+
+
+class OfflineArticleStore:
+    """
+    Read side of the offline_articles table.
+
+    Returns the same dict as get_wikipedia_content, following redirect
+    pages recorded during ingestion, so extraction works without network.
+    """
+
+    def __init__(self, session_factory: Optional[Callable[[], Session]] = SessionLocal):
+        self.session_factory = session_factory
+
+    def get(self, language: str, title: str) -> Optional[Dict]:
+        """Return the stored article or None when it was not ingested"""
+        if self.session_factory is None:
+            return None
+        try:
+            with self.session_factory() as db:
+                for _ in range(MAX_REDIRECTS + 1):
+                    row = db.query(OfflineArticle).filter(
+                        OfflineArticle.language == language,
+                        OfflineArticle.title == title
+                    ).first()
+                    if row is None:
+                        return None
+                    if not row.redirect_to:
+                        return self._to_content(row)
+                    title = row.redirect_to
+                return None
+        except SQLAlchemyError as e:
+            logger.warning(f"Offline store read failed: {e}")
+            return None
+
+    @staticmethod
+    def _to_content(row: OfflineArticle) -> Dict:
+        return {
+            "title": row.title,
+            "content": row.content,
+            "summary": extract_intro(row.content),
+            "url": f"https://{row.language}.wikipedia.org/wiki/{quote(row.title.replace(' ', '_'))}",
+            "language": row.language,
+            "revision_id": row.revision_id,
+        }
+
+
+offline_store = OfflineArticleStore()
@@ -1,5 +1,6 @@
 # PDF text extraction service
 from langchain_community.document_loaders import PyPDFLoader
+import asyncio
 import os
 from typing import Dict, List
 
@@ -22,7 +23,8 @@ async def extract_text_from_pdf(file_path: str, clean_up: bool = True) -> Dict[s
     
     try:
         loader = PyPDFLoader(file_path)
-        pages = loader.load()
+        # Parsing is CPU-bound: a worker thread keeps the event loop (and job time limits) responsive
+        pages = await asyncio.to_thread(loader.load)
         
         if not pages:
             raise Exception("Le PDF ne contient aucune page ou est vide")
@@ -1,6 +1,14 @@
 # Text preprocessing: section segmentation and text cleaning
 import re
-from typing import Dict, List
+from typing import Dict, List, Tuple
+
+# Fin de phrase (ponctuation suivie d'espaces) ou saut de ligne
+_SENTENCE_BREAK = re.compile(r"((?<=[.!?…])\s+|\s*\n\s*)")
+
+# Morceaux comptés par l'estimateur de tokens : idéogrammes, nombres, mots, ponctuation
+_TOKEN_PIECE = re.compile(
+    r"(?P<cjk>[\u3040-\u30ff\u3400-\u9fff\uac00-\ud7af])|(?P<digits>\d+)|(?P<word>[^\W\d_]+)|(?P<punct>[^\w\s])"
+)
 
 def clean_and_segment_text(raw_text: str) -> Dict[str, str]:
     """
@@ -95,6 +103,131 @@ def split_into_chunks(text: str, chunk_size: int = 1000, overlap: int = 200) ->
                 end = last_period + 1
         
         chunks.append(text[start:end].strip())
-        start = end - overlap if end < len(text) else end
+        if end >= len(text):
+            break
+        # Le chevauchement ne doit jamais faire reculer le début du chunk suivant
+        start = end - overlap if end - overlap > start else end
     
-    return chunks
\ No newline at end of file
+    return chunks
+
+
+def split_sentences(text: str) -> List[Tuple[str, str]]:
+    """
+    Découpe le texte en phrases pour la mémoire de traduction
+
+    Returns:
+        Liste de paires (phrase, séparateur) ; concaténées, elles redonnent
+        le texte sans les espaces de début et de fin
+    """
+    parts = _SENTENCE_BREAK.split(text.strip())
+    pairs: List[Tuple[str, str]] = []
+    for i in range(0, len(parts), 2):
+        sentence = parts[i]
+        separator = parts[i + 1] if i + 1 < len(parts) else ""
+        if sentence:
+            pairs.append((sentence, separator))
+        elif pairs:
+            pairs[-1] = (pairs[-1][0], pairs[-1][1] + separator)
+    return pairs
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estime rapidement, sans tokenizer, le nombre de tokens BPE d'un texte
+
+    Un mot ASCII compte environ un token par 4 lettres, un mot accentué ou
+    dans un autre alphabet un par 3, les nombres un par 3 chiffres, chaque
+    idéogramme et chaque signe de ponctuation un token. L'estimation est
+    volontairement un peu pessimiste pour ne pas dépasser les limites.
+    """
+    tokens = 0
+    for match in _TOKEN_PIECE.finditer(text):
+        kind, piece = match.lastgroup, match.group()
+        if kind == "word":
+            tokens += -(-len(piece) // (4 if piece.isascii() else 3))
+        elif kind == "digits":
+            tokens += -(-len(piece) // 3)
+        else:
+            tokens += 1
+    return tokens
+
+
+def split_into_token_chunks(text: str, max_tokens: int, overlap_tokens: int = 0) -> List[str]:
+    """
+    Divise le texte en chunks d'au plus max_tokens tokens (estimés) en
+    coupant aux fins de phrase ; une phrase trop longue est coupée entre
+    deux mots.
+
+    Args:
+        text: Texte à diviser
+        max_tokens: Budget de tokens de chaque chunk
+        overlap_tokens: Tokens de phrases complètes répétés au début du chunk suivant
+
+    Returns:
+        Liste de chunks de texte (le texte inchangé s'il tient dans le budget)
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+
+    pieces: List[Tuple[str, int]] = []
+    for sentence, separator in split_sentences(text):
+        tokens = estimate_tokens(sentence)
+        if tokens <= max_tokens:
+            pieces.append((sentence + separator, tokens))
+        else:
+            pieces.extend(_split_long_sentence(sentence + separator, max_tokens))
+
+    chunks = []
+    current: List[Tuple[str, int]] = []
+    current_tokens = 0
+    for piece, tokens in pieces:
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append("".join(p for p, _ in current).strip())
+            # Garder les dernières phrases comme chevauchement, sans reprendre tout le chunk
+            kept: List[Tuple[str, int]] = []
+            kept_tokens = 0
+            for p, t in reversed(current[1:]):
+                if kept_tokens + t > overlap_tokens:
+                    break
+                kept.insert(0, (p, t))
+                kept_tokens += t
+            if kept_tokens + tokens > max_tokens:
+                kept, kept_tokens = [], 0
+            current, current_tokens = kept, kept_tokens
+        current.append((piece, tokens))
+        current_tokens += tokens
+    if current:
+        chunks.append("".join(p for p, _ in current).strip())
+
+    return chunks
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Tronque le texte à une fin de phrase pour qu'il tienne dans max_tokens tokens"""
+    return split_into_token_chunks(text, max_tokens)[0]
+
+
+def _split_long_sentence(sentence: str, max_tokens: int) -> List[Tuple[str, int]]:
+    """Coupe une phrase plus longue que le budget en morceaux de mots consécutifs"""
+    parts: List[Tuple[str, int]] = []
+    words: List[str] = []
+    words_tokens = 0
+    for word in re.findall(r"\S+\s*", sentence):
+        tokens = estimate_tokens(word)
+        if tokens > max_tokens:
+            # Mot sans espace plus long que le budget (URL, formule...) : coupe brute
+            if words:
+                parts.append(("".join(words), words_tokens))
+                words, words_tokens = [], 0
+            step = max(1, len(word) * max_tokens // tokens)
+            for i in range(0, len(word), step):
+                parts.append((word[i:i + step], estimate_tokens(word[i:i + step])))
+            continue
+        if words and words_tokens + tokens > max_tokens:
+            parts.append(("".join(words), words_tokens))
+            words, words_tokens = [], 0
+        words.append(word)
+        words_tokens += tokens
+    if words:
+        parts.append(("".join(words), words_tokens))
+    return parts
@@ -0,0 +1,188 @@
+# Per-provider LLM rate limiting: requests/tokens per minute, adaptive concurrency, bounded queueing
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional, Tuple
+from app.core.config import settings
+from app.core.exceptions import LLMRateLimitException
+
+# Length of the sliding window the per-minute limits are counted over
+WINDOW_SECONDS = 60.0
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    """Whether a provider error is a 429 (Groq: status_code, Gemini: code)"""
+    return getattr(error, "status_code", None) == 429 or getattr(error, "code", None) == 429
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds from the Retry-After header of a 429 response, when the provider sent one"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class ProviderRateLimiter:
+    """
+    Admission control for the calls made to one LLM provider.
+
+    A call waits (in a queue, for at most max_wait seconds) until starting
+    it keeps the provider under its requests-per-minute and
+    tokens-per-minute limits, counted over a sliding minute, and under the
+    current concurrency limit. Callers still waiting at max_wait get
+    LLMRateLimitException instead of a provider 429.
+
+    The concurrency limit adapts (AIMD): a 429 halves it and pauses new
+    calls for the Retry-After delay, and each run of successful calls as
+    long as the limit raises it by one, up to max_concurrency.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_concurrency: int,
+        max_wait: float = settings.LLM_QUEUE_MAX_WAIT_SECONDS,
+        throttle_cooldown: float = settings.LLM_THROTTLE_COOLDOWN_SECONDS,
+    ):
+        self.name = name
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_concurrency = max_concurrency
+        self.concurrency_limit = max_concurrency
+        self.max_wait = max_wait
+        self.throttle_cooldown = throttle_cooldown
+        self._condition = asyncio.Condition()
+        self._window: Deque[Tuple[float, int]] = deque()
+        self._paused_until = 0.0
+        self._successes = 0
+        self.in_flight = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait_seen = 0.0
+
+    @asynccontextmanager
+    async def slot(self, tokens: int) -> AsyncIterator[None]:
+        """Hold one admitted call of about `tokens` tokens (prompt + completion)"""
+        await self._acquire(tokens)
+        try:
+            yield
+        except Exception as e:
+            if is_rate_limited(e):
+                self._throttle(retry_after(e))
+            raise
+        else:
+            self._succeed()
+        finally:
+            await self._release()
+
+    def stats(self) -> Dict:
+        now = time.monotonic()
+        self._prune(now)
+        return {
+            "in_flight": self.in_flight,
+            "concurrency_limit": self.concurrency_limit,
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "requests_last_minute": len(self._window),
+            "tokens_last_minute": sum(tokens for _, tokens in self._window),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "throttled": self.throttled,
+            "avg_wait_ms": round(1000 * self.total_wait / self.admitted, 1) if self.admitted else 0.0,
+            "max_wait_ms": round(1000 * self.max_wait_seen, 1),
+        }
+
+    async def _acquire(self, tokens: int) -> None:
+        start = time.monotonic()
+        deadline = start + self.max_wait
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            async with self._condition:
+                while True:
+                    now = time.monotonic()
+                    delay = self._delay(tokens, now)
+                    if delay == 0:
+                        break
+                    if now >= deadline:
+                        self.rejected += 1
+                        raise LLMRateLimitException(self.name)
+                    # Woken early by a release; otherwise re-check when the window frees up
+                    timeout = deadline - now if delay is None else min(delay, deadline - now)
+                    try:
+                        await asyncio.wait_for(self._condition.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                self.in_flight += 1
+                self._window.append((now, tokens))
+        finally:
+            self.queue_depth -= 1
+
+        waited = time.monotonic() - start
+        self.admitted += 1
+        self.total_wait += waited
+        self.max_wait_seen = max(self.max_wait_seen, waited)
+
+    async def _release(self) -> None:
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def _delay(self, tokens: int, now: float) -> Optional[float]:
+        """0 when a call can start now, seconds to wait, or None to wait for a release"""
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self.in_flight >= self.concurrency_limit:
+            return None
+        self._prune(now)
+        if len(self._window) >= self.requests_per_minute:
+            return self._window[0][0] + WINDOW_SECONDS - now
+        used = sum(t for _, t in self._window)
+        if self._window and used + tokens > self.tokens_per_minute:
+            # Wait until enough of the oldest calls leave the window
+            for started, t in self._window:
+                used -= t
+                if used + tokens <= self.tokens_per_minute:
+                    return started + WINDOW_SECONDS - now
+            # A call larger than the whole budget runs alone
+            return self._window[-1][0] + WINDOW_SECONDS - now
+        return 0
+
+    def _prune(self, now: float) -> None:
+        while self._window and self._window[0][0] <= now - WINDOW_SECONDS:
+            self._window.popleft()
+
+    def _throttle(self, delay: Optional[float]) -> None:
+        self.throttled += 1
+        self._successes = 0
+        self.concurrency_limit = max(1, self.concurrency_limit // 2)
+        self._paused_until = max(self._paused_until, time.monotonic() + (delay or self.throttle_cooldown))
+
+    def _succeed(self) -> None:
+        self._successes += 1
+        if self._successes >= self.concurrency_limit and self.concurrency_limit < self.max_concurrency:
+            self.concurrency_limit += 1
+            self._successes = 0
+
+
+def groq_rate_limiter() -> ProviderRateLimiter:
+    return ProviderRateLimiter(
+        "groq", settings.GROQ_RPM, settings.GROQ_TPM, settings.GROQ_MAX_CONCURRENCY
+    )
+
+
+def gemini_rate_limiter() -> ProviderRateLimiter:
+    return ProviderRateLimiter(
+        "gemini", settings.GEMINI_RPM, settings.GEMINI_TPM, settings.GEMINI_MAX_CONCURRENCY
+    )
@@ -0,0 +1,163 @@
+# Provider resilience: transient error detection, jittered retries and circuit breakers
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+import httpx
+from app.core.config import settings
+from app.core.exceptions import AppException, LLMProviderUnavailableException
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    Whether retrying the same request may succeed: timeouts, connection
+    errors, 408/429 and 5xx answers. Application errors (including our
+    own rate limit queue timeout) are never retried here.
+    """
+    if isinstance(error, AppException):
+        return False
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError, httpx.TransportError)):
+        return True
+    # Groq's connection errors carry no status; recognise them by type name to avoid a hard SDK import
+    if type(error).__name__ in ("APIConnectionError", "APITimeoutError"):
+        return True
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    return isinstance(status, int) and (status in (408, 429) or status >= 500)
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2^attempt)]"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """
+    Fails fast while a provider is down.
+
+    After failure_threshold consecutive transient failures the breaker
+    opens and calls raise LLMProviderUnavailableException without reaching
+    the provider. After reset_timeout seconds one trial call is let
+    through (half-open): its success closes the breaker, its failure opens
+    it again for another reset_timeout.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = settings.LLM_BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = settings.LLM_BREAKER_RESET_SECONDS,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == OPEN and time.monotonic() - self.opened_at < self.reset_timeout
+
+    def before_call(self) -> None:
+        """Raise if the provider must not be called now"""
+        if self.state == CLOSED:
+            return
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+            self._trial_in_flight = False
+        if self.state == HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return
+        self.rejected += 1
+        raise LLMProviderUnavailableException(self.name)
+
+    def record_success(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def abandon(self) -> None:
+        """A call let through ended (cancelled, failed on our side) without telling anything about the provider"""
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.times_opened += 1
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def stats(self) -> Dict:
+        return {
+            "state": OPEN if self.is_open else (HALF_OPEN if self.state != CLOSED else CLOSED),
+            "consecutive_failures": self.failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
+
+
+async def call_with_retry(
+    call: Callable[[], Awaitable[T]],
+    breaker: CircuitBreaker,
+    attempts: Optional[int] = None,
+    base_delay: Optional[float] = None,
+    max_delay: Optional[float] = None,
+) -> T:
+    """
+    Run call() through the breaker, retrying transient errors with jittered
+    exponential backoff (LLM_RETRY_* settings by default). Other errors are
+    raised at once: a provider error means the provider answered, so it
+    counts as a success for the breaker, while our own exceptions
+    (AppException, e.g. a local rate limit) leave the breaker as it was.
+    Retries stop early once the breaker opens.
+    """
+    attempts = attempts or settings.LLM_RETRY_ATTEMPTS
+    base_delay = settings.LLM_RETRY_BASE_DELAY_SECONDS if base_delay is None else base_delay
+    max_delay = settings.LLM_RETRY_MAX_DELAY_SECONDS if max_delay is None else max_delay
+    for attempt in range(attempts):
+        breaker.before_call()
+        try:
+            result = await call()
+        except Exception as e:
+            if not is_transient(e):
+                if isinstance(e, AppException):
+                    # Raised on our side: says nothing about the provider
+                    breaker.abandon()
+                else:
+                    breaker.record_success()
+                raise
+            breaker.record_failure()
+            if attempt == attempts - 1 or breaker.is_open:
+                raise
+            print(f"LLM retry: {breaker.name} attempt {attempt + 1} failed: {e}")
+            await asyncio.sleep(backoff_delay(attempt, base_delay, max_delay))
+        except BaseException:
+            # Cancelled (deadline, client gone): no verdict on the provider
+            breaker.abandon()
+            raise
+        else:
+            breaker.record_success()
+            return result
+
+
+def is_outage(error: BaseException) -> bool:
+    """Whether a failed call points at the provider (down, overloaded) rather than the request"""
+    return isinstance(error, LLMProviderUnavailableException) or is_transient(error) \
+        or isinstance(error, AppException) and error.status_code == 503
+
+
+def fallback_provider(task: str) -> Optional[str]:
+    """Provider to use for a task ("summary", "translation") while its own provider is down, if any"""
+    fallback = settings.LLM_SUMMARY_FALLBACK if task == "summary" else settings.LLM_TRANSLATION_FALLBACK
+    return fallback.strip().lower() or None
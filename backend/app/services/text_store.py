@@ -0,0 +1,41 @@
+# Content-addressed, compressed storage of extracted article text
+import hashlib
+from typing import Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.article_text import ArticleText
+from app.utils.compression import compress_text
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 hex digest of the UTF-8 text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def store_article_text(db: Session, text: Optional[str]) -> Optional[str]:
+    """
+    Store a text once and return its hash, to be set as Article.content_hash.
+
+    Texts already stored (the same page extracted by another user) are not
+    compressed or written again. The new row joins the caller's transaction.
+    """
+    if not text:
+        return None
+    digest = content_hash(text)
+    if db.get(ArticleText, digest) is not None:
+        return digest
+
+    codec, data = compress_text(text)
+    try:
+        # Savepoint: a concurrent request may insert the same text first
+        with db.begin_nested():
+            db.add(ArticleText(
+                hash=digest,
+                codec=codec,
+                data=data,
+                size_bytes=len(text.encode("utf-8")),
+                compressed_bytes=len(data)
+            ))
+    except IntegrityError:
+        pass
+    return digest
@@ -0,0 +1,178 @@
+# Persistent cache of Wikipedia title resolutions (redirects, missing pages, disambiguations)
+import asyncio
+import json
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.title_resolution import TitleResolution
+from app.services.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+RESOLVED = "resolved"
+MISSING = "missing"
+DISAMBIGUATION = "disambiguation"
+
+
+class TitleResolutionCache:
+    """
+    Maps a normalized title as typed in a URL to what Wikipedia made of it:
+    the canonical title it redirects to, a missing page, or a disambiguation
+    page with its options. Titles that are already canonical are kept in
+    memory only ("resolves to itself"), so that lookups for them do not
+    reach the database every time; they are not worth a row.
+
+    Negative entries (missing, disambiguation) expire sooner than redirects
+    since pages get created and disambiguations get split over time.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = settings.TITLE_CACHE_MAX_BYTES,
+        session_factory: Optional[Callable[[], Session]] = SessionLocal,
+        ttl_seconds: int = settings.TITLE_CACHE_TTL_SECONDS,
+        negative_ttl_seconds: int = settings.TITLE_CACHE_NEGATIVE_TTL_SECONDS,
+    ):
+        self.memory = LRUCache(max_bytes)
+        self.session_factory = session_factory
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.negative_ttl = timedelta(seconds=negative_ttl_seconds)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, language: str, raw_title: str) -> Optional[Dict]:
+        """
+        Return {"status", "title", "options"} for a known title or None.
+        "title" is the canonical title for resolved entries.
+        """
+        entry = self.memory.get((language, raw_title))
+        if entry is None:
+            entry = self._promote(language, raw_title, self._load(language, raw_title))
+        return self._answer(language, raw_title, entry)
+
+    async def aget(self, language: str, raw_title: str) -> Optional[Dict]:
+        """get() without blocking the event loop: memory hits inline, the database in a worker thread"""
+        entry = self.memory.get((language, raw_title))
+        if entry is None:
+            loaded = await asyncio.to_thread(self._load, language, raw_title)
+            entry = self._promote(language, raw_title, loaded)
+        return self._answer(language, raw_title, entry)
+
+    def remember_resolved(self, language: str, raw_title: str, canonical_title: str) -> None:
+        """Record a redirect or normalization; identity mappings stay in memory"""
+        if raw_title != canonical_title:
+            self._remember(language, raw_title, RESOLVED, canonical_title)
+        else:
+            self.memory.set((language, raw_title), self._entry(RESOLVED, canonical_title))
+
+    def remember_missing(self, language: str, raw_title: str) -> None:
+        self._remember(language, raw_title, MISSING)
+
+    def remember_disambiguation(self, language: str, raw_title: str, options: List[str]) -> None:
+        self._remember(language, raw_title, DISAMBIGUATION, options=options)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self.memory),
+            "size_bytes": self.memory.size_bytes,
+            "max_bytes": self.memory.max_bytes,
+        }
+
+    def _promote(self, language: str, raw_title: str, entry: Optional[Dict]) -> Optional[Dict]:
+        if entry is not None:
+            self.memory.set((language, raw_title), entry)
+        return entry
+
+    def _answer(self, language: str, raw_title: str, entry: Optional[Dict]) -> Optional[Dict]:
+        key = (language, raw_title)
+        if entry is not None and self._expired(entry):
+            self.memory.pop(key)
+            entry = None
+
+        self._count("hits" if entry is not None else "misses")
+        if entry is None:
+            return None
+        return {"status": entry["status"], "title": entry["title"], "options": list(entry["options"])}
+
+    def _expired(self, entry: Dict) -> bool:
+        ttl = self.ttl if entry["status"] == RESOLVED else self.negative_ttl
+        return datetime.utcnow() - entry["resolved_at"] > ttl
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _remember(
+        self,
+        language: str,
+        raw_title: str,
+        status: str,
+        canonical_title: Optional[str] = None,
+        options: Optional[List[str]] = None,
+    ) -> None:
+        entry = self._entry(status, canonical_title, options)
+        self.memory.set((language, raw_title), entry)
+        self._store(language, raw_title, entry)
+
+    @staticmethod
+    def _entry(status: str, canonical_title: Optional[str] = None, options: Optional[List[str]] = None) -> Dict:
+        return {
+            "status": status,
+            "title": canonical_title,
+            "options": list(options or []),
+            "resolved_at": datetime.utcnow(),
+        }
+
+    def _load(self, language: str, raw_title: str) -> Optional[Dict]:
+        if self.session_factory is None:
+            return None
+        try:
+            with self.session_factory() as db:
+                row = db.query(TitleResolution).filter(
+                    TitleResolution.language == language,
+                    TitleResolution.raw_title == raw_title
+                ).first()
+                if row is None:
+                    return None
+                return {
+                    "status": row.status,
+                    "title": row.canonical_title,
+                    "options": json.loads(row.options) if row.options else [],
+                    "resolved_at": row.resolved_at,
+                }
+        except SQLAlchemyError as e:
+            logger.warning(f"Title cache read failed: {e}")
+            return None
+
+    def _store(self, language: str, raw_title: str, entry: Dict) -> None:
+        if self.session_factory is None:
+            return
+        try:
+            with self.session_factory() as db:
+                row = db.query(TitleResolution).filter(
+                    TitleResolution.language == language,
+                    TitleResolution.raw_title == raw_title
+                ).first()
+                if row is None:
+                    row = TitleResolution(language=language, raw_title=raw_title)
+                    db.add(row)
+                row.status = entry["status"]
+                row.canonical_title = entry["title"]
+                row.options = json.dumps(entry["options"], ensure_ascii=False) if entry["options"] else None
+                row.resolved_at = entry["resolved_at"]
+                db.commit()
+        except SQLAlchemyError as e:
+            logger.warning(f"Title cache write failed: {e}")
+
+
+title_cache = TitleResolutionCache()
@@ -0,0 +1,119 @@
+# Micro-batching of short translation requests into shared provider calls
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+from app.core.config import settings
+from app.services.preprocessor import estimate_tokens
+
+# flush(target_language, texts) -> one result (or exception) per text, in order
+BatchFlush = Callable[[str, List[str]], Awaitable[List[object]]]
+
+
+class _Batch:
+    """Texts waiting for the same target language, each with the futures of its requesters"""
+
+    def __init__(self, target_language: str):
+        self.target_language = target_language
+        self.waiters: Dict[str, List[asyncio.Future]] = {}
+        self.tokens = 0
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class TranslationBatcher:
+    """
+    Gathers short translation requests for one target language over a few
+    milliseconds and translates them with a single call.
+
+    The first request of a batch starts a `window` timer; the batch is sent
+    when it expires, or as soon as it holds max_items texts or would go
+    over max_tokens. Identical texts in a batch are translated once. Each
+    requester awaits its own future, so one giving up (client gone) does
+    not cancel the batch for the others.
+    """
+
+    def __init__(
+        self,
+        flush: BatchFlush,
+        window: Optional[float] = None,
+        max_items: int = settings.TRANSLATION_BATCH_MAX_ITEMS,
+        max_item_tokens: int = settings.TRANSLATION_BATCH_MAX_ITEM_TOKENS,
+        max_tokens: int = settings.TRANSLATION_BATCH_MAX_TOKENS,
+    ):
+        self._flush = flush
+        self.window = settings.TRANSLATION_BATCH_WINDOW_MS / 1000 if window is None else window
+        self.max_items = max_items
+        self.max_item_tokens = max_item_tokens
+        self.max_tokens = max_tokens
+        self._pending: Dict[str, _Batch] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self.requests = 0
+        self.coalesced = 0
+        self.batches = 0
+
+    def accepts(self, text: str) -> bool:
+        """Whether a text is short enough to be batched (batching is off with a zero window)"""
+        return self.window > 0 and estimate_tokens(text) <= self.max_item_tokens
+
+    async def submit(self, text: str, target_language: str):
+        """Translate text with the next batch for its language, returning what flush gave for it"""
+        key = target_language.strip().lower()
+        tokens = estimate_tokens(text)
+        batch = self._pending.get(key)
+        if batch is not None and text not in batch.waiters and batch.tokens + tokens > self.max_tokens:
+            self._dispatch(key, batch)
+            batch = None
+        if batch is None:
+            batch = self._pending[key] = _Batch(target_language)
+            batch.timer = asyncio.get_running_loop().call_later(self.window, self._dispatch, key, batch)
+
+        future = asyncio.get_running_loop().create_future()
+        self.requests += 1
+        if text in batch.waiters:
+            self.coalesced += 1
+            batch.waiters[text].append(future)
+        else:
+            batch.waiters[text] = [future]
+            batch.tokens += tokens
+        if len(batch.waiters) >= self.max_items:
+            self._dispatch(key, batch)
+        return await future
+
+    def stats(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "batches": self.batches,
+            "provider_calls_saved": self.requests - self.batches,
+        }
+
+    def _dispatch(self, key: str, batch: _Batch) -> None:
+        """Send a batch once (on its timer, or early when full)"""
+        if self._pending.get(key) is not batch:
+            return
+        del self._pending[key]
+        batch.timer.cancel()
+        self.batches += 1
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: _Batch) -> None:
+        texts = list(batch.waiters)
+        try:
+            results = await self._flush(batch.target_language, texts)
+        except Exception as e:
+            results = [e] * len(texts)
+        except BaseException:
+            # Cancelled (shutdown): release the requesters instead of leaving them waiting
+            for futures in batch.waiters.values():
+                for future in futures:
+                    future.cancel()
+            raise
+
+        for text, result in zip(texts, results):
+            for future in batch.waiters[text]:
+                if future.done():
+                    continue
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
@@ -0,0 +1,242 @@
+# Sentence-level translation memory with exact and fuzzy reuse
+import hashlib
+import logging
+import re
+import threading
+from difflib import SequenceMatcher
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.translation_memory_entry import TranslationMemoryEntry
+from app.services.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*")
+
+# Exact lookups are sent to the database in batches of this many hashes
+LOOKUP_BATCH = 500
+
+
+def normalize_sentence(sentence: str) -> str:
+    """Whitespace-insensitive form of a sentence used for exact matching"""
+    return _WHITESPACE.sub(" ", sentence).strip()
+
+
+def sentence_hash(sentence: str) -> str:
+    return hashlib.sha256(normalize_sentence(sentence).encode("utf-8")).hexdigest()
+
+
+class TranslationMemory:
+    """
+    Stores translated sentences per (target language, model).
+
+    A sentence is reused when its normalized form was translated before
+    (exact match) or when a stored sentence of similar length is at least
+    fuzzy_threshold similar and carries the same numbers (near-exact match:
+    punctuation, a typo or a reworded word). Numbers are compared strictly
+    so "1991" is never served for "1992".
+
+    Methods block on the database and on similarity scoring: async callers
+    run them in a worker thread.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = SessionLocal,
+        max_bytes: int = settings.TRANSLATION_MEMORY_MAX_BYTES,
+        fuzzy_threshold: float = settings.TRANSLATION_MEMORY_FUZZY_THRESHOLD,
+        max_candidates: int = settings.TRANSLATION_MEMORY_MAX_CANDIDATES,
+    ):
+        self.session_factory = session_factory
+        self.memory = LRUCache(max_bytes)
+        self.fuzzy_threshold = fuzzy_threshold
+        self.max_candidates = max_candidates
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+
+    def lookup(self, target_language: str, model: str, sentences: List[str]) -> Dict[int, str]:
+        """Stored translations for the given sentences, by sentence index"""
+        hashes = [sentence_hash(sentence) for sentence in sentences]
+        found: Dict[int, str] = {}
+
+        pending = {}
+        for index, digest in enumerate(hashes):
+            entry = self.memory.get((target_language, model, digest))
+            if entry is not None:
+                found[index] = entry[1]
+            else:
+                pending.setdefault(digest, []).append(index)
+
+        for digest, (source, translation) in self._load_exact(target_language, model, list(pending)).items():
+            self.memory.set((target_language, model, digest), (source, translation))
+            for index in pending.pop(digest):
+                found[index] = translation
+        exact = len(found)
+
+        sources = {digest: normalize_sentence(sentences[indexes[0]]) for digest, indexes in pending.items()}
+        candidates = self._candidates(target_language, model, {len(source) for source in sources.values()})
+        for digest, indexes in pending.items():
+            source = sources[digest]
+            translation = self._fuzzy_match(source, candidates.get(len(source), []))
+            if translation is not None:
+                for index in indexes:
+                    found[index] = translation
+
+        with self._lock:
+            self.exact_hits += exact
+            self.fuzzy_hits += len(found) - exact
+            self.misses += len(sentences) - len(found)
+        return found
+
+    def store(self, target_language: str, model: str, pairs: List[Tuple[str, str]]) -> None:
+        """Remember (source sentence, translation) pairs"""
+        rows = {}
+        for source, translation in pairs:
+            digest = sentence_hash(source)
+            self.memory.set((target_language, model, digest), (normalize_sentence(source), translation))
+            rows[digest] = (normalize_sentence(source), translation)
+        if self.session_factory is None or not rows:
+            return
+        try:
+            with self.session_factory() as db:
+                known = {
+                    digest for digest, in db.query(TranslationMemoryEntry.source_hash).filter(
+                        TranslationMemoryEntry.target_language == target_language,
+                        TranslationMemoryEntry.model == model,
+                        TranslationMemoryEntry.source_hash.in_(list(rows))
+                    )
+                }
+                for digest, (source, translation) in rows.items():
+                    if digest not in known:
+                        db.add(TranslationMemoryEntry(
+                            target_language=target_language,
+                            model=model,
+                            source_hash=digest,
+                            source_text=source,
+                            translation=translation,
+                            length=len(source)
+                        ))
+                db.commit()
+        except IntegrityError:
+            # A concurrent translation stored the same sentences first
+            logger.info("Translation memory write skipped: sentences already stored")
+        except SQLAlchemyError as e:
+            logger.warning(f"Translation memory write failed: {e}")
+
+    def purge(self) -> int:
+        """Forget every stored translation, returning the number of entries removed"""
+        in_memory = len(self.memory)
+        self.memory.clear()
+        if self.session_factory is None:
+            return in_memory
+        try:
+            with self.session_factory() as db:
+                removed = db.query(TranslationMemoryEntry).delete()
+                db.commit()
+                # The persistent tier holds every entry still in memory
+                return max(removed, in_memory)
+        except SQLAlchemyError as e:
+            logger.warning(f"Translation memory purge failed: {e}")
+            return in_memory
+
+    def stats(self) -> Dict:
+        lookups = self.exact_hits + self.fuzzy_hits + self.misses
+        return {
+            "exact_hits": self.exact_hits,
+            "fuzzy_hits": self.fuzzy_hits,
+            "misses": self.misses,
+            "reuse_rate": round((self.exact_hits + self.fuzzy_hits) / lookups, 4) if lookups else 0.0,
+            "entries": len(self.memory),
+            "size_bytes": self.memory.size_bytes,
+        }
+
+    def _load_exact(self, target_language: str, model: str, hashes: List[str]) -> Dict[str, Tuple[str, str]]:
+        if self.session_factory is None or not hashes:
+            return {}
+        found = {}
+        try:
+            with self.session_factory() as db:
+                for i in range(0, len(hashes), LOOKUP_BATCH):
+                    rows = db.query(TranslationMemoryEntry).filter(
+                        TranslationMemoryEntry.target_language == target_language,
+                        TranslationMemoryEntry.model == model,
+                        TranslationMemoryEntry.source_hash.in_(hashes[i:i + LOOKUP_BATCH])
+                    )
+                    for row in rows:
+                        found[row.source_hash] = (row.source_text, row.translation)
+        except SQLAlchemyError as e:
+            logger.warning(f"Translation memory read failed: {e}")
+        return found
+
+    def _length_window(self, length: int) -> Tuple[int, int]:
+        """Lengths of stored sentences that could reach the similarity threshold"""
+        # ratio() <= 2 * min(len) / (len(a) + len(b)) bounds the usable lengths
+        low = int(length * self.fuzzy_threshold / (2 - self.fuzzy_threshold))
+        high = int(length * (2 - self.fuzzy_threshold) / self.fuzzy_threshold) + 1
+        return low, high
+
+    def _candidates(self, target_language: str, model: str, lengths: Set[int]) -> Dict[int, List[Tuple[str, str]]]:
+        """
+        Fuzzy match candidates for each sentence length: the max_candidates
+        stored sentences closest in length, fetched in a single query.
+        """
+        windows = {length: self._length_window(length) for length in lengths}
+        if not windows:
+            return {}
+        if self.session_factory is None:
+            entries = [
+                entry for entry in (self.memory.get(key) for key in self.memory.keys()
+                                    if key[:2] == (target_language, model)) if entry is not None
+            ]
+            return {
+                length: [entry for entry in entries if low <= len(entry[0]) <= high][:self.max_candidates]
+                for length, (low, high) in windows.items()
+            }
+
+        entry = TranslationMemoryEntry
+        per_length = [
+            select(
+                literal(length).label("wanted"), entry.source_text, entry.translation
+            ).where(
+                entry.target_language == target_language,
+                entry.model == model,
+                entry.length.between(low, high)
+            ).order_by(func.abs(entry.length - length)).limit(self.max_candidates).subquery()
+            for length, (low, high) in windows.items()
+        ]
+        # Each length keeps its own ORDER BY/LIMIT inside a subquery; UNION ALL makes it one round-trip
+        query = union_all(*(select(subquery) for subquery in per_length)) if len(per_length) > 1 \
+            else select(per_length[0])
+        candidates: Dict[int, List[Tuple[str, str]]] = {}
+        try:
+            with self.session_factory() as db:
+                for wanted, source, translation in db.execute(query):
+                    candidates.setdefault(wanted, []).append((source, translation))
+        except SQLAlchemyError as e:
+            logger.warning(f"Translation memory read failed: {e}")
+        return candidates
+
+    def _fuzzy_match(self, source: str, candidates: List[Tuple[str, str]]) -> Optional[str]:
+        numbers = _NUMBER.findall(source)
+        best_ratio, best = 0.0, None
+        matcher = SequenceMatcher(autojunk=False)
+        matcher.set_seq2(source)
+        for candidate, translation in candidates:
+            matcher.set_seq1(candidate)
+            # Cheap upper bounds first, full comparison only for plausible matches
+            if matcher.real_quick_ratio() < self.fuzzy_threshold or matcher.quick_ratio() < self.fuzzy_threshold:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= self.fuzzy_threshold and ratio > best_ratio and _NUMBER.findall(candidate) == numbers:
+                best_ratio, best = ratio, translation
+        return best
+
+
+translation_memory = TranslationMemory()
@@ -0,0 +1,297 @@
+# Async MediaWiki API client with pooled keep-alive connections per language host
+import asyncio
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set
+import httpx
+from app.core.config import settings
+from app.core.exceptions import (
+    InvalidWikipediaLanguageException,
+    WikipediaPageNotFoundException,
+    WikipediaDisambiguationException
+)
+from app.services.wikitext import SECTION_HEADING, wikitext_to_text
+
+USER_AGENT = "WikiSmartEdu/1.0 (Educational Project; contact@wikismartedu.com)"
+
+# MediaWiki accepts at most 50 titles per query for regular clients
+MAX_TITLES_PER_QUERY = 50
+
+# Wikipedia subdomains: "en", "fr", "simple", "zh-min-nan"... The language
+# becomes the host of API requests, so nothing else may get through.
+LANGUAGE_PATTERN = r"^(?:[a-z]{2,3}|simple)(?:-[a-z]+)*$"
+_LANGUAGE_CODE = re.compile(LANGUAGE_PATTERN)
+
+
+def validate_language(language: str) -> str:
+    """Return a Wikipedia language code, raising InvalidWikipediaLanguageException if malformed"""
+    if not isinstance(language, str) or not _LANGUAGE_CODE.fullmatch(language):
+        raise InvalidWikipediaLanguageException(str(language))
+    return language
+
+
+def is_wikipedia_host(host: Optional[str]) -> bool:
+    """Whether a host is a Wikipedia language site (desktop or mobile), e.g. en.m.wikipedia.org"""
+    host = (host or "").lower()
+    return host.endswith(".wikipedia.org") and bool(_LANGUAGE_CODE.fullmatch(host.split(".")[0]))
+
+
+def extract_intro(content: str) -> str:
+    """Return the lead section of a plain-text extract (text before the first heading)"""
+    match = SECTION_HEADING.search(content)
+    return (content[:match.start()] if match else content).strip()
+
+
+class WikipediaClient:
+    """
+    Asynchronous client for the MediaWiki action API.
+
+    One httpx.AsyncClient is kept per language host so that connections are
+    reused across requests, for at most max_clients hosts: the least
+    recently used client is closed (once its in-flight requests had time
+    to finish) when another language is needed. Every call receives its
+    language explicitly, which keeps concurrent multi-language extractions
+    independent.
+    """
+
+    def __init__(
+        self,
+        timeout: float = settings.WIKIPEDIA_TIMEOUT_SECONDS,
+        max_connections: int = settings.WIKIPEDIA_MAX_CONNECTIONS,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        max_clients: int = settings.WIKIPEDIA_MAX_LANGUAGE_CLIENTS,
+    ):
+        self.timeout = timeout
+        self.max_clients = max_clients
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+        self.transport = transport
+        self._clients: "OrderedDict[str, httpx.AsyncClient]" = OrderedDict()
+        self._retired: Set[httpx.AsyncClient] = set()
+
+    def _client(self, language: str) -> httpx.AsyncClient:
+        validate_language(language)
+        client = self._clients.get(language)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                base_url=f"https://{language}.wikipedia.org",
+                headers={"User-Agent": USER_AGENT},
+                timeout=self.timeout,
+                limits=self.limits,
+                transport=self.transport,
+            )
+            self._clients[language] = client
+        self._clients.move_to_end(language)
+        while len(self._clients) > self.max_clients:
+            _, evicted = self._clients.popitem(last=False)
+            self._retire(evicted)
+        return client
+
+    def _retire(self, client: httpx.AsyncClient) -> None:
+        """Close an evicted client after the request timeout, leaving its in-flight requests time to end"""
+        self._retired.add(client)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop to close it on: aclose() will
+        loop.call_later(self.timeout, lambda: loop.create_task(self._close_retired(client)))
+
+    async def _close_retired(self, client: httpx.AsyncClient) -> None:
+        if client in self._retired:
+            self._retired.discard(client)
+            await client.aclose()
+
+    async def query(self, language: str, **params) -> Dict:
+        """Run an action API request and return the decoded JSON body"""
+        params = {"format": "json", "formatversion": "2", **params}
+        response = await self._client(language).get("/w/api.php", params=params)
+        response.raise_for_status()
+        data = response.json()
+        if "error" in data:
+            raise Exception(data["error"].get("info", "MediaWiki API error"))
+        return data
+
+    async def fetch_page(self, language: str, title: str) -> Dict:
+        """
+        Fetch a page and return the get_wikipedia_content dict.
+
+        Title resolution (redirects), plain-text content, canonical URL,
+        revision id and disambiguation flag all come back from a single
+        action=query request; the summary is the intro of the extract.
+
+        Raises:
+            WikipediaPageNotFoundException: the title does not exist
+            WikipediaDisambiguationException: the title is a disambiguation page
+        """
+        data = await self.query(
+            language,
+            action="query",
+            prop="extracts|info|revisions|pageprops",
+            explaintext="1",
+            inprop="url",
+            rvprop="ids",
+            ppprop="disambiguation",
+            redirects="1",
+            titles=title,
+        )
+        page = data["query"]["pages"][0]
+        if page.get("missing") or page.get("invalid"):
+            raise WikipediaPageNotFoundException(title)
+        if "disambiguation" in page.get("pageprops", {}):
+            options = await self.disambiguation_options(language, page["title"])
+            raise WikipediaDisambiguationException(options)
+
+        content = page.get("extract", "")
+        return {
+            "title": page["title"],
+            "content": content,
+            "summary": extract_intro(content),
+            "url": page["fullurl"],
+            "language": language,
+            "revision_id": page["revisions"][0]["revid"] if page.get("revisions") else None,
+        }
+
+    async def fetch_outline(self, language: str, title: str) -> Dict:
+        """
+        Fetch what is needed to display an article before its body: the
+        lead section, canonical URL, revision id and the table of contents.
+
+        The lead comes from an exintro extract and the table of contents
+        from action=parse; both requests run concurrently.
+        """
+        page_data, parse_data = await asyncio.gather(
+            self.query(
+                language,
+                action="query",
+                prop="extracts|info|revisions|pageprops",
+                exintro="1",
+                explaintext="1",
+                inprop="url",
+                rvprop="ids",
+                ppprop="disambiguation",
+                redirects="1",
+                titles=title,
+            ),
+            self.query(language, action="parse", page=title, prop="sections", redirects="1"),
+            return_exceptions=True,
+        )
+        if isinstance(page_data, Exception):
+            raise page_data
+        page = page_data["query"]["pages"][0]
+        if page.get("missing") or page.get("invalid"):
+            raise WikipediaPageNotFoundException(title)
+        if "disambiguation" in page.get("pageprops", {}):
+            options = await self.disambiguation_options(language, page["title"])
+            raise WikipediaDisambiguationException(options)
+        if isinstance(parse_data, Exception):
+            raise parse_data
+
+        summary = page.get("extract", "").strip()
+        sections = [{"index": 0, "title": "Introduction", "level": 1}]
+        for section in parse_data["parse"].get("sections", []):
+            # Sections transcluded from templates have indexes like "T-1"
+            if not str(section["index"]).isdigit():
+                continue
+            sections.append({
+                "index": int(section["index"]),
+                "title": re.sub(r"<[^>]+>", "", section["line"]),
+                "level": int(section["level"]),
+            })
+        return {
+            "title": page["title"],
+            "content": summary,
+            "summary": summary,
+            "url": page["fullurl"],
+            "language": language,
+            "revision_id": page["revisions"][0]["revid"] if page.get("revisions") else None,
+            "sections": sections,
+        }
+
+    async def fetch_section(self, language: str, title: str, index: int) -> Dict:
+        """Fetch the plain text of one section (with its subsections)"""
+        data = await self.query(
+            language,
+            action="parse",
+            page=title,
+            section=str(index),
+            prop="wikitext|revid",
+            redirects="1",
+        )
+        parse = data["parse"]
+        content = wikitext_to_text(parse["wikitext"])
+        heading = SECTION_HEADING.match(content)
+        return {
+            "title": parse["title"],
+            "language": language,
+            "index": index,
+            "heading": heading.group(2) if heading else "Introduction",
+            "content": content,
+            "revision_id": parse.get("revid"),
+        }
+
+    async def resolve_titles(self, language: str, titles: List[str]) -> Dict[str, Dict]:
+        """
+        Resolve up to MAX_TITLES_PER_QUERY titles in one multi-title query.
+
+        Returns a dict keyed by each requested title with the canonical
+        title, URL, revision id and missing/disambiguation flags, following
+        MediaWiki's normalization and redirects.
+        """
+        if len(titles) > MAX_TITLES_PER_QUERY:
+            raise ValueError(f"At most {MAX_TITLES_PER_QUERY} titles per query")
+        data = await self.query(
+            language,
+            action="query",
+            prop="info|revisions|pageprops",
+            inprop="url",
+            rvprop="ids",
+            ppprop="disambiguation",
+            redirects="1",
+            titles="|".join(titles),
+        )
+        query = data.get("query", {})
+        renames = {
+            item["from"]: item["to"]
+            for item in query.get("normalized", []) + query.get("redirects", [])
+        }
+        pages = {page["title"]: page for page in query.get("pages", [])}
+
+        resolved = {}
+        for title in titles:
+            final, seen = title, set()
+            while final in renames and final not in seen:
+                seen.add(final)
+                final = renames[final]
+            page = pages.get(final, {"title": final, "missing": True})
+            resolved[title] = {
+                "title": page["title"],
+                "url": page.get("fullurl"),
+                "revision_id": page["revisions"][0]["revid"] if page.get("revisions") else None,
+                "missing": bool(page.get("missing") or page.get("invalid")),
+                "disambiguation": "disambiguation" in page.get("pageprops", {}),
+            }
+        return resolved
+
+    async def disambiguation_options(self, language: str, title: str) -> List[str]:
+        """List the articles a disambiguation page points to"""
+        data = await self.query(
+            language,
+            action="query",
+            prop="links",
+            plnamespace="0",
+            pllimit="max",
+            titles=title,
+        )
+        return [link["title"] for link in data["query"]["pages"][0].get("links", [])]
+
+    async def aclose(self) -> None:
+        """Close every pooled connection"""
+        clients = list(self._clients.values()) + list(self._retired)
+        self._clients, self._retired = OrderedDict(), set()
+        for client in clients:
+            await client.aclose()
+
+
+wikipedia_client = WikipediaClient()
@@ -0,0 +1,76 @@
+# Wikitext to plain text conversion and section structure
+import re
+from typing import Dict, List
+
+# "== History ==" style headings, as produced by wikitext and explaintext extracts
+SECTION_HEADING = re.compile(r"^(=+)\s*([^=\n]+?)\s*\1\s*$", re.MULTILINE)
+
+_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+_REF = re.compile(r"<ref[^>/]*?/>|<ref[^>]*?>.*?</ref>", re.DOTALL | re.IGNORECASE)
+_BLOCK_TAGS = re.compile(
+    r"<(gallery|math|score|syntaxhighlight|timeline|imagemap)[^>]*>.*?</\1>",
+    re.DOTALL | re.IGNORECASE
+)
+_HTML_TAG = re.compile(r"</?[a-zA-Z][^>]*>")
+_TEMPLATE = re.compile(r"\{\{[^{}]*\}\}")
+_TABLE = re.compile(r"\{\|[^{}]*?\|\}", re.DOTALL)
+_FILE_LINK = re.compile(
+    r"\[\[(?:File|Image|Fichier|Datei|Archivo|Category|Catégorie|Kategorie|Categoría):[^\[\]]*(?:\[\[[^\[\]]*\]\][^\[\]]*)*\]\]",
+    re.IGNORECASE
+)
+_PIPED_LINK = re.compile(r"\[\[[^\[\]|]*\|([^\[\]]*)\]\]")
+_LINK = re.compile(r"\[\[([^\[\]]*)\]\]")
+_EXTERNAL_LINK = re.compile(r"\[https?://[^\s\]]+\s*([^\]]*)\]")
+_EMPHASIS = re.compile(r"'{2,}")
+_LIST_MARKER = re.compile(r"^[*#:;]+\s*", re.MULTILINE)
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def _remove_nested(pattern: re.Pattern, text: str) -> str:
+    """Strip innermost matches repeatedly so nested templates/tables disappear"""
+    while True:
+        text, count = pattern.subn("", text)
+        if not count:
+            return text
+
+
+def wikitext_to_text(wikitext: str) -> str:
+    """
+    Convert wikitext into plain text close to the API's explaintext extracts:
+    markup, templates, references, tables and media are removed, links are
+    replaced by their label and section headings are kept as "== Title ==".
+    """
+    text = _COMMENT.sub("", wikitext)
+    text = _REF.sub("", text)
+    text = _BLOCK_TAGS.sub("", text)
+    text = _remove_nested(_TEMPLATE, text)
+    text = _remove_nested(_TABLE, text)
+    text = _FILE_LINK.sub("", text)
+    text = _PIPED_LINK.sub(r"\1", text)
+    text = _LINK.sub(r"\1", text)
+    text = _EXTERNAL_LINK.sub(r"\1", text)
+    text = _HTML_TAG.sub("", text)
+    # Four quotes are an apostrophe followed by bold markup: L''''IA''' -> L'IA
+    text = _EMPHASIS.sub(lambda m: "'" if len(m.group()) == 4 else "", text)
+    text = _LIST_MARKER.sub("", text)
+    text = "\n".join(line.strip() for line in text.split("\n"))
+    return _BLANK_LINES.sub("\n\n", text).strip()
+
+
+def extract_sections(text: str) -> List[Dict]:
+    """
+    Section structure of a plain-text article.
+
+    Returns:
+        list of {"index", "title", "level", "offset"} where offset is the
+        position of the heading line in the text; index 0 is the lead.
+    """
+    sections = [{"index": 0, "title": "Introduction", "level": 1, "offset": 0}]
+    for match in SECTION_HEADING.finditer(text):
+        sections.append({
+            "index": len(sections),
+            "title": match.group(2),
+            "level": len(match.group(1)),
+            "offset": match.start(),
+        })
+    return sections
@@ -0,0 +1,30 @@
+# Text compression for stored article bodies (zstd, zlib when zstandard is unavailable)
+import zlib
+from typing import Tuple
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - exercised only without the optional dependency
+    zstandard = None
+
+ZSTD_LEVEL = 10
+ZLIB_LEVEL = 9
+
+
+def compress_text(text: str) -> Tuple[str, bytes]:
+    """Compress UTF-8 text, returning (codec, data)"""
+    raw = text.encode("utf-8")
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    return "zlib", zlib.compress(raw, ZLIB_LEVEL)
+
+
+def decompress_text(codec: str, data: bytes) -> str:
+    """Inverse of compress_text"""
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard est requis pour lire ce texte compressé")
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+    if codec == "zlib":
+        return zlib.decompress(data).decode("utf-8")
+    raise ValueError(f"Codec de compression inconnu: {codec}")
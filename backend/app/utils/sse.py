@@ -0,0 +1,26 @@
+# Server-Sent Events framing for streamed LLM output
+import json
+from typing import AsyncIterator, Dict, Optional
+
+# Keep proxies (nginx) from buffering the stream
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def sse_event(event: str, data: Dict) -> str:
+    """One SSE message; data is JSON so newlines in the text stay inside one event"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def sse_text_stream(chunks: AsyncIterator[str], done: Optional[Dict] = None) -> AsyncIterator[str]:
+    """
+    Forward text chunks as "token" events, then a "done" event carrying
+    `done`. A failure mid-stream is reported as an "error" event since the
+    response status has already been sent.
+    """
+    try:
+        async for text in chunks:
+            yield sse_event("token", {"text": text})
+    except Exception as e:
+        yield sse_event("error", {"detail": str(e)})
+        return
+    yield sse_event("done", done or {})
@@ -14,7 +14,7 @@ from app.services.pdf_service import extract_text_from_pdf
 from app.services.preprocessor import clean_and_segment_text, clean_text, split_into_chunks
 
 
-def test_wikipedia_extraction():
+async def test_wikipedia_extraction():
     """Test de l'extraction Wikipedia"""
     print("\n" + "="*60)
     print("TEST 1: EXTRACTION WIKIPEDIA")
@@ -25,7 +25,7 @@ def test_wikipedia_extraction():
     
     try:
         print(f"\n📥 Extraction de: {test_url}")
-        result = get_wikipedia_content(test_url, language="fr")
+        result = await get_wikipedia_content(test_url, language="fr")
         
         print(f"\n✅ Titre: {result['title']}")
         print(f"✅ Langue: {result['language']}")
@@ -145,7 +145,7 @@ async def main():
     results = []
     
     # Test 1: Wikipedia
-    results.append(("Wikipedia", test_wikipedia_extraction()))
+    results.append(("Wikipedia", await test_wikipedia_extraction()))
     
     # Test 2: PDF
     results.append(("PDF", await test_pdf_extraction()))
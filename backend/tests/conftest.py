@@ -155,6 +155,61 @@ def expired_jwt_payload():
         "user_id": 1,
         "exp": datetime.now(timezone.utc) - timedelta(minutes=30)
     }
+@pytest.fixture(autouse=True)
+def isolated_article_cache():
+    """Give every test a fresh, memory-only article cache"""
+    from app.services.article_cache import ArticleCache
+    from app.services.offline_store import OfflineArticleStore
+    from app.services.title_cache import TitleResolutionCache
+    cache = ArticleCache(session_factory=None)
+    with patch('app.services.content_extractor.article_cache', cache), \
+            patch('app.services.content_extractor.title_cache', TitleResolutionCache(session_factory=None)), \
+            patch('app.services.content_extractor.offline_store', OfflineArticleStore(session_factory=None)):
+        yield cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_llm_cache():
+    """Give every test a fresh, memory-only LLM result cache"""
+    from app.services.llm_cache import LLMResultCache
+    cache = LLMResultCache(session_factory=None)
+    with patch('app.services.llm_service.llm_cache', cache):
+        yield cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_translation_memory():
+    """Give every test an empty, memory-only translation memory"""
+    from app.services.translation_memory import TranslationMemory
+    memory = TranslationMemory(session_factory=None)
+    with patch('app.services.llm_service.translation_memory', memory):
+        yield memory
+
+
+@pytest.fixture
+def sqlite_session_factory(tmp_path):
+    """Session factory bound to a fresh SQLite database"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.database import Base
+    import app.models.cached_article  # noqa: F401 - register tables
+    import app.models.offline_article  # noqa: F401
+    import app.models.title_resolution  # noqa: F401
+    import app.models.llm_cache_entry  # noqa: F401
+    import app.models.translation_memory_entry  # noqa: F401
+    import app.models.job  # noqa: F401
+
+    # A database file rather than one shared in-memory connection: sessions
+    # opened from worker threads each get their own connection, as in production
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}",
+        connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
 # Commit 1: test: initialize pytest configuration and fixtures
 # Commit 16: test: add Wikipedia content extraction tests
 # Commit 31: test: add PDF cleanup tests
@@ -0,0 +1,148 @@
+# Article cache tests: LRU tier, persistent tier and counters
+import pytest
+import sys
+import os
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.cache import LRUCache, estimate_size
+from app.services.article_cache import ArticleCache
+
+
+class TestLRUCache:
+    """Test the size-bounded LRU cache"""
+
+    def test_get_returns_stored_value(self):
+        """Test basic set/get"""
+        cache = LRUCache(max_bytes=100)
+        cache.set("a", "value")
+        assert cache.get("a") == "value"
+
+    def test_missing_key_returns_none(self):
+        """Test miss returns None"""
+        cache = LRUCache(max_bytes=100)
+        assert cache.get("missing") is None
+
+    def test_evicts_least_recently_used(self):
+        """Test eviction order follows recency of use"""
+        cache = LRUCache(max_bytes=10)
+        cache.set("a", "aaaa")
+        cache.set("b", "bbbb")
+        cache.get("a")
+        cache.set("c", "cccc")
+        assert "a" in cache
+        assert "b" not in cache
+        assert cache.evictions == 1
+
+    def test_size_tracking(self):
+        """Test accumulated size follows sets and pops"""
+        cache = LRUCache(max_bytes=100)
+        cache.set("a", "12345")
+        cache.set("a", "123")
+        assert cache.size_bytes == 3
+        cache.pop("a")
+        assert cache.size_bytes == 0
+
+    def test_oversized_value_not_stored(self):
+        """Test that a value larger than the budget is skipped"""
+        cache = LRUCache(max_bytes=4)
+        cache.set("a", "too large")
+        assert len(cache) == 0
+
+    def test_estimate_size_of_dict(self):
+        """Test size estimation of article dicts"""
+        assert estimate_size({"title": "é"}) == len("title") + 2
+
+
+class TestArticleCache:
+    """Test the two-tier article cache"""
+
+    @pytest.fixture
+    def article(self, sample_wikipedia_content):
+        return {**sample_wikipedia_content, "revision_id": 42}
+
+    def test_miss_then_memory_hit(self, sqlite_session_factory, article):
+        """Test a stored article is served from memory"""
+        cache = ArticleCache(max_bytes=1024 * 1024, session_factory=sqlite_session_factory)
+        assert cache.get("en", article["title"]) is None
+        cache.set("en", article["title"], article)
+        assert cache.get("en", article["title"]) == article
+        stats = cache.stats()
+        assert stats["misses"] == 1
+        assert stats["memory_hits"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_persistent_hit_after_memory_eviction(self, sqlite_session_factory, article):
+        """Test the database tier survives an empty memory tier"""
+        cache = ArticleCache(max_bytes=1024 * 1024, session_factory=sqlite_session_factory)
+        cache.set("en", article["title"], article)
+        cache.memory.clear()
+        assert cache.get("en", article["title"]) == article
+        assert cache.stats()["persistent_hits"] == 1
+        assert (("en", article["title"])) in cache.memory
+
+    def test_revision_pin(self, sqlite_session_factory, article):
+        """Test lookups pinned to another revision miss"""
+        cache = ArticleCache(max_bytes=1024 * 1024, session_factory=sqlite_session_factory)
+        cache.set("en", article["title"], article)
+        assert cache.get("en", article["title"], revision_id=42) is not None
+        assert cache.get("en", article["title"], revision_id=43) is None
+
+    def test_languages_are_separate(self, sqlite_session_factory, article):
+        """Test the language is part of the key"""
+        cache = ArticleCache(max_bytes=1024 * 1024, session_factory=sqlite_session_factory)
+        cache.set("en", article["title"], article)
+        assert cache.get("fr", article["title"]) is None
+
+    def test_set_overwrites_persistent_row(self, sqlite_session_factory, article):
+        """Test a newer revision replaces the stored one"""
+        cache = ArticleCache(max_bytes=1024 * 1024, session_factory=sqlite_session_factory)
+        cache.set("en", article["title"], article)
+        cache.set("en", article["title"], {**article, "revision_id": 43})
+        cache.memory.clear()
+        assert cache.get("en", article["title"])["revision_id"] == 43
+
+    def test_invalidate(self, sqlite_session_factory, article):
+        """Test invalidation clears both tiers"""
+        cache = ArticleCache(max_bytes=1024 * 1024, session_factory=sqlite_session_factory)
+        cache.set("en", article["title"], article)
+        cache.invalidate("en", article["title"])
+        assert cache.get("en", article["title"]) is None
+
+    def test_memory_only_mode(self, article):
+        """Test the cache works without a database"""
+        cache = ArticleCache(max_bytes=1024 * 1024, session_factory=None)
+        cache.set("en", article["title"], article)
+        assert cache.get("en", article["title"]) == article
+
+    @pytest.mark.asyncio
+    async def test_async_access_keeps_database_off_the_loop(self, sqlite_session_factory, article):
+        """Test aget/aset read and write the database from a worker thread, and serve memory hits inline"""
+        cache = ArticleCache(max_bytes=1024 * 1024, session_factory=sqlite_session_factory)
+        threads = []
+        load, store = cache._load, cache._store
+        cache._load = lambda *args: threads.append(threading.get_ident()) or load(*args)
+        cache._store = lambda *args: threads.append(threading.get_ident()) or store(*args)
+
+        await cache.aset("en", article["title"], article)
+        assert await cache.aget("en", article["title"]) == article
+        cache.memory.clear()
+        assert await cache.aget("en", article["title"]) == article
+
+        assert len(threads) == 2
+        assert threading.get_ident() not in threads
+        assert cache.stats()["memory_hits"] == 1
+        assert cache.stats()["persistent_hits"] == 1
+
+
+class TestTitleNormalization:
+    """Test title normalization used for cache keys"""
+
+    def test_underscores_and_encoding(self):
+        from app.services.content_extractor import normalize_title
+        assert normalize_title("Python_%28programming_language%29") == "Python (programming language)"
+
+    def test_first_letter_capitalized(self):
+        from app.services.content_extractor import normalize_title
+        assert normalize_title("intelligence_artificielle") == "Intelligence artificielle"
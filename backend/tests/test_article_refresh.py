@@ -0,0 +1,86 @@
+# Cached article refresh tests
+import pytest
+from unittest.mock import MagicMock, AsyncMock
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.article_cache import ArticleCache
+from app.services.article_refresh import refresh_cached_articles
+
+
+def resolved(title, revision_id, missing=False):
+    return {"title": title, "url": None, "revision_id": revision_id,
+            "missing": missing, "disambiguation": False}
+
+
+@pytest.fixture
+def cache(sqlite_session_factory):
+    cache = ArticleCache(max_bytes=1024 * 1024, session_factory=sqlite_session_factory)
+    cache.set("en", "Python", {"title": "Python", "content": "old", "revision_id": 1})
+    cache.set("en", "Java", {"title": "Java", "content": "same", "revision_id": 5})
+    cache.set("en", "Gone", {"title": "Gone", "content": "bye", "revision_id": 9})
+    cache.set("fr", "Python", {"title": "Python", "content": "ancien", "revision_id": 3})
+    return cache
+
+
+class TestRefreshCachedArticles:
+    """Test revision-aware refresh"""
+
+    @pytest.mark.asyncio
+    async def test_only_changed_pages_are_refetched(self, cache):
+        """Test unchanged revisions cost no content request"""
+        latest = {
+            ("en", "Python"): resolved("Python", 2),
+            ("en", "Java"): resolved("Java", 5),
+            ("en", "Gone"): resolved("Gone", None, missing=True),
+            ("fr", "Python"): resolved("Python", 3),
+        }
+        client = MagicMock()
+        client.resolve_titles = AsyncMock(
+            side_effect=lambda language, titles: {t: latest[(language, t)] for t in titles}
+        )
+        client.fetch_page = AsyncMock(return_value={"title": "Python", "content": "new", "revision_id": 2})
+
+        stats = await refresh_cached_articles(cache=cache, client=client)
+
+        assert stats.checked == 4
+        assert stats.changed == 1
+        assert stats.refreshed == 1
+        assert stats.removed == 1
+        assert stats.revision_requests == 2
+        client.fetch_page.assert_awaited_once_with("en", "Python")
+        assert cache.get("en", "Python")["content"] == "new"
+        assert cache.get("en", "Gone") is None
+        assert cache.get("fr", "Python")["content"] == "ancien"
+
+    @pytest.mark.asyncio
+    async def test_titles_batched_by_fifty(self, sqlite_session_factory):
+        """Test revision checks use 50-title queries"""
+        cache = ArticleCache(max_bytes=1024 * 1024, session_factory=sqlite_session_factory)
+        for i in range(120):
+            cache.set("en", f"T{i}", {"title": f"T{i}", "revision_id": 1})
+        client = MagicMock()
+        client.resolve_titles = AsyncMock(
+            side_effect=lambda language, titles: {t: resolved(t, 1) for t in titles}
+        )
+        client.fetch_page = AsyncMock()
+
+        stats = await refresh_cached_articles(cache=cache, client=client)
+
+        sizes = sorted(len(c.args[1]) for c in client.resolve_titles.await_args_list)
+        assert sizes == [20, 50, 50]
+        assert stats.checked == 120
+        client.fetch_page.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_failed_revision_check_keeps_entries(self, cache):
+        """Test an upstream failure leaves cached articles untouched"""
+        client = MagicMock()
+        client.resolve_titles = AsyncMock(side_effect=Exception("timeout"))
+
+        stats = await refresh_cached_articles(cache=cache, client=client)
+
+        assert stats.failed == 4
+        assert cache.get("en", "Python")["content"] == "old"
@@ -6,86 +6,360 @@ import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from app.services.content_extractor import get_wikipedia_content
+from app.services.content_extractor import (
+    get_wikipedia_content,
+    get_wikipedia_outline,
+    get_wikipedia_section,
+    iter_wikipedia_contents
+)
 from app.services.preprocessor import clean_and_segment_text, clean_text, split_into_chunks
 
 
 class TestWikipediaContentExtraction:
     """Test Wikipedia content extraction"""
 
-    @patch('app.services.content_extractor.wikipedia')
-    @patch('app.services.content_extractor.requests.Session')
-    def test_extract_english_wikipedia(self, mock_session, mock_wikipedia):
+    @staticmethod
+    def _page(title, content, summary, url, language="en"):
+        return {
+            "title": title,
+            "content": content,
+            "summary": summary,
+            "url": url,
+            "language": language,
+            "revision_id": 1
+        }
+
+    @pytest.mark.asyncio
+    @patch('app.services.content_extractor.wikipedia_client')
+    async def test_extract_english_wikipedia(self, mock_client):
         """Test extracting content from English Wikipedia"""
-        mock_page = MagicMock()
-        mock_page.title = "Python (programming language)"
-        mock_page.content = "Python is a programming language."
-        mock_page.summary = "Python is a high-level language."
-        mock_page.url = "https://en.wikipedia.org/wiki/Python"
-        mock_wikipedia.page.return_value = mock_page
+        mock_client.fetch_page = AsyncMock(return_value=self._page(
+            "Python (programming language)",
+            "Python is a programming language.",
+            "Python is a high-level language.",
+            "https://en.wikipedia.org/wiki/Python"
+        ))
         
-        result = get_wikipedia_content("https://en.wikipedia.org/wiki/Python_(programming_language)")
+        result = await get_wikipedia_content("https://en.wikipedia.org/wiki/Python_(programming_language)")
         
         assert result["title"] == "Python (programming language)"
         assert "Python" in result["content"]
 
-    @patch('app.services.content_extractor.wikipedia')
-    @patch('app.services.content_extractor.requests.Session')
-    def test_extract_french_wikipedia(self, mock_session, mock_wikipedia):
+    @pytest.mark.asyncio
+    @patch('app.services.content_extractor.wikipedia_client')
+    async def test_extract_french_wikipedia(self, mock_client):
         """Test extracting content from French Wikipedia"""
-        mock_page = MagicMock()
-        mock_page.title = "Python (langage)"
-        mock_page.content = "Python est un langage de programmation."
-        mock_page.summary = "Python est un langage."
-        mock_page.url = "https://fr.wikipedia.org/wiki/Python"
-        mock_wikipedia.page.return_value = mock_page
+        mock_client.fetch_page = AsyncMock(return_value=self._page(
+            "Python (langage)",
+            "Python est un langage de programmation.",
+            "Python est un langage.",
+            "https://fr.wikipedia.org/wiki/Python",
+            language="fr"
+        ))
         
-        result = get_wikipedia_content("https://fr.wikipedia.org/wiki/Python_(langage)")
+        result = await get_wikipedia_content("https://fr.wikipedia.org/wiki/Python_(langage)")
         
         assert result["language"] == "fr"
+        mock_client.fetch_page.assert_awaited_once_with("fr", "Python (langage)")
 
-    @patch('app.services.content_extractor.wikipedia')
-    @patch('app.services.content_extractor.requests.Session')
-    def test_extract_with_explicit_language(self, mock_session, mock_wikipedia):
+    @pytest.mark.asyncio
+    @patch('app.services.content_extractor.wikipedia_client')
+    async def test_extract_with_explicit_language(self, mock_client):
         """Test extraction with explicit language parameter"""
-        mock_page = MagicMock()
-        mock_page.title = "Test"
-        mock_page.content = "Test content"
-        mock_page.summary = "Test summary"
-        mock_page.url = "https://de.wikipedia.org/wiki/Test"
-        mock_wikipedia.page.return_value = mock_page
+        mock_client.fetch_page = AsyncMock(return_value=self._page(
+            "Test", "Test content", "Test summary", "https://de.wikipedia.org/wiki/Test", language="de"
+        ))
         
-        result = get_wikipedia_content("https://de.wikipedia.org/wiki/Test", language="de")
+        await get_wikipedia_content("https://de.wikipedia.org/wiki/Test", language="de")
         
-        mock_wikipedia.set_lang.assert_called_with("de")
+        mock_client.fetch_page.assert_awaited_once_with("de", "Test")
 
-    @patch('app.services.content_extractor.wikipedia')
-    @patch('app.services.content_extractor.requests.Session')
-    def test_extract_page_not_found(self, mock_session, mock_wikipedia):
+    @pytest.mark.asyncio
+    @patch('app.services.content_extractor.wikipedia_client')
+    async def test_extract_page_not_found(self, mock_client):
         """Test handling of page not found error"""
-        import wikipedia as wiki_module
-        mock_wikipedia.page.side_effect = wiki_module.exceptions.PageError("NonExistent")
-        mock_wikipedia.exceptions = wiki_module.exceptions
+        from app.core.exceptions import WikipediaPageNotFoundException
+        mock_client.fetch_page = AsyncMock(
+            side_effect=WikipediaPageNotFoundException("NonExistent Page 12345")
+        )
         
         with pytest.raises(Exception) as exc_info:
-            get_wikipedia_content("https://en.wikipedia.org/wiki/NonExistent_Page_12345")
+            await get_wikipedia_content("https://en.wikipedia.org/wiki/NonExistent_Page_12345")
         
         assert "introuvable" in str(exc_info.value).lower() or "not found" in str(exc_info.value).lower()
 
-    @patch('app.services.content_extractor.wikipedia')
-    @patch('app.services.content_extractor.requests.Session')
-    def test_extract_url_with_special_characters(self, mock_session, mock_wikipedia):
+    @pytest.mark.asyncio
+    @patch('app.services.content_extractor.wikipedia_client')
+    async def test_extract_url_with_special_characters(self, mock_client):
         """Test extraction from URL with special characters"""
-        mock_page = MagicMock()
-        mock_page.title = "C++"
-        mock_page.content = "C++ is a programming language."
-        mock_page.summary = "C++ is a language."
-        mock_page.url = "https://en.wikipedia.org/wiki/C%2B%2B"
-        mock_wikipedia.page.return_value = mock_page
+        mock_client.fetch_page = AsyncMock(return_value=self._page(
+            "C++", "C++ is a programming language.", "C++ is a language.", "https://en.wikipedia.org/wiki/C%2B%2B"
+        ))
         
-        result = get_wikipedia_content("https://en.wikipedia.org/wiki/C%2B%2B")
+        result = await get_wikipedia_content("https://en.wikipedia.org/wiki/C%2B%2B")
         
         assert result is not None
+        mock_client.fetch_page.assert_awaited_once_with("en", "C++")
+
+    @pytest.mark.asyncio
+    @patch('app.services.content_extractor.wikipedia_client')
+    async def test_extract_served_from_cache(self, mock_client):
+        """Test a repeated extraction does not hit Wikipedia again"""
+        mock_client.fetch_page = AsyncMock(return_value=self._page(
+            "Python", "Python is a language.", "Python.", "https://en.wikipedia.org/wiki/Python"
+        ))
+        
+        await get_wikipedia_content("https://en.wikipedia.org/wiki/Python")
+        await get_wikipedia_content("https://en.wikipedia.org/wiki/Python")
+        
+        mock_client.fetch_page.assert_awaited_once()
+
+
+class TestBatchExtraction:
+    """Test batch Wikipedia extraction"""
+
+    @staticmethod
+    def _resolved(titles, missing=()):
+        return {
+            title: {
+                "title": title,
+                "url": f"https://en.wikipedia.org/wiki/{title}",
+                "revision_id": 1,
+                "missing": title in missing,
+                "disambiguation": False
+            }
+            for title in titles
+        }
+
+    @staticmethod
+    async def _collect(urls, **kwargs):
+        return [result async for result in iter_wikipedia_contents(urls, **kwargs)]
+
+    @pytest.mark.asyncio
+    @patch('app.services.content_extractor.wikipedia_client')
+    async def test_titles_grouped_by_language_in_chunks_of_fifty(self, mock_client):
+        """Test multi-title queries are issued per language, 50 titles at most"""
+        mock_client.resolve_titles = AsyncMock(side_effect=lambda language, titles: self._resolved(titles))
+        mock_client.fetch_page = AsyncMock(side_effect=lambda language, title: {"title": title, "language": language})
+        urls = [f"https://en.wikipedia.org/wiki/Article_{i}" for i in range(60)]
+        urls += ["https://fr.wikipedia.org/wiki/Article_0"]
+
+        results = await self._collect(urls)
+
+        assert len(results) == 61
+        assert all(result["status"] == "success" for result in results)
+        calls = [(c.args[0], len(c.args[1])) for c in mock_client.resolve_titles.await_args_list]
+        assert sorted(calls) == [("en", 10), ("en", 50), ("fr", 1)]
+
+    @pytest.mark.asyncio
+    @patch('app.services.content_extractor.wikipedia_client')
+    async def test_missing_pages_do_not_fetch_content(self, mock_client):
+        """Test missing titles are reported from the resolution query alone"""
+        mock_client.resolve_titles = AsyncMock(side_effect=lambda language, titles: self._resolved(titles, missing={"Nope"}))
+        mock_client.fetch_page = AsyncMock(side_effect=lambda language, title: {"title": title})
+
+        results = await self._collect(["https://en.wikipedia.org/wiki/Nope", "https://en.wikipedia.org/wiki/Python"])
+
+        by_url = {result["url"]: result for result in results}
+        assert by_url["https://en.wikipedia.org/wiki/Nope"]["status"] == "error"
+        assert "introuvable" in by_url["https://en.wikipedia.org/wiki/Nope"]["detail"]
+        mock_client.fetch_page.assert_awaited_once_with("en", "Python")
+
+    @pytest.mark.asyncio
+    @patch('app.services.content_extractor.wikipedia_client')
+    async def test_cached_and_duplicate_urls(self, mock_client, isolated_article_cache):
+        """Test cache hits skip the network and duplicates share one fetch"""
+        isolated_article_cache.set("en", "Cached", {"title": "Cached"})
+        mock_client.resolve_titles = AsyncMock(side_effect=lambda language, titles: self._resolved(titles))
+        mock_client.fetch_page = AsyncMock(side_effect=lambda language, title: {"title": title})
+
+        results = await self._collect([
+            "https://en.wikipedia.org/wiki/Cached",
+            "https://en.wikipedia.org/wiki/Python",
+            "https://en.m.wikipedia.org/wiki/Python"
+        ])
+
+        assert len(results) == 3
+        assert results[0]["data"] == {"title": "Cached"}
+        mock_client.fetch_page.assert_awaited_once_with("en", "Python")
+
+    @pytest.mark.asyncio
+    @patch('app.services.content_extractor.wikipedia_client')
+    async def test_concurrency_is_bounded(self, mock_client):
+        """Test no more than `concurrency` upstream requests run at once"""
+        import asyncio
+        in_flight = 0
+        peak = 0
+
+        async def fetch_page(language, title):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return {"title": title}
+
+        mock_client.resolve_titles = AsyncMock(side_effect=lambda language, titles: self._resolved(titles))
+        mock_client.fetch_page = fetch_page
+
+        urls = [f"https://en.wikipedia.org/wiki/Article_{i}" for i in range(20)]
+        results = await self._collect(urls, concurrency=3)
+
+        assert len(results) == 20
+        assert peak <= 3
+
+
+class TestLazySections:
+    """Test lazy outline and on-demand sections"""
+
+    OFFLINE_ARTICLE = {
+        "title": "Python",
+        "content": "Lead.\n\n== History ==\nOld.\n\n=== Early ===\nOlder.\n\n== Features ==\nTyped.",
+        "summary": "Lead.",
+        "url": "https://en.wikipedia.org/wiki/Python",
+        "language": "en",
+        "revision_id": 1
+    }
+
+    @pytest.fixture(autouse=True)
+    def empty_section_cache(self):
+        from app.services.cache import LRUCache
+        with patch('app.services.content_extractor.section_cache', LRUCache(1024 * 1024)):
+            yield
+
+    @pytest.mark.asyncio
+    @patch('app.services.content_extractor.wikipedia_client')
+    async def test_outline_is_cached(self, mock_client):
+        """Test the outline is fetched once"""
+        mock_client.fetch_outline = AsyncMock(return_value={"title": "Python", "sections": []})
+
+        await get_wikipedia_outline("https://en.wikipedia.org/wiki/Python")
+        await get_wikipedia_outline("https://en.wikipedia.org/wiki/Python")
+
+        mock_client.fetch_outline.assert_awaited_once_with("en", "Python")
+
+    @pytest.mark.asyncio
+    @patch('app.services.content_extractor.wikipedia_client')
+    async def test_section_is_cached(self, mock_client):
+        """Test a section body is fetched once"""
+        mock_client.fetch_section = AsyncMock(return_value={"title": "Python", "index": 2, "content": "Text"})
+
+        await get_wikipedia_section("en", "Python", 2)
+        result = await get_wikipedia_section("en", "python", 2)
+
+        assert result["content"] == "Text"
+        mock_client.fetch_section.assert_awaited_once_with("en", "Python", 2)
+
+    @pytest.mark.asyncio
+    @patch('app.services.content_extractor.wikipedia_client')
+    async def test_offline_article_outline_and_sections(self, mock_client):
+        """Test ingested articles are split locally"""
+        store = MagicMock()
+        store.get.return_value = dict(self.OFFLINE_ARTICLE)
+
+        with patch('app.services.content_extractor.offline_store', store):
+            outline = await get_wikipedia_outline("https://en.wikipedia.org/wiki/Python")
+            lead = await get_wikipedia_section("en", "Python", 0)
+            history = await get_wikipedia_section("en", "Python", 1)
+
+        assert outline["content"] == "Lead."
+        assert [s["title"] for s in outline["sections"]] == ["Introduction", "History", "Early", "Features"]
+        assert lead["content"] == "Lead."
+        assert "Older." in history["content"]
+        assert "Typed." not in history["content"]
+        mock_client.fetch_outline.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_offline_section_out_of_range(self):
+        """Test an unknown section index is a 404"""
+        from app.core.exceptions import WikipediaSectionNotFoundException
+        store = MagicMock()
+        store.get.return_value = dict(self.OFFLINE_ARTICLE)
+
+        with patch('app.services.content_extractor.offline_store', store):
+            with pytest.raises(WikipediaSectionNotFoundException):
+                await get_wikipedia_section("en", "Python", 9)
+
+    @pytest.mark.asyncio
+    @patch('app.services.content_extractor.wikipedia_client')
+    async def test_language_must_be_a_language_code(self, mock_client):
+        """Test a language that is not a language code never reaches the API host (422)"""
+        from app.core.exceptions import InvalidWikipediaLanguageException
+        from app.services.content_extractor import parse_wikipedia_url
+
+        with pytest.raises(InvalidWikipediaLanguageException) as error:
+            await get_wikipedia_section("169.254.169.254#", "Python", 1)
+        with pytest.raises(InvalidWikipediaLanguageException):
+            parse_wikipedia_url("https://en.wikipedia.org/wiki/Python", language="evil.com#")
+
+        assert error.value.status_code == 422
+        assert parse_wikipedia_url("https://zh-min-nan.wikipedia.org/wiki/Python") == ("zh-min-nan", "Python")
+        mock_client.fetch_section.assert_not_called()
+
+    def test_requests_reject_lookalike_hosts(self):
+        """Test extraction requests only accept Wikipedia language hosts"""
+        from pydantic import ValidationError
+        from app.schemas.article import WikiRequest, WikiBatchRequest
+
+        for url in ("https://wikipedia.org.evil.com/wiki/X", "https://169.254.169.254/wikipedia.org"):
+            with pytest.raises(ValidationError):
+                WikiRequest(url=url)
+            with pytest.raises(ValidationError):
+                WikiBatchRequest(urls=[url])
+        assert WikiRequest(url="https://en.m.wikipedia.org/wiki/Python")
+
+
+class TestExtractAndSummarize:
+    """Test the extract-wiki pipeline"""
+
+    @pytest.mark.asyncio
+    @patch('app.api.v1.articles.get_async_llm_service')
+    @patch('app.api.v1.articles.get_wikipedia_content')
+    async def test_partial_summaries_returned(self, mock_content, mock_llm):
+        """Test the article is returned with whichever summaries succeeded"""
+        from app.api.v1.articles import _extract_and_summarize
+        mock_content.return_value = {"title": "Python", "content": "Python is a language."}
+        mock_llm.return_value.summarize_document = AsyncMock(return_value={"medium": "Medium summary"})
+
+        result = await _extract_and_summarize("https://en.wikipedia.org/wiki/Python")
+
+        assert result["ai_summary_medium"] == "Medium summary"
+        assert "ai_summary_short" not in result
+        args, kwargs = mock_llm.return_value.summarize_document.await_args
+        assert args == ("Python is a language.", ("short", "medium"))
+        assert kwargs["timeout"] > 0
+
+    @pytest.mark.asyncio
+    @patch('app.api.v1.articles.get_async_llm_service')
+    @patch('app.api.v1.articles.get_wikipedia_content')
+    async def test_whole_article_summarized(self, mock_content, mock_llm):
+        """Test text past the first 8000 characters reaches the summarizer"""
+        from app.api.v1.articles import _extract_and_summarize
+        content = "Intro. " * 2000 + "Conclusion."
+        mock_content.return_value = {"title": "Python", "content": content}
+        mock_llm.return_value.summarize_document = AsyncMock(return_value={})
+
+        await _extract_and_summarize("https://en.wikipedia.org/wiki/Python")
+
+        assert mock_llm.return_value.summarize_document.await_args.args[0] == content
+
+    @pytest.mark.asyncio
+    @patch('app.api.v1.articles.get_async_llm_service')
+    @patch('app.api.v1.articles.get_wikipedia_outline')
+    async def test_lazy_summary_flagged_lead_only(self, mock_outline, mock_llm, sqlite_session_factory):
+        """Test a lazy extraction says, in the response and the saved article, that only the lead was summarized"""
+        from app.api.v1.articles import run_wiki_extraction
+        from app.models.article import Article
+        mock_outline.return_value = {"title": "Python", "content": "Python is a language.", "sections": []}
+        mock_llm.return_value.summarize_document = AsyncMock(return_value={"short": "Short summary"})
+
+        with sqlite_session_factory() as db:
+            result = await run_wiki_extraction("https://en.wikipedia.org/wiki/Python", True, 1, db)
+            article = db.get(Article, result["article_id"])
+
+            assert result["data"]["summary_lead_only"] is True
+            assert article.summary_lead_only is True
+            assert mock_llm.return_value.summarize_document.await_args.args[0] == "Python is a language."
 
 
 class TestTextCleaning:
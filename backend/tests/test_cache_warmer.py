@@ -0,0 +1,131 @@
+# Cache warmer tests: popularity ranking and budgets
+import json
+import pytest
+import sys
+import os
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.models.article import Article, ActionType
+from app.services.cache_warmer import popular_urls, warm_popular_articles
+from app.services.content_extractor import get_wikipedia_content
+
+
+def add_requests(session_factory, urls, age_hours=1):
+    with session_factory() as db:
+        for url in urls:
+            db.add(Article(
+                user_id=1,
+                url=url,
+                title=url.rsplit("/", 1)[-1],
+                action=ActionType.SUMMARY,
+                created_at=datetime.utcnow() - timedelta(hours=age_hours)
+            ))
+        db.commit()
+
+
+def llm_service(summary="summary"):
+    """Real AsyncLLMService (and its result cache) around a mocked Groq client"""
+    from app.services.llm_service import AsyncLLMService
+    response = MagicMock()
+    response.choices = [MagicMock()]
+    response.choices[0].message.content = json.dumps({"short": summary, "medium": summary})
+    groq = MagicMock()
+    groq.chat.completions.create = AsyncMock(return_value=response)
+    return AsyncLLMService(groq_client=groq, gemini_client=MagicMock())
+
+
+def page(language, title):
+    return {"title": title, "content": "Text. " * 100, "language": language, "revision_id": 1}
+
+
+class TestPopularUrls:
+    """Test ranking of requested articles"""
+
+    def test_ranked_by_requests_within_window(self, sqlite_session_factory):
+        add_requests(sqlite_session_factory, [
+            "https://en.wikipedia.org/wiki/Python",
+            "https://en.m.wikipedia.org/wiki/Python",
+            "https://en.wikipedia.org/wiki/python",
+            "https://en.wikipedia.org/wiki/Java",
+            "pdf://notes.pdf",
+        ])
+        add_requests(sqlite_session_factory, ["https://en.wikipedia.org/wiki/Java"] * 5, age_hours=48)
+
+        with sqlite_session_factory() as db:
+            ranked = popular_urls(db, datetime.utcnow() - timedelta(hours=24), limit=10)
+
+        assert ranked == [
+            ("https://en.wikipedia.org/wiki/Python", 3),
+            ("https://en.wikipedia.org/wiki/Java", 1),
+        ]
+
+
+class TestWarmPopularArticles:
+    """Test prefetching and pre-summarizing"""
+
+    @pytest.mark.asyncio
+    @patch('app.services.content_extractor.wikipedia_client')
+    async def test_prefetch_and_summaries_served_to_extraction(self, mock_client, sqlite_session_factory):
+        add_requests(sqlite_session_factory, ["https://en.wikipedia.org/wiki/Python"])
+        mock_client.fetch_page = AsyncMock(side_effect=page)
+        service = llm_service()
+
+        stats = await warm_popular_articles(session_factory=sqlite_session_factory, llm_service=service)
+        content = await get_wikipedia_content("https://en.wikipedia.org/wiki/Python")
+
+        assert stats.fetched == 1
+        assert stats.summarized == 1
+        assert service.client.chat.completions.create.call_count == 1
+        # extract-wiki asks for the same summaries and gets them from the cache
+        assert await service.generate_summary(content["content"][:8000], "short") == "summary"
+        assert service.client.chat.completions.create.call_count == 1
+        mock_client.fetch_page.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @patch('app.services.content_extractor.wikipedia_client')
+    async def test_upstream_budget_keeps_most_popular(self, mock_client, sqlite_session_factory):
+        add_requests(sqlite_session_factory, ["https://en.wikipedia.org/wiki/Python"] * 3)
+        add_requests(sqlite_session_factory, ["https://en.wikipedia.org/wiki/Java"] * 2)
+        add_requests(sqlite_session_factory, ["https://en.wikipedia.org/wiki/Rust"])
+        mock_client.fetch_page = AsyncMock(side_effect=page)
+
+        stats = await warm_popular_articles(session_factory=sqlite_session_factory, max_upstream_calls=2)
+
+        assert stats.upstream_calls == 2
+        assert stats.skipped == 1
+        fetched = [call.args[1] for call in mock_client.fetch_page.await_args_list]
+        assert fetched == ["Python", "Java"]
+
+    @pytest.mark.asyncio
+    @patch('app.services.content_extractor.wikipedia_client')
+    async def test_token_budget_limits_summaries(self, mock_client, sqlite_session_factory):
+        add_requests(sqlite_session_factory, ["https://en.wikipedia.org/wiki/Python"])
+        mock_client.fetch_page = AsyncMock(side_effect=page)
+        service = llm_service()
+
+        stats = await warm_popular_articles(
+            session_factory=sqlite_session_factory, llm_service=service, max_llm_tokens=100
+        )
+
+        assert stats.fetched == 1
+        assert stats.summarized == 0
+        assert stats.skipped == 1
+        service.client.chat.completions.create.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch('app.services.content_extractor.wikipedia_client')
+    async def test_already_warm_articles_cost_nothing(self, mock_client, sqlite_session_factory):
+        add_requests(sqlite_session_factory, ["https://en.wikipedia.org/wiki/Python"])
+        mock_client.fetch_page = AsyncMock(side_effect=page)
+        service = llm_service()
+
+        await warm_popular_articles(session_factory=sqlite_session_factory, llm_service=service)
+        stats = await warm_popular_articles(session_factory=sqlite_session_factory, llm_service=service)
+
+        assert stats.already_cached == 1
+        assert stats.upstream_calls == 0
+        assert stats.llm_tokens == 0
+        assert service.client.chat.completions.create.call_count == 1
@@ -0,0 +1,153 @@
+# Offline dump ingestion tests
+import bz2
+import pytest
+import sys
+import os
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.dump_ingester import ingest_dump, iter_dump_pages
+from app.services.offline_store import OfflineArticleStore
+from app.models.offline_article import OfflineArticle
+
+FIXTURE_DUMP = """<mediawiki xmlns="http://www.mediawiki.org/xml/export-0.10/" version="0.10" xml:lang="fr">
+  <siteinfo><sitename>Wikipédia</sitename></siteinfo>
+  <page>
+    <title>Intelligence artificielle</title>
+    <ns>0</ns>
+    <id>1</id>
+    <revision>
+      <id>1001</id>
+      <text xml:space="preserve">{{Infobox}}L''''intelligence artificielle''' est un [[Domaine|domaine]].
+
+== Histoire ==
+Les débuts.&lt;ref&gt;Source&lt;/ref&gt;
+
+=== Années 1950 ===
+[[Alan Turing]] publie.</text>
+    </revision>
+  </page>
+  <page>
+    <title>IA</title>
+    <ns>0</ns>
+    <id>2</id>
+    <redirect title="Intelligence artificielle" />
+    <revision>
+      <id>1002</id>
+      <text xml:space="preserve">#REDIRECTION [[Intelligence artificielle]]</text>
+    </revision>
+  </page>
+  <page>
+    <title>Discussion:Intelligence artificielle</title>
+    <ns>1</ns>
+    <id>3</id>
+    <revision>
+      <id>1003</id>
+      <text xml:space="preserve">Talk page.</text>
+    </revision>
+  </page>
+</mediawiki>
+"""
+
+
+@pytest.fixture
+def fixture_dump(tmp_path):
+    """Write a small bz2-compressed pages-articles dump"""
+    path = tmp_path / "frwiki-pages-articles.xml.bz2"
+    path.write_bytes(bz2.compress(FIXTURE_DUMP.encode("utf-8")))
+    return str(path)
+
+
+class TestIterDumpPages:
+    """Test streaming dump parsing"""
+
+    def test_yields_every_page(self, fixture_dump):
+        pages = list(iter_dump_pages(fixture_dump))
+        assert [page["title"] for page in pages] == [
+            "Intelligence artificielle", "IA", "Discussion:Intelligence artificielle"
+        ]
+        assert pages[0]["revision_id"] == 1001
+        assert pages[1]["redirect_to"] == "Intelligence artificielle"
+        assert pages[2]["ns"] == 1
+
+    def test_reads_uncompressed_dump(self, tmp_path):
+        path = tmp_path / "dump.xml"
+        path.write_text(FIXTURE_DUMP, encoding="utf-8")
+        assert len(list(iter_dump_pages(str(path)))) == 3
+
+
+class TestIngestDump:
+    """Test loading a dump into the offline store"""
+
+    def test_ingests_main_namespace(self, fixture_dump, sqlite_session_factory):
+        stats = ingest_dump(fixture_dump, "fr", session_factory=sqlite_session_factory)
+
+        assert stats.pages == 2
+        assert stats.redirects == 1
+        assert stats.skipped == 1
+        assert stats.pages_per_second > 0
+        with sqlite_session_factory() as db:
+            article = db.query(OfflineArticle).filter(OfflineArticle.title == "Intelligence artificielle").one()
+            assert "Infobox" not in article.content
+            assert "== Histoire ==" in article.content
+            assert '"Années 1950"' in article.sections
+
+    def test_reingest_updates_rows(self, fixture_dump, sqlite_session_factory):
+        ingest_dump(fixture_dump, "fr", session_factory=sqlite_session_factory)
+        ingest_dump(fixture_dump, "fr", session_factory=sqlite_session_factory, batch_size=1)
+        with sqlite_session_factory() as db:
+            assert db.query(OfflineArticle).count() == 2
+
+    def test_progress_reported_per_batch(self, fixture_dump, sqlite_session_factory):
+        reports = []
+        ingest_dump(fixture_dump, "fr", session_factory=sqlite_session_factory, batch_size=1, progress=reports.append)
+        assert len(reports) == 2
+
+
+class TestOfflineStore:
+    """Test offline lookups"""
+
+    def test_lookup_follows_redirects(self, fixture_dump, sqlite_session_factory):
+        ingest_dump(fixture_dump, "fr", session_factory=sqlite_session_factory)
+        store = OfflineArticleStore(session_factory=sqlite_session_factory)
+
+        content = store.get("fr", "IA")
+
+        assert content["title"] == "Intelligence artificielle"
+        assert content["summary"] == "L'intelligence artificielle est un domaine."
+        assert content["revision_id"] == 1001
+        assert content["url"] == "https://fr.wikipedia.org/wiki/Intelligence_artificielle"
+
+    def test_unknown_title(self, fixture_dump, sqlite_session_factory):
+        ingest_dump(fixture_dump, "fr", session_factory=sqlite_session_factory)
+        store = OfflineArticleStore(session_factory=sqlite_session_factory)
+        assert store.get("fr", "Inconnu") is None
+        assert store.get("en", "IA") is None
+
+    @pytest.mark.asyncio
+    async def test_get_wikipedia_content_uses_offline_store(self, fixture_dump, sqlite_session_factory):
+        """Test extraction is served locally without any network call"""
+        from app.services.content_extractor import get_wikipedia_content
+        ingest_dump(fixture_dump, "fr", session_factory=sqlite_session_factory)
+        store = OfflineArticleStore(session_factory=sqlite_session_factory)
+
+        with patch('app.services.content_extractor.offline_store', store), \
+                patch('app.services.content_extractor.wikipedia_client') as mock_client:
+            content = await get_wikipedia_content("https://fr.wikipedia.org/wiki/Intelligence_artificielle")
+
+        assert content["title"] == "Intelligence artificielle"
+        mock_client.fetch_page.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_offline_only_mode(self):
+        """Test offline-only mode never falls back to the network"""
+        from app.services.content_extractor import get_wikipedia_content
+        from app.core.exceptions import WikipediaPageNotFoundException
+
+        with patch('app.services.content_extractor.settings.WIKIPEDIA_OFFLINE_ONLY', True), \
+                patch('app.services.content_extractor.wikipedia_client') as mock_client:
+            with pytest.raises(WikipediaPageNotFoundException):
+                await get_wikipedia_content("https://fr.wikipedia.org/wiki/Inconnu")
+
+        mock_client.fetch_page.assert_not_called()
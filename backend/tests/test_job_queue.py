@@ -0,0 +1,359 @@
+# Background job tests: persistent queue, worker pool, recovery, job routes
+import asyncio
+import json
+import pytest
+import sys
+import os
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.exceptions import WikipediaPageNotFoundException
+from app.models.job import Job, JobStatus
+from app.services.job_queue import JobQueue
+
+
+async def finished(queue, job_id):
+    """Follow a job until it finishes and return it"""
+    async for job in queue.watch(job_id, max_seconds=5):
+        if job is not None and job["status"] in ("succeeded", "failed"):
+            return job
+    raise AssertionError("job did not finish")
+
+
+@pytest.fixture
+def queue(sqlite_session_factory):
+    return JobQueue(session_factory=sqlite_session_factory, workers=2, timeout=5, poll_interval=0.05)
+
+
+class TestJobQueue:
+    """Test submission, execution and persistence of jobs"""
+
+    @pytest.mark.asyncio
+    async def test_job_runs_in_background(self, queue):
+        """Test submit returns a queued job at once and a worker stores its result"""
+        started = asyncio.Event()
+
+        async def handler(payload, user_id, db):
+            await started.wait()
+            return {"echo": payload["text"], "user_id": user_id}
+
+        queue.register("echo", handler)
+        await queue.start()
+        try:
+            job = await queue.submit("echo", 7, {"text": "hello"})
+            assert job["status"] == "queued"
+            started.set()
+            done = await finished(queue, job["job_id"])
+        finally:
+            await queue.stop()
+
+        assert done["status"] == "succeeded"
+        assert done["result"] == {"echo": "hello", "user_id": 7}
+        assert done["started_at"] is not None and done["finished_at"] is not None
+        assert await queue.get(job["job_id"]) == done
+
+    @pytest.mark.asyncio
+    async def test_failed_job_keeps_error(self, queue):
+        """Test a handler error marks the job failed with the error message"""
+        async def handler(payload, user_id, db):
+            raise WikipediaPageNotFoundException("Nope")
+
+        queue.register("extract", handler)
+        await queue.start()
+        try:
+            done = await finished(queue, (await queue.submit("extract", 1, {}))["job_id"])
+        finally:
+            await queue.stop()
+
+        assert done["status"] == "failed"
+        assert done["error"] == "Page Wikipedia introuvable pour le titre: Nope"
+        assert done["result"] is None
+
+    @pytest.mark.asyncio
+    async def test_job_time_limit(self, sqlite_session_factory):
+        """Test a job running past the time limit fails"""
+        queue = JobQueue(session_factory=sqlite_session_factory, workers=1, timeout=0.05, poll_interval=0.05)
+        queue.register("slow", lambda payload, user_id, db: asyncio.sleep(1))
+        await queue.start()
+        try:
+            done = await finished(queue, (await queue.submit("slow", 1, {}))["job_id"])
+        finally:
+            await queue.stop()
+
+        assert done["status"] == "failed"
+        assert "Délai dépassé" in done["error"]
+
+    @pytest.mark.asyncio
+    async def test_workers_run_jobs_concurrently(self, queue):
+        """Test the pool runs as many jobs at once as it has workers"""
+        async def handler(payload, user_id, db):
+            await asyncio.sleep(0.2)
+            return {}
+
+        queue.register("slow", handler)
+        await queue.start()
+        try:
+            start = asyncio.get_running_loop().time()
+            jobs = [await queue.submit("slow", 1, {}) for _ in range(2)]
+            await asyncio.gather(*(finished(queue, job["job_id"]) for job in jobs))
+            elapsed = asyncio.get_running_loop().time() - start
+        finally:
+            await queue.stop()
+
+        assert elapsed < 0.35
+
+    @pytest.mark.asyncio
+    async def test_unknown_kind_rejected(self, queue):
+        """Test only registered job kinds can be submitted"""
+        with pytest.raises(ValueError):
+            await queue.submit("unknown", 1, {})
+
+    @pytest.mark.asyncio
+    async def test_jobs_private_to_their_user(self, queue):
+        """Test a user cannot read another user's job"""
+        queue.register("echo", AsyncMock(return_value={}))
+        job = await queue.submit("echo", 1, {})
+
+        assert await queue.get(job["job_id"], user_id=1) is not None
+        assert await queue.get(job["job_id"], user_id=2) is None
+        assert await queue.get("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_watch_reports_each_status(self, queue):
+        """Test watchers see queued, running and succeeded, then the stream ends"""
+        release = asyncio.Event()
+
+        async def handler(payload, user_id, db):
+            await release.wait()
+            return {"ok": True}
+
+        queue.register("echo", handler)
+        job = await queue.submit("echo", 1, {})
+        statuses = []
+
+        async def follow():
+            async for update in queue.watch(job["job_id"], max_seconds=5):
+                if update is not None:
+                    statuses.append(update["status"])
+                    if update["status"] == "running":
+                        release.set()
+
+        watcher = asyncio.ensure_future(follow())
+        await asyncio.sleep(0)
+        await queue.start()
+        try:
+            await asyncio.wait_for(watcher, 5)
+        finally:
+            await queue.stop()
+
+        assert statuses == ["queued", "running", "succeeded"]
+
+    @pytest.mark.asyncio
+    async def test_cleanup_once_job_has_finished(self, queue):
+        """Test a job requeued by a shutdown keeps its inputs, which are released once it finishes"""
+        cleanup = MagicMock()
+        runs = []
+        running = asyncio.Event()
+
+        async def handler(payload, user_id, db):
+            runs.append(payload)
+            if len(runs) == 1:
+                running.set()
+                await asyncio.sleep(10)
+            return {}
+
+        queue.register("echo", handler, cleanup=cleanup)
+        await queue.start()
+        job = await queue.submit("echo", 1, {"temp_path": "/tmp/upload.pdf"})
+        await asyncio.wait_for(running.wait(), 5)
+        await queue.stop()
+        cleanup.assert_not_called()
+
+        await queue.start()
+        try:
+            done = await finished(queue, job["job_id"])
+        finally:
+            await queue.stop()
+
+        assert done["status"] == "succeeded"
+        assert len(runs) == 2
+        cleanup.assert_called_once_with({"temp_path": "/tmp/upload.pdf"})
+
+
+class TestJobRecovery:
+    """Test jobs stored in the table survive restarts"""
+
+    @staticmethod
+    def add_job(session_factory, job_id, status, started_at=None):
+        with session_factory() as db:
+            db.add(Job(id=job_id, user_id=1, kind="echo", status=status, payload=json.dumps({"n": 1}),
+                       started_at=started_at))
+            db.commit()
+
+    @pytest.mark.asyncio
+    async def test_pending_and_stale_jobs_resumed(self, queue, sqlite_session_factory):
+        """Test queued jobs and jobs running past the time limit are run on start"""
+        self.add_job(sqlite_session_factory, "queued", JobStatus.QUEUED)
+        self.add_job(sqlite_session_factory, "stale", JobStatus.RUNNING, datetime.utcnow() - timedelta(hours=1))
+        self.add_job(sqlite_session_factory, "active", JobStatus.RUNNING, datetime.utcnow())
+        queue.register("echo", AsyncMock(return_value={"ok": True}))
+
+        await queue.start()
+        try:
+            results = [await finished(queue, job_id) for job_id in ("queued", "stale")]
+        finally:
+            await queue.stop()
+
+        assert [job["status"] for job in results] == ["succeeded", "succeeded"]
+        assert (await queue.get("active"))["status"] == "running"
+
+    @pytest.mark.asyncio
+    async def test_shutdown_requeues_running_job(self, queue):
+        """Test a job interrupted by stop() is queued again"""
+        running = asyncio.Event()
+
+        async def handler(payload, user_id, db):
+            running.set()
+            await asyncio.sleep(10)
+
+        queue.register("echo", handler)
+        await queue.start()
+        job = await queue.submit("echo", 1, {})
+        await asyncio.wait_for(running.wait(), 5)
+        await queue.stop()
+
+        assert (await queue.get(job["job_id"]))["status"] == "queued"
+
+    @pytest.mark.asyncio
+    async def test_job_claimed_once(self, sqlite_session_factory):
+        """Test two worker pools sharing the table run a job only once"""
+        handler = AsyncMock(return_value={})
+        queues = [JobQueue(session_factory=sqlite_session_factory, workers=1, poll_interval=0.05) for _ in range(2)]
+        for queue in queues:
+            queue.register("echo", handler)
+        self.add_job(sqlite_session_factory, "shared", JobStatus.QUEUED)
+
+        for queue in queues:
+            await queue.start()
+        try:
+            await finished(queues[0], "shared")
+            await asyncio.sleep(0.05)
+        finally:
+            for queue in queues:
+                await queue.stop()
+
+        handler.assert_awaited_once()
+
+
+class TestJobRoutes:
+    """Test extraction jobs and job routes"""
+
+    @pytest.mark.asyncio
+    async def test_wiki_extraction_job(self, queue, sqlite_session_factory):
+        """Test /extract-wiki/jobs answers at once and the job saves the article like /extract-wiki"""
+        from app.api.v1 import articles
+        from app.models.article import Article
+        from app.schemas.article import WikiRequest
+        queue.register("extract_wiki", articles._wiki_job)
+        user = MagicMock(id=1)
+        content = {"title": "Python", "content": "Python is a programming language."}
+
+        with patch.object(articles, "job_queue", queue), \
+                patch.object(articles, "_extract_and_summarize", AsyncMock(return_value=content)):
+            accepted = await articles.submit_wikipedia_extraction(
+                WikiRequest(url="https://en.wikipedia.org/wiki/Python"), current_user=user
+            )
+            await queue.start()
+            try:
+                done = await finished(queue, accepted["job_id"])
+            finally:
+                await queue.stop()
+
+        assert accepted["status"] == "queued"
+        assert accepted["status_url"] == f"/api/v1/jobs/{accepted['job_id']}"
+        assert done["status"] == "succeeded"
+        assert done["result"]["data"] == content
+        with sqlite_session_factory() as db:
+            article = db.get(Article, done["result"]["article_id"])
+            assert article.title == "Python"
+            assert article.user_id == 1
+            assert article.summary_lead_only is False
+
+    @pytest.mark.asyncio
+    async def test_get_job_route(self, queue):
+        """Test polling a job, and 404 for another user's job"""
+        from fastapi import HTTPException
+        from app.api.v1 import jobs
+        queue.register("echo", AsyncMock(return_value={}))
+        job = await queue.submit("echo", 1, {})
+
+        with patch.object(jobs, "job_queue", queue):
+            assert (await jobs.get_job(job["job_id"], current_user=MagicMock(id=1)))["status"] == "queued"
+            with pytest.raises(HTTPException) as error:
+                await jobs.get_job(job["job_id"], current_user=MagicMock(id=2))
+
+        assert error.value.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_job_events_route(self, queue):
+        """Test the events stream reports progress and ends with the result"""
+        from app.api.v1 import jobs
+        queue.register("echo", AsyncMock(return_value={"article_id": 3}))
+        job = await queue.submit("echo", 1, {})
+
+        with patch.object(jobs, "job_queue", queue):
+            response = await jobs.get_job_events(job["job_id"], current_user=MagicMock(id=1))
+            await queue.start()
+            try:
+                body = "".join([chunk async for chunk in response.body_iterator])
+            finally:
+                await queue.stop()
+
+        events = [line.split(": ", 1)[1] for line in body.splitlines() if line.startswith("event: ")]
+        assert events[0] == "status"
+        assert events[-1] == "done"
+        assert '"article_id": 3' in body
+        assert response.media_type == "text/event-stream"
+
+    @pytest.mark.asyncio
+    async def test_pdf_upload_removed_when_submit_fails(self, queue, tmp_path):
+        """Test the uploaded PDF is removed when no job could be queued for it"""
+        from app.api.v1 import articles
+        upload_path = tmp_path / "upload.pdf"
+        upload_path.write_bytes(b"%PDF-1.4")
+
+        with patch.object(articles, "job_queue", queue), \
+                patch.object(articles, "_save_pdf_upload", AsyncMock(return_value=str(upload_path))):
+            with pytest.raises(ValueError):  # "extract_pdf" is not registered on this queue
+                await articles.submit_pdf_extraction(MagicMock(filename="notes.pdf"), current_user=MagicMock(id=1))
+
+        assert not upload_path.exists()
+
+    @pytest.mark.asyncio
+    async def test_pdf_upload_kept_until_job_finishes(self, queue, tmp_path):
+        """Test the uploaded PDF is read by the job, then removed once the job has finished"""
+        from app.api.v1 import articles
+        upload_path = tmp_path / "upload.pdf"
+        upload_path.write_bytes(b"%PDF-1.4")
+        seen = []
+
+        async def extraction(temp_path, filename, user_id, db):
+            seen.append(os.path.exists(temp_path))
+            return {"status": "success"}
+
+        queue.register("extract_pdf", articles._pdf_job, cleanup=articles._pdf_job_cleanup)
+        with patch.object(articles, "job_queue", queue), \
+                patch.object(articles, "_save_pdf_upload", AsyncMock(return_value=str(upload_path))), \
+                patch.object(articles, "run_pdf_extraction", extraction):
+            accepted = await articles.submit_pdf_extraction(MagicMock(filename="notes.pdf"), current_user=MagicMock(id=1))
+            await queue.start()
+            try:
+                done = await finished(queue, accepted["job_id"])
+            finally:
+                await queue.stop()
+
+        assert done["status"] == "succeeded"
+        assert seen == [True]
+        assert not upload_path.exists()
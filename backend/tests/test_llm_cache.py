@@ -0,0 +1,146 @@
+# LLM result cache tests: keys, TTL, LRU, summary and translation reuse
+import pytest
+import sys
+import os
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.models.llm_cache_entry import LLMCacheEntry
+from app.services.llm_cache import LLMResultCache, make_cache_key
+
+
+class TestLLMResultCache:
+    """Test the two-tier LLM result cache"""
+
+    def test_set_and_get(self):
+        cache = LLMResultCache(session_factory=None)
+        cache.set("summary", "k", "A summary")
+        assert cache.get("summary", "k") == "A summary"
+        assert cache.get("translation", "k") is None
+
+    def test_entries_expire(self):
+        cache = LLMResultCache(session_factory=None, ttl_seconds=60)
+        cache.set("summary", "k", "A summary")
+        later = datetime.utcnow() + timedelta(seconds=120)
+        with patch('app.services.llm_cache.datetime') as mock_datetime:
+            mock_datetime.utcnow.return_value = later
+            assert cache.get("summary", "k") is None
+
+    def test_persistent_tier(self, sqlite_session_factory):
+        """Test results survive a restart"""
+        LLMResultCache(session_factory=sqlite_session_factory).set("summary", "k", "A summary")
+        assert LLMResultCache(session_factory=sqlite_session_factory).get("summary", "k") == "A summary"
+
+    def test_rows_pruned_least_recently_used(self, sqlite_session_factory):
+        cache = LLMResultCache(session_factory=sqlite_session_factory, max_rows=2)
+        with patch('app.services.llm_cache.PRUNE_EVERY', 1):
+            for key in ["a", "b", "c"]:
+                cache.set("summary", key, key.upper())
+        with sqlite_session_factory() as db:
+            assert sorted(row.key for row in db.query(LLMCacheEntry)) == ["b", "c"]
+
+    def test_purge_namespace(self, sqlite_session_factory):
+        cache = LLMResultCache(session_factory=sqlite_session_factory)
+        cache.set("summary", "a", "A")
+        cache.set("translation", "b", "B")
+        assert cache.purge("summary") == 1
+        assert cache.get("summary", "a") is None
+        assert cache.get("translation", "b") == "B"
+
+    def test_stats_per_namespace(self):
+        cache = LLMResultCache(session_factory=None)
+        cache.set("summary", "k", "A summary")
+        cache.get("summary", "k")
+        cache.get("summary", "other")
+        assert cache.stats()["namespaces"]["summary"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+    def test_key_depends_on_every_part(self):
+        assert make_cache_key("hash", "short", "model", 1) != make_cache_key("hash", "short", "model", 2)
+        assert make_cache_key("hash", "short", "model", 1) == make_cache_key("hash", "short", "model", 1)
+
+
+class TestSummaryCaching:
+    """Test generate_summary reuses identical requests"""
+
+    @pytest.fixture
+    def service(self):
+        from app.services.llm_service import AsyncLLMService
+        response = MagicMock()
+        response.choices = [MagicMock()]
+        response.choices[0].message.content = "• Point 1"
+        groq = MagicMock()
+        groq.chat.completions.create = AsyncMock(return_value=response)
+        return AsyncLLMService(groq_client=groq, gemini_client=MagicMock())
+
+    @pytest.mark.asyncio
+    async def test_identical_request_costs_no_tokens(self, service):
+        assert await service.generate_summary("Some article text", "short") == "• Point 1"
+        assert await service.generate_summary("Some article text", "short") == "• Point 1"
+        assert service.client.chat.completions.create.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_type_text_and_model_are_part_of_the_key(self, service):
+        await service.generate_summary("Some article text", "short")
+        await service.generate_summary("Some article text", "medium")
+        await service.generate_summary("Other text", "short")
+        service.model = "llama-3.3-70b-versatile"
+        await service.generate_summary("Some article text", "short")
+        assert service.client.chat.completions.create.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_prompt_version_invalidates(self, service):
+        await service.generate_summary("Some article text", "short")
+        with patch('app.services.llm_service.SUMMARY_PROMPT_VERSION', 2):
+            assert not service.is_summary_cached("Some article text", "short")
+            await service.generate_summary("Some article text", "short")
+        assert service.client.chat.completions.create.await_count == 2
+
+
+class TestTranslationCaching:
+    """Test get_translation reuses identical requests across routes"""
+
+    @pytest.fixture
+    def gemini(self):
+        client = MagicMock()
+        client.models.generate_content = AsyncMock(return_value=MagicMock(text="Bonjour le monde"))
+        return client
+
+    def service(self, gemini):
+        from app.services.llm_service import AsyncLLMService
+        return AsyncLLMService(groq_client=MagicMock(), gemini_client=gemini)
+
+    @pytest.mark.asyncio
+    async def test_shared_between_service_instances(self, gemini):
+        """Test a fresh instance hits what another one cached"""
+        assert await self.service(gemini).get_translation("Hello world", "French") == "Bonjour le monde"
+        assert await self.service(gemini).get_translation("Hello world", " french ") == "Bonjour le monde"
+        assert gemini.models.generate_content.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_target_language_and_model_are_part_of_the_key(self, gemini):
+        service = self.service(gemini)
+        await service.get_translation("Hello world", "French")
+        await service.get_translation("Hello world", "Spanish")
+        service.gemini_model_name = "gemini-2.5-flash"
+        await service.get_translation("Hello world", "French")
+        assert gemini.models.generate_content.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_hit_rate_and_admin_purge(self, gemini, isolated_llm_cache, isolated_translation_memory):
+        from app.api.v1.admin import purge_translation_cache
+        service = self.service(gemini)
+        await service.get_translation("Hello world", "French")
+        await service.get_translation("Hello world", "French")
+        assert isolated_llm_cache.stats()["namespaces"]["translation"]["hit_rate"] == 0.5
+        isolated_translation_memory.store("french", "gemini", [("Hello world.", "Bonjour le monde.")])
+
+        with patch('app.api.v1.admin.llm_cache', isolated_llm_cache), \
+                patch('app.api.v1.admin.translation_memory', isolated_translation_memory):
+            result = await purge_translation_cache(current_admin=MagicMock())
+
+        assert result == {"purged": 1, "translation_memory_purged": 1}
+        assert isolated_translation_memory.lookup("french", "gemini", ["Hello world."]) == {}
+        await service.get_translation("Hello world", "French")
+        assert gemini.models.generate_content.await_count == 2
@@ -1,6 +1,9 @@
 # LLM Service tests: summarization and translation
+import asyncio
+import json
+import time
 import pytest
-from unittest.mock import Mock, MagicMock, patch
+from unittest.mock import Mock, MagicMock, AsyncMock, patch
 import sys
 import os
 
@@ -217,6 +220,636 @@ class TestSystemPrompts:
         """Test system prompt instructs no filler"""
         system_prompt = "Do not add any conversational filler"
         assert "filler" in system_prompt.lower()
+
+
+class TestAsyncLLMService:
+    """Test the awaitable LLM service with shared provider clients"""
+
+    @staticmethod
+    def groq_client(delay=0.0, content="Summary", combined="not json"):
+        async def create(**kwargs):
+            if "response_format" in kwargs:
+                response = MagicMock()
+                response.choices = [MagicMock()]
+                response.choices[0].message.content = combined
+                return response
+            await asyncio.sleep(delay)
+            response = MagicMock()
+            response.choices = [MagicMock()]
+            response.choices[0].message.content = f"{content} {kwargs['messages'][1]['content'].strip()[-6:]}"
+            return response
+
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(side_effect=create)
+        return client
+
+    @pytest.mark.asyncio
+    async def test_generate_summary(self):
+        """Test summaries are awaited from the async Groq client"""
+        from app.services.llm_service import AsyncLLMService
+        groq = self.groq_client()
+        service = AsyncLLMService(groq_client=groq, gemini_client=MagicMock())
+
+        result = await service.generate_summary("Test content", "short")
+
+        assert result.startswith("Summary")
+        assert groq.chat.completions.create.await_args.kwargs["model"] == "llama-3.1-8b-instant"
+
+    @pytest.mark.asyncio
+    async def test_calls_run_concurrently(self):
+        """Test many slow LLM calls are in flight at once on one event loop"""
+        from app.services.llm_service import AsyncLLMService
+        service = AsyncLLMService(groq_client=self.groq_client(delay=0.2), gemini_client=MagicMock())
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(
+            service.generate_summary(f"Article {i:03d}", "short") for i in range(10)
+        ))
+
+        assert len(set(results)) == 10
+        assert time.perf_counter() - start < 1.0
+
+    @pytest.mark.asyncio
+    async def test_summaries_generated_concurrently(self):
+        """Test fallback short and medium summaries are two concurrent Groq calls, not sequential ones"""
+        from app.services.llm_service import AsyncLLMService
+        service = AsyncLLMService(groq_client=self.groq_client(delay=0.3), gemini_client=MagicMock())
+
+        start = time.perf_counter()
+        summaries = await service.generate_summaries("Test content", ("short", "medium"), timeout=5)
+
+        assert set(summaries) == {"short", "medium"}
+        assert time.perf_counter() - start < 0.5
+
+    @pytest.mark.asyncio
+    async def test_failed_summary_returns_partial_result(self):
+        """Test one failing summary does not lose the other"""
+        from app.services.llm_service import AsyncLLMService
+        groq = self.groq_client()
+        succeed = groq.chat.completions.create.side_effect
+
+        async def create(**kwargs):
+            if "bullet points" in kwargs["messages"][1]["content"] and "response_format" not in kwargs:
+                raise Exception("API Error")
+            return await succeed(**kwargs)
+
+        groq.chat.completions.create.side_effect = create
+        service = AsyncLLMService(groq_client=groq, gemini_client=MagicMock())
+
+        summaries = await service.generate_summaries("Test content", ("short", "medium"), timeout=5)
+
+        assert list(summaries) == ["medium"]
+
+    @pytest.mark.asyncio
+    async def test_deadline_shared_by_summaries(self):
+        """Test summaries still running at the deadline are cancelled and left out"""
+        from app.services.llm_service import AsyncLLMService
+        service = AsyncLLMService(groq_client=self.groq_client(), gemini_client=MagicMock())
+
+        async def generate_summary(text, summary_type):
+            if summary_type == "medium":
+                await asyncio.sleep(5)
+            return "fast"
+
+        service.generate_summary = generate_summary
+
+        start = time.perf_counter()
+        summaries = await service.generate_summaries("Test content", ("short", "medium"), timeout=0.2)
+
+        assert summaries == {"short": "fast"}
+        assert time.perf_counter() - start < 1
+
+    @pytest.mark.asyncio
+    async def test_get_translation(self):
+        """Test translations use the async Gemini client"""
+        from app.services.llm_service import AsyncLLMService
+        gemini = MagicMock()
+        gemini.models.generate_content = AsyncMock(return_value=MagicMock(text="Bonjour le monde"))
+        service = AsyncLLMService(groq_client=MagicMock(), gemini_client=gemini)
+
+        assert await service.get_translation("Hello world", "French") == "Bonjour le monde"
+        assert await service.get_translation("Hello world", "French") == "Bonjour le monde"
+        gemini.models.generate_content.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @patch('app.services.llm_service.genai')
+    @patch('app.services.llm_service.AsyncGroq')
+    async def test_clients_built_once(self, mock_async_groq, mock_genai):
+        """Test the shared service reuses its provider clients until shutdown"""
+        from app.services.llm_service import get_async_llm_service, close_async_llm_service
+        mock_async_groq.return_value.close = AsyncMock()
+
+        gemini = mock_genai.Client.return_value.aio
+        gemini.aclose = AsyncMock()
+
+        with patch('app.services.llm_service._async_llm_service', None):
+            first = get_async_llm_service()
+            assert get_async_llm_service() is first
+            mock_genai.Client.assert_not_called()
+            assert first.gemini_client is first.gemini_client is gemini
+            await close_async_llm_service()
+
+        mock_async_groq.assert_called_once()
+        mock_genai.Client.assert_called_once()
+        mock_async_groq.return_value.close.assert_awaited_once()
+        gemini.aclose.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @patch('app.services.llm_service.genai')
+    @patch('app.services.llm_service.settings')
+    async def test_gemini_client_built_on_first_translation(self, mock_settings, mock_genai):
+        """Test the service starts without a Google key and uses GEMINI_API_KEY when it is the one set"""
+        from app.services.llm_service import AsyncLLMService
+        mock_settings.GOOGLE_API_KEY = ""
+        mock_settings.GEMINI_API_KEY = "gemini-key"
+        service = AsyncLLMService(groq_client=MagicMock(), gemini_client=None)
+
+        mock_genai.Client.assert_not_called()
+        assert service.gemini_client is mock_genai.Client.return_value.aio
+        mock_genai.Client.assert_called_once_with(api_key="gemini-key")
+
+    @patch('app.services.llm_service.genai')
+    @patch('app.services.llm_service.Groq')
+    def test_sync_service_reuses_gemini_client(self, mock_groq, mock_genai):
+        """Test LLMService no longer builds a Gemini client per call"""
+        from app.services.llm_service import LLMService
+        mock_genai.Client.return_value.models.generate_content.return_value.text = "Hola"
+        service = LLMService()
+
+        service.get_translation("Hello", "Spanish")
+        service.get_translation("Bye", "Spanish")
+
+        mock_genai.Client.assert_called_once()
+
+
+
+class TestCombinedSummaries:
+    """Test short and medium summaries generated by a single JSON call"""
+
+    COMBINED = '{"short": "- Key fact", "medium": "Two paragraphs."}'
+
+    @staticmethod
+    def completion(content):
+        response = MagicMock()
+        response.choices = [MagicMock()]
+        response.choices[0].message.content = content
+        return response
+
+    def test_parse_combined_summaries(self):
+        """Test every requested summary is extracted from the JSON object"""
+        from app.services.llm_service import parse_combined_summaries
+
+        summaries = parse_combined_summaries(self.COMBINED, ("short", "medium"))
+
+        assert summaries == {"short": "- Key fact", "medium": "Two paragraphs."}
+
+    def test_parse_bullet_list(self):
+        """Test a short summary returned as an array becomes bullet points"""
+        from app.services.llm_service import parse_combined_summaries
+
+        summaries = parse_combined_summaries('{"short": ["One", "Two"]}', ("short",))
+
+        assert summaries["short"] == "- One\n- Two"
+
+    @pytest.mark.parametrize("output", ["not json", "[]", '{"short": "Fact"}', '{"short": "Fact", "medium": ""}'])
+    def test_parse_rejects_incomplete_answers(self, output):
+        """Test invalid or incomplete answers raise ValueError"""
+        from app.services.llm_service import parse_combined_summaries
+
+        with pytest.raises(ValueError):
+            parse_combined_summaries(output, ("short", "medium"))
+
+    def test_combined_prompt_sends_text_once(self):
+        """Test the combined prompt carries both instructions and a single copy of the text"""
+        from app.services.llm_service import combined_summary_messages
+
+        prompt = combined_summary_messages("Source article", ("short", "medium"))[1]["content"]
+
+        assert prompt.count("Source article") == 1
+        assert "bullet points" in prompt and "2-3 paragraphs" in prompt
+        assert "JSON" in prompt
+
+    @pytest.mark.asyncio
+    async def test_fallback_on_invalid_json(self):
+        """Test an unparsable answer falls back to one call per summary"""
+        from app.services.llm_service import AsyncLLMService
+
+        async def create(**kwargs):
+            if "response_format" in kwargs:
+                return self.completion("Sure! Here are the summaries")
+            return self.completion("Short summary" if "bullet points" in kwargs["messages"][1]["content"]
+                                   else "Medium summary")
+
+        groq = MagicMock()
+        groq.chat.completions.create = AsyncMock(side_effect=create)
+        service = AsyncLLMService(groq_client=groq, gemini_client=MagicMock())
+
+        summaries = await service.generate_summaries("Test content", ("short", "medium"), timeout=5)
+
+        assert summaries == {"short": "Short summary", "medium": "Medium summary"}
+        assert groq.chat.completions.create.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_combined_results_fill_per_type_cache(self):
+        """Test summaries from the combined call answer later single-summary requests"""
+        from app.services.llm_service import AsyncLLMService
+        groq = MagicMock()
+        groq.chat.completions.create = AsyncMock(return_value=self.completion(self.COMBINED))
+        service = AsyncLLMService(groq_client=groq, gemini_client=MagicMock())
+
+        await service.generate_summaries("Test content", ("short", "medium"), timeout=5)
+
+        assert await service.generate_summary("Test content", "short") == "- Key fact"
+        assert await service.generate_summary("Test content", "medium") == "Two paragraphs."
+        groq.chat.completions.create.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_only_missing_summary_requested(self):
+        """Test a cached summary is reused and the other gets a plain call"""
+        from app.services.llm_service import AsyncLLMService
+        groq = MagicMock()
+        groq.chat.completions.create = AsyncMock(return_value=self.completion("Short summary"))
+        service = AsyncLLMService(groq_client=groq, gemini_client=MagicMock())
+        await service.generate_summary("Test content", "short")
+        groq.chat.completions.create.return_value = self.completion("Medium summary")
+
+        summaries = await service.generate_summaries("Test content", ("short", "medium"), timeout=5)
+
+        assert summaries == {"short": "Short summary", "medium": "Medium summary"}
+        assert groq.chat.completions.create.await_count == 2
+        assert "response_format" not in groq.chat.completions.create.await_args.kwargs
+
+    @pytest.mark.asyncio
+    async def test_async_single_call(self):
+        """Test AsyncLLMService makes one JSON-mode call for both summaries"""
+        from app.services.llm_service import AsyncLLMService
+        groq = MagicMock()
+        groq.chat.completions.create = AsyncMock(return_value=self.completion(self.COMBINED))
+        service = AsyncLLMService(groq_client=groq, gemini_client=MagicMock())
+
+        summaries = await service.generate_summaries("Test content", ("short", "medium"), timeout=5)
+
+        assert summaries == {"short": "- Key fact", "medium": "Two paragraphs."}
+        groq.chat.completions.create.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_async_combined_call_respects_deadline(self):
+        """Test a combined call still running at the deadline is cancelled"""
+        from app.services.llm_service import AsyncLLMService
+
+        async def create(**kwargs):
+            await asyncio.sleep(5)
+
+        groq = MagicMock()
+        groq.chat.completions.create = AsyncMock(side_effect=create)
+        service = AsyncLLMService(groq_client=groq, gemini_client=MagicMock())
+
+        start = time.perf_counter()
+        summaries = await service.generate_summaries("Test content", ("short", "medium"), timeout=0.2)
+
+        assert summaries == {}
+        assert time.perf_counter() - start < 1
+
+
+class TestMapReduceSummaries:
+    """Test map-reduce summarization of texts longer than one chunk"""
+
+    @staticmethod
+    def document(parts=5):
+        """About 4000 characters per part, each part tagged with its number"""
+        return " ".join(f"Part {i} fact. " * 300 for i in range(parts))
+
+    @staticmethod
+    def groq_client(fail_chunk=None):
+        state = {"in_flight": 0, "max_in_flight": 0, "chunks": [], "reduced": []}
+
+        async def create(**kwargs):
+            prompt = kwargs["messages"][1]["content"]
+            response = MagicMock()
+            response.choices = [MagicMock()]
+            if "response_format" in kwargs:
+                state["reduced"].append(prompt)
+                response.choices[0].message.content = '{"short": "Short", "medium": "Medium"}'
+                return response
+            state["in_flight"] += 1
+            state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+            await asyncio.sleep(0.01)
+            state["in_flight"] -= 1
+            first_part = prompt.split("Part ")[1].split(" ")[0]
+            last_part = prompt.rsplit("Part ", 1)[1].split(" ")[0]
+            state["chunks"].append(first_part)
+            if first_part == fail_chunk:
+                raise Exception("API Error")
+            response.choices[0].message.content = f"Notes on parts {first_part} to {last_part}."
+            return response
+
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(side_effect=create)
+        return client, state
+
+    @pytest.mark.asyncio
+    async def test_short_text_not_chunked(self):
+        """Test a text that fits one chunk is summarized directly"""
+        from app.services.llm_service import AsyncLLMService
+        groq, state = self.groq_client()
+        service = AsyncLLMService(groq_client=groq, gemini_client=MagicMock())
+
+        summaries = await service.summarize_document("Part 0 fact. " * 100)
+
+        assert summaries == {"short": "Short", "medium": "Medium"}
+        assert state["chunks"] == []
+        groq.chat.completions.create.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_every_chunk_reaches_the_reduce_step(self):
+        """Test the whole text is covered and the notes are reduced in order"""
+        from app.services.llm_service import AsyncLLMService
+        groq, state = self.groq_client()
+        service = AsyncLLMService(groq_client=groq, gemini_client=MagicMock())
+
+        summaries = await service.summarize_document(self.document(), timeout=5)
+
+        assert summaries == {"short": "Short", "medium": "Medium"}
+        assert len(state["chunks"]) > 1
+        reduced = state["reduced"][0]
+        assert reduced.index("Notes on parts 0 to") < reduced.index("to 4.")
+
+    @pytest.mark.asyncio
+    async def test_map_concurrency_limited(self):
+        """Test chunks are summarized in parallel, within the configured limit"""
+        from app.core.config import settings
+        from app.services.llm_service import AsyncLLMService
+        groq, state = self.groq_client()
+        service = AsyncLLMService(groq_client=groq, gemini_client=MagicMock())
+
+        await service.summarize_document(self.document(parts=12))
+
+        assert 1 < state["max_in_flight"] <= settings.SUMMARY_MAP_CONCURRENCY
+
+    @pytest.mark.asyncio
+    async def test_chunk_summaries_cached(self):
+        """Test a repeated document costs no LLM call and is reported as summarized"""
+        from app.services.llm_service import AsyncLLMService
+        groq, state = self.groq_client()
+        service = AsyncLLMService(groq_client=groq, gemini_client=MagicMock())
+        text = self.document()
+
+        assert not service.is_document_summarized(text, "short")
+        await service.summarize_document(text)
+        calls = groq.chat.completions.create.await_count
+        summaries = await service.summarize_document(text)
+
+        assert summaries == {"short": "Short", "medium": "Medium"}
+        assert groq.chat.completions.create.await_count == calls
+        assert service.is_document_summarized(text, "short")
+
+    @pytest.mark.asyncio
+    async def test_failed_chunk_skipped(self):
+        """Test one failing chunk does not lose the summary of the others"""
+        from app.services.llm_service import AsyncLLMService
+        groq, state = self.groq_client(fail_chunk="0")
+        service = AsyncLLMService(groq_client=groq, gemini_client=MagicMock())
+
+        summaries = await service.summarize_document(self.document())
+
+        assert summaries == {"short": "Short", "medium": "Medium"}
+        assert "Notes on parts 0 to" not in state["reduced"][0]
+        assert "to 4." in state["reduced"][0]
+
+    @pytest.mark.asyncio
+    async def test_deadline_covers_map_step(self):
+        """Test a map step still running at the deadline returns no summary"""
+        from app.services.llm_service import AsyncLLMService
+
+        async def create(**kwargs):
+            await asyncio.sleep(5)
+
+        groq = MagicMock()
+        groq.chat.completions.create = AsyncMock(side_effect=create)
+        service = AsyncLLMService(groq_client=groq, gemini_client=MagicMock())
+
+        start = time.perf_counter()
+        summaries = await service.summarize_document(self.document(), timeout=0.2)
+
+        assert summaries == {}
+        assert time.perf_counter() - start < 1
+
+
+class TestTokenBudget:
+    """Test Groq requests are packed to the token limit without overflowing"""
+
+    @staticmethod
+    def request_tokens(kwargs):
+        from app.services.llm_service import MESSAGE_OVERHEAD_TOKENS
+        from app.services.preprocessor import estimate_tokens
+        prompt = sum(estimate_tokens(m["content"]) + MESSAGE_OVERHEAD_TOKENS for m in kwargs["messages"])
+        return prompt + kwargs["max_tokens"]
+
+    @staticmethod
+    def service(content):
+        from app.services.llm_service import AsyncLLMService
+        response = MagicMock()
+        response.choices = [MagicMock()]
+        response.choices[0].message.content = content
+        groq = MagicMock()
+        groq.chat.completions.create = AsyncMock(return_value=response)
+        return AsyncLLMService(groq_client=groq, gemini_client=MagicMock())
+
+    @pytest.mark.asyncio
+    async def test_long_input_fitted_to_one_request(self):
+        """Test an oversized text is cut to fill, not exceed, one request"""
+        from app.core.config import settings
+        service = self.service('{"short": "Short", "medium": "Medium"}')
+
+        await service.generate_summaries("Python is a programming language. " * 2000, ("short", "medium"))
+
+        tokens = self.request_tokens(service.client.chat.completions.create.await_args.kwargs)
+        assert 0.8 * settings.GROQ_MAX_REQUEST_TOKENS < tokens <= settings.GROQ_MAX_REQUEST_TOKENS
+
+    @pytest.mark.asyncio
+    async def test_short_input_sent_unchanged(self):
+        """Test a text within the budget is sent and cached as is"""
+        service = self.service("Summary")
+
+        await service.generate_summary("  Python is a language.  ", "short")
+
+        assert "  Python is a language.  " in service.client.chat.completions.create.await_args.kwargs["messages"][1]["content"]
+        assert service.is_summary_cached("  Python is a language.  ", "short")
+
+    @pytest.mark.asyncio
+    async def test_map_reduce_requests_within_limit(self):
+        """Test every chunk and reduce request of a long text fits the limit"""
+        from app.core.config import settings
+        from app.services.llm_service import AsyncLLMService
+        requests = []
+
+        async def create(**kwargs):
+            requests.append(kwargs)
+            response = MagicMock()
+            response.choices = [MagicMock()]
+            response.choices[0].message.content = (
+                '{"short": "Short", "medium": "Medium"}' if "response_format" in kwargs else "Notes."
+            )
+            return response
+
+        groq = MagicMock()
+        groq.chat.completions.create = AsyncMock(side_effect=create)
+        service = AsyncLLMService(groq_client=groq, gemini_client=MagicMock())
+
+        await service.summarize_document("Python is a programming language. " * 5000)
+
+        assert len(requests) > 2
+        assert all(self.request_tokens(kwargs) <= settings.GROQ_MAX_REQUEST_TOKENS for kwargs in requests)
+
+
+class TestStreamSummary:
+    """Test summaries streamed from Groq's streaming mode"""
+
+    @staticmethod
+    def groq_stream(*deltas):
+        stream = MagicMock()
+        stream.close = AsyncMock()
+
+        async def iterate():
+            for delta in deltas:
+                chunk = MagicMock()
+                chunk.choices = [MagicMock()]
+                chunk.choices[0].delta.content = delta
+                yield chunk
+
+        stream.__aiter__ = lambda self: iterate()
+        groq = MagicMock()
+        groq.chat.completions.create = AsyncMock(return_value=stream)
+        return groq, stream
+
+    @pytest.mark.asyncio
+    async def test_tokens_forwarded_as_generated(self):
+        """Test deltas are yielded one by one from a streaming request"""
+        from app.services.llm_service import AsyncLLMService
+        groq, stream = self.groq_stream("- Key", None, " fact")
+        service = AsyncLLMService(groq_client=groq, gemini_client=MagicMock())
+
+        deltas = [delta async for delta in service.stream_summary("Test content", "short")]
+
+        assert deltas == ["- Key", " fact"]
+        assert groq.chat.completions.create.await_args.kwargs["stream"] is True
+        stream.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_completed_stream_cached(self):
+        """Test the full text is cached for both streaming and regular requests"""
+        from app.services.llm_service import AsyncLLMService
+        groq, _ = self.groq_stream("- Key", " fact")
+        service = AsyncLLMService(groq_client=groq, gemini_client=MagicMock())
+
+        [delta async for delta in service.stream_summary("Test content", "short")]
+        replay = [delta async for delta in service.stream_summary("Test content", "short")]
+
+        assert replay == ["- Key fact"]
+        assert await service.generate_summary("Test content", "short") == "- Key fact"
+        groq.chat.completions.create.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_abandoned_stream_not_cached(self):
+        """Test a stream closed by the consumer stops generation and caches nothing"""
+        from app.services.llm_service import AsyncLLMService
+        groq, stream = self.groq_stream("- Key", " fact")
+        service = AsyncLLMService(groq_client=groq, gemini_client=MagicMock())
+
+        deltas = service.stream_summary("Test content", "short")
+        assert await deltas.__anext__() == "- Key"
+        await deltas.aclose()
+
+        stream.close.assert_awaited_once()
+        assert not service.is_summary_cached("Test content", "short")
+
+
+class TestStreamTranslation:
+    """Test translations streamed from Gemini's streaming generation"""
+
+    @staticmethod
+    def gemini_stream(*texts):
+        state = {"generated": [], "closed": False}
+
+        async def generate():
+            try:
+                for text in texts:
+                    state["generated"].append(text)
+                    yield MagicMock(text=text)
+            finally:
+                state["closed"] = True
+
+        gemini = MagicMock()
+        gemini.models.generate_content_stream = AsyncMock(side_effect=lambda **kwargs: generate())
+        return gemini, state
+
+    @pytest.mark.asyncio
+    async def test_chunks_forwarded_and_cached(self):
+        """Test chunks are yielded as generated and the full text cached"""
+        from app.services.llm_service import AsyncLLMService
+        gemini, state = self.gemini_stream("Bonjour", " le monde")
+        service = AsyncLLMService(groq_client=MagicMock(), gemini_client=gemini)
+
+        chunks = [text async for text in service.stream_translation("Hello world", "French")]
+
+        assert chunks == ["Bonjour", " le monde"]
+        assert state["closed"]
+        assert await service.get_translation("Hello world", "French") == "Bonjour le monde"
+        gemini.models.generate_content_stream.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_closing_stops_generation(self):
+        """Test closing the iterator closes the Gemini stream without caching"""
+        from app.services.llm_service import AsyncLLMService
+        gemini, state = self.gemini_stream("Bonjour", " le", " monde")
+        service = AsyncLLMService(groq_client=MagicMock(), gemini_client=gemini)
+
+        chunks = service.stream_translation("Hello world", "French")
+        assert await chunks.__anext__() == "Bonjour"
+        await chunks.aclose()
+
+        assert state["generated"] == ["Bonjour"]
+        assert state["closed"]
+        assert [text async for text in service.stream_translation("Hello world", "French")] != ["Bonjour"]
+
+    @pytest.mark.asyncio
+    @patch('app.api.v1.content.get_async_llm_service')
+    async def test_route_stops_on_disconnect(self, mock_llm):
+        """Test the NDJSON route stops pulling chunks once the client is gone"""
+        from app.api.v1.content import TranslationRequest, translate_stream
+        from app.services.llm_service import AsyncLLMService
+        gemini, state = self.gemini_stream("Bonjour", " le", " monde")
+        mock_llm.return_value = AsyncLLMService(groq_client=MagicMock(), gemini_client=gemini)
+        http_request = MagicMock()
+        http_request.is_disconnected = AsyncMock(side_effect=[False, True])
+
+        response = await translate_stream(
+            TranslationRequest(text="Hello world", target_language="French"), http_request, current_user=MagicMock()
+        )
+        lines = [json.loads(line) async for line in response.body_iterator]
+
+        assert lines == [{"type": "chunk", "text": "Bonjour"}]
+        assert state["generated"] == ["Bonjour", " le"]
+        assert state["closed"]
+
+    @pytest.mark.asyncio
+    @patch('app.api.v1.content.get_async_llm_service')
+    async def test_route_ends_with_done(self, mock_llm):
+        """Test a complete translation ends with a done line"""
+        from app.api.v1.content import TranslationRequest, translate_stream
+        from app.services.llm_service import AsyncLLMService
+        gemini, _ = self.gemini_stream("Hola")
+        mock_llm.return_value = AsyncLLMService(groq_client=MagicMock(), gemini_client=gemini)
+        http_request = MagicMock()
+        http_request.is_disconnected = AsyncMock(return_value=False)
+
+        response = await translate_stream(
+            TranslationRequest(text="Hello", target_language="Spanish"), http_request, current_user=MagicMock()
+        )
+        lines = [json.loads(line) async for line in response.body_iterator]
+
+        assert lines == [{"type": "chunk", "text": "Hola"}, {"type": "done", "target_language": "Spanish"}]
+
 # Commit 5: test: add mock LLM client fixtures
 # Commit 20: test: add error handling tests for extraction
 # Commit 35: test: add quiz attempt model tests
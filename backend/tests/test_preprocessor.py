@@ -5,7 +5,15 @@ import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from app.services.preprocessor import clean_and_segment_text, clean_text, split_into_chunks
+from app.services.preprocessor import (
+    clean_and_segment_text,
+    clean_text,
+    estimate_tokens,
+    split_into_chunks,
+    split_into_token_chunks,
+    split_sentences,
+    truncate_to_tokens
+)
 
 
 class TestCleanText:
@@ -164,6 +172,13 @@ class TestSplitIntoChunks:
         chunks = split_into_chunks(text, chunk_size=100)
         assert len(chunks) == 1
 
+    def test_overlap_larger_than_chunk_terminates(self):
+        """Test an overlap larger than the chunk size still moves forward"""
+        text = "word " * 500
+        chunks = split_into_chunks(text, chunk_size=100, overlap=200)
+        assert 1 < len(chunks) <= len(text) // 100 + 1
+        assert chunks[-1].endswith("word")
+
     def test_preserves_all_content(self):
         """Test that all content is preserved across chunks"""
         text = "unique_word " * 100
@@ -197,6 +212,101 @@ class TestChunkOverlap:
         assert len(chunks) > 4
 
 
+class TestSplitSentences:
+    """Test split_sentences function"""
+
+    def test_splits_on_punctuation_and_newlines(self):
+        """Test sentences and headings become separate segments"""
+        pairs = split_sentences("Python est un langage. Il date de 1991 !\n\nHistoire\nGuido l'a créé.")
+        assert [sentence for sentence, _ in pairs] == [
+            "Python est un langage.", "Il date de 1991 !", "Histoire", "Guido l'a créé."
+        ]
+
+    def test_round_trip(self):
+        """Test joining segments gives back the text"""
+        text = "One.  Two?\n\nThree\nFour…  Five"
+        assert "".join(sentence + separator for sentence, separator in split_sentences(text)) == text
+
+    def test_empty_text(self):
+        """Test empty input has no sentences"""
+        assert split_sentences("   ") == []
+
+
+class TestEstimateTokens:
+    """Test estimate_tokens function"""
+
+    def test_empty_text(self):
+        """Test empty text has no tokens"""
+        assert estimate_tokens("") == 0
+
+    def test_words_and_punctuation(self):
+        """Test short words count one token each, punctuation one more"""
+        assert estimate_tokens("The cat sat.") == 4
+
+    def test_long_and_accented_words_cost_more(self):
+        """Test long or non-ASCII words are split in several tokens"""
+        assert estimate_tokens("internationalization") == 5
+        assert estimate_tokens("éléphant") > estimate_tokens("elephant")
+
+    def test_cjk_and_numbers(self):
+        """Test each ideogram is a token and numbers cost one token per 3 digits"""
+        assert estimate_tokens("日本語") == 3
+        assert estimate_tokens("1991") == 2
+
+    def test_close_to_four_characters_per_token(self):
+        """Test English prose lands near the usual 4 characters per token"""
+        text = "Python is a high-level, general-purpose programming language. " * 20
+        assert len(text) / 5 < estimate_tokens(text) < len(text) / 3
+
+
+class TestSplitIntoTokenChunks:
+    """Test split_into_token_chunks function"""
+
+    def test_text_within_budget_unchanged(self):
+        """Test a text that fits is returned as is"""
+        text = "  Short text.  "
+        assert split_into_token_chunks(text, max_tokens=100) == [text]
+
+    def test_chunks_respect_budget_and_sentences(self):
+        """Test every chunk fits the budget and ends on a sentence"""
+        text = "This sentence has exactly nine tokens in it. " * 100
+        chunks = split_into_token_chunks(text, max_tokens=50)
+        assert len(chunks) > 1
+        assert all(estimate_tokens(chunk) <= 50 for chunk in chunks)
+        assert all(chunk.endswith(".") for chunk in chunks)
+
+    def test_preserves_all_sentences(self):
+        """Test chunks without overlap give back every sentence once"""
+        text = " ".join(f"Sentence number {i}." for i in range(200))
+        chunks = split_into_token_chunks(text, max_tokens=40)
+        assert " ".join(chunks) == text
+
+    def test_overlap_repeats_last_sentences(self):
+        """Test overlap carries whole sentences to the next chunk"""
+        text = " ".join(f"Sentence number {i}." for i in range(50))
+        chunks = split_into_token_chunks(text, max_tokens=40, overlap_tokens=10)
+        first_last_sentence = chunks[0].split(". ")[-1]
+        assert chunks[1].startswith(first_last_sentence)
+
+    def test_long_sentence_split_between_words(self):
+        """Test a sentence larger than the budget is cut between words"""
+        text = "word " * 400
+        chunks = split_into_token_chunks(text, max_tokens=30)
+        assert all(estimate_tokens(chunk) <= 30 for chunk in chunks)
+        assert all(not chunk.startswith("ord") for chunk in chunks)
+
+    def test_unbreakable_word_cut(self):
+        """Test a single huge token run is still cut to the budget"""
+        chunks = split_into_token_chunks("x" * 4000, max_tokens=100)
+        assert all(estimate_tokens(chunk) <= 100 for chunk in chunks)
+        assert "".join(chunks) == "x" * 4000
+
+    def test_truncate_to_tokens(self):
+        """Test truncation keeps the leading sentences that fit"""
+        text = "First sentence here. Second sentence here. Third sentence here."
+        assert truncate_to_tokens(text, max_tokens=12) == "First sentence here. Second sentence here."
+
+
 class TestEdgeCases:
     """Test edge cases"""
 
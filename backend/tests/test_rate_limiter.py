@@ -0,0 +1,222 @@
+# Per-provider rate limiter tests: limits, adaptive concurrency, queue stats
+import asyncio
+import time
+import pytest
+import sys
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.config import settings
+from app.core.exceptions import LLMRateLimitException
+from app.services.rate_limiter import ProviderRateLimiter, is_rate_limited, retry_after
+
+
+class RateLimitError(Exception):
+    """Provider 429, shaped like Groq's RateLimitError"""
+    status_code = 429
+
+    def __init__(self, retry_after=None):
+        super().__init__("Rate limit reached")
+        self.response = MagicMock(headers={"retry-after": retry_after} if retry_after else {})
+
+
+def limiter(**overrides):
+    options = dict(
+        name="groq", requests_per_minute=1000, tokens_per_minute=100_000,
+        max_concurrency=4, max_wait=1.0, throttle_cooldown=0.1
+    )
+    options.update(overrides)
+    return ProviderRateLimiter(**options)
+
+
+class TestLimits:
+    """Test admission under concurrency, request and token limits"""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_capped(self):
+        """Test no more calls than the concurrency limit run at once"""
+        governor = limiter(max_concurrency=2)
+        in_flight = peak = 0
+
+        async def call():
+            nonlocal in_flight, peak
+            async with governor.slot(10):
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.02)
+                in_flight -= 1
+
+        await asyncio.gather(*(call() for _ in range(8)))
+
+        assert peak == 2
+        assert governor.stats()["admitted"] == 8
+        assert governor.stats()["max_queue_depth"] >= 6
+
+    @pytest.mark.asyncio
+    async def test_requests_per_minute(self):
+        """Test calls over the per-minute request limit wait, then fail with 503"""
+        governor = limiter(requests_per_minute=3, max_wait=0.05)
+        for _ in range(3):
+            async with governor.slot(10):
+                pass
+
+        with pytest.raises(LLMRateLimitException) as error:
+            async with governor.slot(10):
+                pass
+
+        assert error.value.status_code == 503
+        assert governor.stats()["rejected"] == 1
+        assert governor.stats()["requests_last_minute"] == 3
+
+    @pytest.mark.asyncio
+    async def test_tokens_per_minute(self):
+        """Test a call is admitted only if its tokens fit the minute's budget"""
+        governor = limiter(tokens_per_minute=100, max_wait=0.05)
+        async with governor.slot(80):
+            pass
+
+        with pytest.raises(LLMRateLimitException):
+            async with governor.slot(30):
+                pass
+        async with governor.slot(20):
+            pass
+
+        assert governor.stats()["tokens_last_minute"] == 100
+
+    @pytest.mark.asyncio
+    async def test_oversized_call_runs_alone(self):
+        """Test a call larger than the whole token budget is still admitted on an idle window"""
+        governor = limiter(tokens_per_minute=100)
+
+        async with governor.slot(500):
+            pass
+
+        assert governor.stats()["admitted"] == 1
+
+    @pytest.mark.asyncio
+    async def test_wait_times_reported(self):
+        """Test queued calls show up in the wait statistics"""
+        governor = limiter(max_concurrency=1)
+
+        async def call():
+            async with governor.slot(10):
+                await asyncio.sleep(0.05)
+
+        await asyncio.gather(call(), call())
+        stats = governor.stats()
+
+        assert stats["max_wait_ms"] >= 40
+        assert stats["avg_wait_ms"] > 0
+        assert stats["queue_depth"] == 0
+
+
+class TestAdaptiveConcurrency:
+    """Test AIMD adjustment of the concurrency limit on 429s"""
+
+    @pytest.mark.asyncio
+    async def test_429_halves_limit_and_pauses(self):
+        """Test a 429 halves concurrency and delays the next call by the cooldown"""
+        governor = limiter(max_concurrency=8, throttle_cooldown=0.1)
+
+        with pytest.raises(RateLimitError):
+            async with governor.slot(10):
+                raise RateLimitError()
+        start = time.perf_counter()
+        async with governor.slot(10):
+            pass
+
+        assert governor.concurrency_limit == 4
+        assert governor.stats()["throttled"] == 1
+        assert time.perf_counter() - start >= 0.09
+
+    @pytest.mark.asyncio
+    async def test_retry_after_honoured(self):
+        """Test the pause follows the provider's Retry-After header"""
+        governor = limiter(throttle_cooldown=5)
+
+        with pytest.raises(RateLimitError):
+            async with governor.slot(10):
+                raise RateLimitError(retry_after="0.05")
+        start = time.perf_counter()
+        async with governor.slot(10):
+            pass
+
+        assert 0.04 <= time.perf_counter() - start < 1
+
+    @pytest.mark.asyncio
+    async def test_successes_restore_limit(self):
+        """Test successful calls raise the limit back, one step per run of successes"""
+        governor = limiter(max_concurrency=4, throttle_cooldown=0)
+        with pytest.raises(RateLimitError):
+            async with governor.slot(10):
+                raise RateLimitError()
+        assert governor.concurrency_limit == 2
+
+        for _ in range(2 + 3):
+            async with governor.slot(10):
+                pass
+
+        assert governor.concurrency_limit == 4
+
+    @pytest.mark.asyncio
+    async def test_other_errors_do_not_throttle(self):
+        """Test non-429 failures leave the limit alone"""
+        governor = limiter()
+
+        with pytest.raises(ValueError):
+            async with governor.slot(10):
+                raise ValueError("bad answer")
+
+        assert governor.concurrency_limit == 4
+        assert governor.stats()["in_flight"] == 0
+
+    def test_rate_limit_detection(self):
+        """Test Groq (status_code) and Gemini (code) 429s are recognised"""
+        gemini_error = Exception("RESOURCE_EXHAUSTED")
+        gemini_error.code = 429
+
+        assert is_rate_limited(RateLimitError())
+        assert is_rate_limited(gemini_error)
+        assert not is_rate_limited(Exception("boom"))
+        assert retry_after(RateLimitError(retry_after="2")) == 2.0
+
+
+class TestLLMServiceLimits:
+    """Test provider calls go through the limiters"""
+
+    @pytest.mark.asyncio
+    async def test_groq_calls_admitted_by_limiter(self):
+        """Test summaries are counted by the Groq limiter, translations by Gemini's"""
+        from app.services.llm_service import AsyncLLMService
+        groq = MagicMock()
+        response = MagicMock()
+        response.choices = [MagicMock()]
+        response.choices[0].message.content = "Summary"
+        groq.chat.completions.create = AsyncMock(return_value=response)
+        gemini = MagicMock()
+        gemini.models.generate_content = AsyncMock(return_value=MagicMock(text="Bonjour"))
+        service = AsyncLLMService(groq_client=groq, gemini_client=gemini)
+
+        await service.generate_summary("Test content", "short")
+        await service.get_translation("Hello", "French")
+        stats = service.rate_limit_stats()
+
+        assert stats["groq"]["admitted"] == 1
+        assert stats["groq"]["tokens_last_minute"] > 1024
+        assert stats["gemini"]["admitted"] == 1
+
+    @pytest.mark.asyncio
+    async def test_provider_429_throttles(self):
+        """Test a Groq 429 lowers the Groq concurrency limit only"""
+        from app.services.llm_service import AsyncLLMService
+        groq = MagicMock()
+        groq.chat.completions.create = AsyncMock(side_effect=RateLimitError())
+        service = AsyncLLMService(groq_client=groq, gemini_client=MagicMock(), groq_limiter=limiter())
+
+        with patch.object(settings, "LLM_RETRY_ATTEMPTS", 1), pytest.raises(RateLimitError):
+            await service.generate_summary("Test content", "short")
+
+        assert service.groq_limiter.concurrency_limit == 2
+        assert service.gemini_limiter.stats()["throttled"] == 0
@@ -0,0 +1,336 @@
+# Provider resilience tests: retries, circuit breakers, cross-provider fallback
+import asyncio
+import pytest
+import sys
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.config import settings
+from app.core.exceptions import LLMProviderUnavailableException, LLMRateLimitException
+from app.services import llm_service
+from app.services.resilience import CircuitBreaker, backoff_delay, call_with_retry, is_transient
+
+
+class ProviderError(Exception):
+    """Provider HTTP error, shaped like Groq's APIStatusError"""
+
+    def __init__(self, status_code):
+        super().__init__(f"Error code: {status_code}")
+        self.status_code = status_code
+
+
+def flaky(*outcomes):
+    """Async callable returning (or raising) the given outcomes in turn"""
+    return AsyncMock(side_effect=list(outcomes))
+
+
+class TestTransientErrors:
+    """Test which errors are worth retrying"""
+
+    def test_transient_errors(self):
+        """Test timeouts, 408, 429 and 5xx are transient (Groq: status_code, Gemini: code)"""
+        gemini_error = Exception("UNAVAILABLE")
+        gemini_error.code = 503
+
+        assert is_transient(asyncio.TimeoutError())
+        assert is_transient(ConnectionError())
+        assert is_transient(ProviderError(429))
+        assert is_transient(ProviderError(500))
+        assert is_transient(gemini_error)
+
+    def test_permanent_errors(self):
+        """Test client errors and application errors are not retried"""
+        assert not is_transient(ProviderError(400))
+        assert not is_transient(ValueError("bad answer"))
+        assert not is_transient(LLMRateLimitException("groq"))
+
+    def test_backoff_is_jittered_and_capped(self):
+        """Test delays stay within the exponential bound and the cap"""
+        delays = [backoff_delay(attempt, base=0.5, cap=2.0) for attempt in range(6) for _ in range(20)]
+        assert all(0 <= delay <= 2.0 for delay in delays)
+        assert len(set(delays)) > 1
+        assert all(backoff_delay(0, base=0.5, cap=2.0) <= 0.5 for _ in range(20))
+
+
+class TestCircuitBreaker:
+    """Test breaker state transitions"""
+
+    def test_opens_after_threshold(self):
+        """Test consecutive failures open the breaker, which then fails fast"""
+        breaker = CircuitBreaker("groq", failure_threshold=3, reset_timeout=60)
+        for _ in range(3):
+            breaker.before_call()
+            breaker.record_failure()
+
+        with pytest.raises(LLMProviderUnavailableException) as error:
+            breaker.before_call()
+
+        assert error.value.status_code == 503
+        assert breaker.stats() == {"state": "open", "consecutive_failures": 3, "times_opened": 1, "rejected": 1}
+
+    def test_success_resets_failures(self):
+        """Test failures must be consecutive to open the breaker"""
+        breaker = CircuitBreaker("groq", failure_threshold=2, reset_timeout=60)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        breaker.before_call()
+        assert breaker.stats()["state"] == "closed"
+
+    def test_half_open_lets_one_trial_through(self):
+        """Test after the reset timeout one call probes the provider, and its success closes the breaker"""
+        breaker = CircuitBreaker("groq", failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+
+        breaker.before_call()
+        with pytest.raises(LLMProviderUnavailableException):
+            breaker.before_call()
+        breaker.record_success()
+        breaker.before_call()
+
+        assert breaker.stats()["state"] == "closed"
+
+    def test_failed_trial_reopens(self):
+        """Test a failing half-open trial opens the breaker again"""
+        breaker = CircuitBreaker("groq", failure_threshold=5, reset_timeout=60)
+        for _ in range(5):
+            breaker.record_failure()
+        breaker.opened_at -= 60
+        breaker.before_call()
+        breaker.record_failure()
+
+        assert breaker.is_open
+        assert breaker.times_opened == 2
+
+
+class TestCallWithRetry:
+    """Test retries of transient errors behind a breaker"""
+
+    @pytest.mark.asyncio
+    async def test_transient_error_retried(self):
+        """Test a call succeeds after transient failures"""
+        call = flaky(ProviderError(503), asyncio.TimeoutError(), "ok")
+        breaker = CircuitBreaker("groq", failure_threshold=5)
+
+        result = await call_with_retry(call, breaker, attempts=3, base_delay=0.001)
+
+        assert result == "ok"
+        assert call.await_count == 3
+        assert breaker.stats()["consecutive_failures"] == 0
+
+    @pytest.mark.asyncio
+    async def test_permanent_error_not_retried(self):
+        """Test a 400 is raised at once and does not count against the provider"""
+        call = flaky(ProviderError(400), "ok")
+        breaker = CircuitBreaker("groq", failure_threshold=1)
+
+        with pytest.raises(ProviderError):
+            await call_with_retry(call, breaker, attempts=3, base_delay=0.001)
+
+        assert call.await_count == 1
+        assert not breaker.is_open
+
+    @pytest.mark.asyncio
+    async def test_local_error_leaves_breaker_alone(self):
+        """Test our own exceptions (local rate limit) neither close nor reset the breaker"""
+        breaker = CircuitBreaker("groq", failure_threshold=2, reset_timeout=0)
+        breaker.record_failure()
+
+        with pytest.raises(LLMRateLimitException):
+            await call_with_retry(flaky(LLMRateLimitException("groq")), breaker, attempts=3)
+        assert breaker.stats()["consecutive_failures"] == 1
+
+        breaker.record_failure()
+        with pytest.raises(LLMRateLimitException):
+            await call_with_retry(flaky(LLMRateLimitException("groq")), breaker, attempts=3)
+        # The half-open trial is released without closing the breaker
+        assert breaker.stats()["state"] == "half_open"
+        assert await call_with_retry(flaky("ok"), breaker) == "ok"
+        assert breaker.stats()["state"] == "closed"
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_attempts(self):
+        """Test the last transient error is raised once attempts run out"""
+        call = flaky(*(ProviderError(500) for _ in range(5)))
+
+        with pytest.raises(ProviderError):
+            await call_with_retry(call, CircuitBreaker("groq", failure_threshold=10), attempts=3, base_delay=0.001)
+
+        assert call.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_fails_fast(self):
+        """Test retries stop once the breaker opens, and later calls never reach the provider"""
+        call = flaky(*(ProviderError(502) for _ in range(5)))
+        breaker = CircuitBreaker("groq", failure_threshold=2, reset_timeout=60)
+
+        with pytest.raises(ProviderError):
+            await call_with_retry(call, breaker, attempts=5, base_delay=0.001)
+        with pytest.raises(LLMProviderUnavailableException):
+            await call_with_retry(call, breaker, attempts=5, base_delay=0.001)
+
+        assert call.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_trial_released(self):
+        """Test a cancelled half-open trial does not leave the breaker stuck"""
+        breaker = CircuitBreaker("groq", failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(call_with_retry(lambda: asyncio.sleep(1), breaker), 0.01)
+
+        assert await call_with_retry(flaky("ok"), breaker) == "ok"
+
+
+class TestProviderFallback:
+    """Test AsyncLLMService sends work to the other provider while one is down"""
+
+    @staticmethod
+    def groq_client(*outcomes):
+        responses = []
+        for outcome in outcomes:
+            if isinstance(outcome, str):
+                response = MagicMock()
+                response.choices = [MagicMock()]
+                response.choices[0].message.content = outcome
+                outcome = response
+            responses.append(outcome)
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(side_effect=responses)
+        return client
+
+    @staticmethod
+    def gemini_client(*outcomes):
+        client = MagicMock()
+        client.models.generate_content = AsyncMock(
+            side_effect=[MagicMock(text=o) if isinstance(o, str) else o for o in outcomes]
+        )
+        return client
+
+    @staticmethod
+    def service(groq, gemini):
+        from app.services.llm_service import AsyncLLMService
+        return AsyncLLMService(groq_client=groq, gemini_client=gemini)
+
+    @pytest.fixture(autouse=True)
+    def fast_retries(self):
+        with patch.object(settings, "LLM_RETRY_BASE_DELAY_SECONDS", 0.001):
+            yield
+
+    @pytest.mark.asyncio
+    async def test_transient_groq_error_retried(self):
+        """Test a Groq 503 followed by a success is invisible to the caller, and cached"""
+        groq = self.groq_client(ProviderError(503), "Summary")
+        service = self.service(groq, self.gemini_client())
+
+        assert await service.generate_summary("Test content", "short") == "Summary"
+        assert service.is_summary_cached("Test content", "short")
+
+    @pytest.mark.asyncio
+    async def test_summary_falls_back_to_gemini(self):
+        """Test Gemini summarizes when Groq keeps failing, and the answer is not cached"""
+        groq = self.groq_client(*(ProviderError(503) for _ in range(3)))
+        gemini = self.gemini_client("Gemini summary")
+        service = self.service(groq, gemini)
+
+        summary = await service.generate_summary("Test content", "short")
+
+        assert summary == "Gemini summary"
+        config = gemini.models.generate_content.await_args.kwargs["config"]
+        assert config.system_instruction.startswith("You are an expert educational assistant")
+        assert config.max_output_tokens == 1024
+        assert not service.is_summary_cached("Test content", "short")
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_skips_groq(self):
+        """Test while Groq's breaker is open summaries go straight to Gemini"""
+        groq = self.groq_client()
+        gemini = self.gemini_client("Gemini summary")
+        service = self.service(groq, gemini)
+        for _ in range(service.breakers["groq"].failure_threshold):
+            service.breakers["groq"].record_failure()
+
+        assert await service.generate_summary("Test content", "short") == "Gemini summary"
+        groq.chat.completions.create.assert_not_awaited()
+        assert service.breaker_stats()["groq"]["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_combined_summaries_fall_back_in_json(self):
+        """Test the combined JSON summary call keeps JSON output on Gemini"""
+        groq = self.groq_client()
+        gemini = self.gemini_client('{"short": "Short", "medium": "Medium"}')
+        service = self.service(groq, gemini)
+        for _ in range(service.breakers["groq"].failure_threshold):
+            service.breakers["groq"].record_failure()
+
+        summaries = await service.generate_summaries("Test content", ("short", "medium"), timeout=5)
+
+        assert summaries == {"short": "Short", "medium": "Medium"}
+        assert gemini.models.generate_content.await_args.kwargs["config"].response_mime_type == "application/json"
+
+    @pytest.mark.asyncio
+    async def test_fallback_disabled(self):
+        """Test with no fallback configured the provider error reaches the caller"""
+        groq = self.groq_client(*(ProviderError(503) for _ in range(3)))
+        gemini = self.gemini_client("Gemini summary")
+        service = self.service(groq, gemini)
+
+        with patch.object(settings, "LLM_SUMMARY_FALLBACK", ""), pytest.raises(ProviderError):
+            await service.generate_summary("Test content", "short")
+
+        gemini.models.generate_content.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_permanent_error_not_sent_to_fallback(self):
+        """Test a rejected request (400) is not retried on the other provider"""
+        groq = self.groq_client(ProviderError(400))
+        gemini = self.gemini_client("Gemini summary")
+        service = self.service(groq, gemini)
+
+        with pytest.raises(ProviderError):
+            await service.generate_summary("Test content", "short")
+
+        gemini.models.generate_content.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_both_providers_down(self):
+        """Test the primary provider's error is raised when the fallback fails too"""
+        groq = self.groq_client(*(ProviderError(503) for _ in range(3)))
+        gemini = self.gemini_client(*(ProviderError(500) for _ in range(3)))
+        service = self.service(groq, gemini)
+
+        with pytest.raises(ProviderError) as error:
+            await service.generate_summary("Test content", "short")
+
+        assert error.value.status_code == 503
+
+    @pytest.mark.asyncio
+    async def test_translation_falls_back_to_groq(self):
+        """Test Groq translates when Gemini is down, without filling cache or memory"""
+        groq = self.groq_client('["Bonjour le monde.", "Au revoir."]')
+        gemini = self.gemini_client(*(ProviderError(503) for _ in range(3)))
+        service = self.service(groq, gemini)
+
+        translation = await service.get_translation("Hello world. Goodbye.", "French")
+
+        assert translation == "Bonjour le monde. Au revoir."
+        assert groq.chat.completions.create.await_args.kwargs["messages"][0]["content"] == "You are an expert translator"
+        cache_key = llm_service.translation_cache_key(service.gemini_model_name, "Hello world. Goodbye.", "French")
+        assert llm_service.llm_cache.peek("translation", cache_key) is None
+        assert llm_service.translation_memory.lookup("french", service.gemini_model_name, ["Hello world.", "Goodbye."]) == {}
+
+    @pytest.mark.asyncio
+    async def test_stream_summary_falls_back_whole(self):
+        """Test a summary stream Groq cannot open yields Gemini's summary in one piece"""
+        groq = self.groq_client(*(ProviderError(503) for _ in range(3)))
+        gemini = self.gemini_client("Gemini summary")
+        service = self.service(groq, gemini)
+
+        deltas = [delta async for delta in service.stream_summary("Test content", "short")]
+
+        assert deltas == ["Gemini summary"]
+        assert service.rate_limit_stats()["groq"]["in_flight"] == 0
@@ -0,0 +1,110 @@
+# Single-flight coalescing tests
+import asyncio
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.utils.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test deduplication of concurrent work"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_run(self):
+        """Test that only one pipeline runs for concurrent waiters"""
+        flight = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"title": "Python"}
+
+        results = await asyncio.gather(*[flight.do("key", work) for _ in range(30)])
+
+        assert calls == 1
+        assert all(result == {"title": "Python"} for result in results)
+        assert len(flight) == 0
+
+    @pytest.mark.asyncio
+    async def test_different_keys_run_separately(self):
+        """Test that distinct keys are not coalesced"""
+        flight = SingleFlight()
+        calls = []
+
+        async def work(key):
+            calls.append(key)
+            await asyncio.sleep(0)
+            return key
+
+        results = await asyncio.gather(flight.do("a", lambda: work("a")), flight.do("b", lambda: work("b")))
+
+        assert sorted(calls) == ["a", "b"]
+        assert results == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_run_again(self):
+        """Test that completed work is not memoized"""
+        flight = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await flight.do("key", work) == 1
+        assert await flight.do("key", work) == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelling_a_waiter_keeps_shared_work(self):
+        """Test that one cancelled waiter does not cancel the others"""
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "done"
+
+        first = asyncio.ensure_future(flight.do("key", work))
+        second = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+
+        assert await second == "done"
+        assert first.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_waiter(self):
+        """Test that a failure is propagated to all waiters"""
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            flight.do("key", work), flight.do("key", work), return_exceptions=True
+        )
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert not flight.in_flight("key")
+
+
+class TestURLNormalization:
+    """Test the coalescing key"""
+
+    def test_spellings_of_same_article_share_key(self):
+        from app.services.content_extractor import normalize_wikipedia_url
+        assert normalize_wikipedia_url("https://en.wikipedia.org/wiki/Python_(programming_language)") == \
+            normalize_wikipedia_url("https://en.m.wikipedia.org/wiki/python%20(programming_language)")
+
+    def test_languages_have_distinct_keys(self):
+        from app.services.content_extractor import normalize_wikipedia_url
+        assert normalize_wikipedia_url("https://en.wikipedia.org/wiki/Python") != \
+            normalize_wikipedia_url("https://fr.wikipedia.org/wiki/Python")
@@ -0,0 +1,50 @@
+# Server-Sent Events framing tests
+import json
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.utils.sse import sse_event, sse_text_stream
+
+
+def parse(message):
+    event, data = message.rstrip("\n").split("\n")
+    return event[len("event: "):], json.loads(data[len("data: "):])
+
+
+async def chunks(*texts, error=None):
+    for text in texts:
+        yield text
+    if error is not None:
+        raise error
+
+
+class TestSSE:
+    """Test SSE messages and text streams"""
+
+    def test_event_format(self):
+        """Test one message is an event line, a JSON data line and a blank line"""
+        message = sse_event("token", {"text": "Ligne 1\nLigne 2"})
+
+        assert message.endswith("\n\n")
+        assert parse(message) == ("token", {"text": "Ligne 1\nLigne 2"})
+
+    @pytest.mark.asyncio
+    async def test_tokens_then_done(self):
+        """Test each chunk becomes a token event, followed by done"""
+        events = [parse(m) async for m in sse_text_stream(chunks("Hello", " world"), {"summary_type": "short"})]
+
+        assert events == [
+            ("token", {"text": "Hello"}),
+            ("token", {"text": " world"}),
+            ("done", {"summary_type": "short"}),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_failure_reported_as_error_event(self):
+        """Test a mid-stream failure ends the stream with an error event"""
+        events = [parse(m) async for m in sse_text_stream(chunks("Hello", error=Exception("API Error")))]
+
+        assert events == [("token", {"text": "Hello"}), ("error", {"detail": "API Error"})]
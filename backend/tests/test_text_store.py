@@ -0,0 +1,84 @@
+# Content-addressed article text storage tests
+import pytest
+import sys
+import os
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.models.article import Article, ActionType
+from app.models.article_text import ArticleText
+from app.services.text_store import content_hash, store_article_text
+from app.utils.compression import compress_text, decompress_text
+
+ARTICLE_TEXT = "Python is a high-level, general-purpose programming language. " * 200
+
+
+class TestCompression:
+    """Test text compression codecs"""
+
+    def test_zstd_round_trip(self):
+        codec, data = compress_text(ARTICLE_TEXT)
+        assert codec == "zstd"
+        assert len(data) < len(ARTICLE_TEXT) / 10
+        assert decompress_text(codec, data) == ARTICLE_TEXT
+
+    def test_zlib_fallback(self):
+        """Test texts are still compressed without zstandard"""
+        with patch('app.utils.compression.zstandard', None):
+            codec, data = compress_text("Intelligence artificielle " * 50)
+        assert codec == "zlib"
+        assert decompress_text(codec, data) == "Intelligence artificielle " * 50
+
+    def test_unknown_codec(self):
+        with pytest.raises(ValueError):
+            decompress_text("lz4", b"")
+
+
+class TestStoreArticleText:
+    """Test deduplicated storage referenced from articles"""
+
+    def save_article(self, db, user_id, text):
+        article = Article(
+            user_id=user_id,
+            url="https://en.wikipedia.org/wiki/Python",
+            title="Python",
+            action=ActionType.SUMMARY,
+            content_hash=store_article_text(db, text)
+        )
+        db.add(article)
+        db.commit()
+        return article.id
+
+    def test_same_text_stored_once(self, sqlite_session_factory):
+        """Test repeated extractions across users add no storage"""
+        with sqlite_session_factory() as db:
+            self.save_article(db, 1, ARTICLE_TEXT)
+            self.save_article(db, 2, ARTICLE_TEXT)
+
+            assert db.query(ArticleText).count() == 1
+            assert {a.content_hash for a in db.query(Article)} == {content_hash(ARTICLE_TEXT)}
+            stored = db.query(ArticleText).one()
+            assert stored.size_bytes == len(ARTICLE_TEXT)
+            assert stored.compressed_bytes < stored.size_bytes
+
+    def test_text_decompressed_lazily(self, sqlite_session_factory):
+        with sqlite_session_factory() as db:
+            article_id = self.save_article(db, 1, ARTICLE_TEXT)
+
+        with sqlite_session_factory() as db:
+            article = db.get(Article, article_id)
+            assert "stored_text" not in article.__dict__
+            stored = article.stored_text
+            assert "data" not in stored.__dict__
+            assert article.content == ARTICLE_TEXT
+
+    def test_empty_text_not_stored(self, sqlite_session_factory):
+        with sqlite_session_factory() as db:
+            assert store_article_text(db, "") is None
+            assert store_article_text(db, None) is None
+            assert db.query(ArticleText).count() == 0
+
+    def test_article_without_text(self):
+        article = Article(user_id=1, url="text://translation", title="T", action=ActionType.TRANSLATION)
+        assert article.content is None
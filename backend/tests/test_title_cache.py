@@ -0,0 +1,129 @@
+# Title resolution cache tests: redirects, negative entries and expiry
+import pytest
+import sys
+import os
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.exceptions import WikipediaPageNotFoundException, WikipediaDisambiguationException
+from app.models.title_resolution import TitleResolution
+from app.services.content_extractor import get_wikipedia_content
+from app.services.title_cache import TitleResolutionCache
+
+
+class TestTitleResolutionCache:
+    """Test the title resolution cache itself"""
+
+    def test_redirect_is_remembered(self):
+        cache = TitleResolutionCache(session_factory=None)
+        cache.remember_resolved("en", "Python language", "Python (programming language)")
+        assert cache.get("en", "Python language") == {
+            "status": "resolved", "title": "Python (programming language)", "options": []
+        }
+
+    def test_canonical_titles_kept_in_memory(self, sqlite_session_factory):
+        """Test identity mappings are answered from memory and never written to the database"""
+        cache = TitleResolutionCache(session_factory=sqlite_session_factory)
+        cache.remember_resolved("en", "Python", "Python")
+
+        with patch.object(cache, "_load") as load:
+            assert cache.get("en", "Python") == {"status": "resolved", "title": "Python", "options": []}
+        load.assert_not_called()
+        with sqlite_session_factory() as db:
+            assert db.query(TitleResolution).count() == 0
+
+    def test_negative_entries_expire_sooner(self):
+        cache = TitleResolutionCache(session_factory=None, ttl_seconds=3600, negative_ttl_seconds=60)
+        cache.remember_missing("en", "Nope")
+        cache.remember_resolved("en", "Py", "Python")
+        later = datetime.utcnow() + timedelta(seconds=120)
+
+        with patch('app.services.title_cache.datetime') as mock_datetime:
+            mock_datetime.utcnow.return_value = later
+            assert cache.get("en", "Nope") is None
+            assert cache.get("en", "Py")["title"] == "Python"
+
+    def test_persistent_tier(self, sqlite_session_factory):
+        """Test resolutions survive a restart"""
+        TitleResolutionCache(session_factory=sqlite_session_factory).remember_disambiguation(
+            "fr", "Mercure", ["Mercure (planète)", "Mercure (chimie)"]
+        )
+
+        fresh = TitleResolutionCache(session_factory=sqlite_session_factory)
+        assert fresh.get("fr", "Mercure")["options"] == ["Mercure (planète)", "Mercure (chimie)"]
+        with sqlite_session_factory() as db:
+            assert db.query(TitleResolution).count() == 1
+
+    def test_stats(self):
+        cache = TitleResolutionCache(session_factory=None)
+        cache.remember_missing("en", "Nope")
+        cache.get("en", "Nope")
+        cache.get("en", "Other")
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+
+class TestExtractionUsesResolutions:
+    """Test repeated lookups of redirects and bad titles stay local"""
+
+    @pytest.mark.asyncio
+    @patch('app.services.content_extractor.wikipedia_client')
+    async def test_redirect_served_from_cache(self, mock_client, isolated_article_cache):
+        mock_client.fetch_page = AsyncMock(return_value={
+            "title": "Python (programming language)",
+            "content": "Python is a language.",
+            "language": "en",
+            "revision_id": 1
+        })
+
+        await get_wikipedia_content("https://en.wikipedia.org/wiki/Python_language")
+        content = await get_wikipedia_content("https://en.wikipedia.org/wiki/Python_language")
+
+        assert content["title"] == "Python (programming language)"
+        mock_client.fetch_page.assert_awaited_once()
+        # Stored under the canonical title, so the canonical URL hits too
+        assert isolated_article_cache.get("en", "Python (programming language)") is not None
+
+    @pytest.mark.asyncio
+    @patch('app.services.content_extractor.wikipedia_client')
+    async def test_missing_page_answered_locally(self, mock_client):
+        mock_client.fetch_page = AsyncMock(side_effect=WikipediaPageNotFoundException("Nope"))
+
+        for _ in range(2):
+            with pytest.raises(WikipediaPageNotFoundException):
+                await get_wikipedia_content("https://en.wikipedia.org/wiki/Nope")
+
+        mock_client.fetch_page.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @patch('app.services.content_extractor.wikipedia_client')
+    async def test_disambiguation_options_cached(self, mock_client):
+        mock_client.fetch_page = AsyncMock(side_effect=WikipediaDisambiguationException(["Mercury (planet)"]))
+
+        with pytest.raises(WikipediaDisambiguationException):
+            await get_wikipedia_content("https://en.wikipedia.org/wiki/Mercury")
+        with pytest.raises(WikipediaDisambiguationException) as exc_info:
+            await get_wikipedia_content("https://en.wikipedia.org/wiki/Mercury")
+
+        assert exc_info.value.options == ["Mercury (planet)"]
+        mock_client.fetch_page.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @patch('app.services.content_extractor.wikipedia_client')
+    async def test_canonical_title_lookups_stay_in_memory(self, mock_client, isolated_article_cache):
+        """Test a canonical title served from the article cache does not query the title table again"""
+        from app.services import content_extractor
+        mock_client.fetch_page = AsyncMock(return_value={
+            "title": "Python", "content": "Python is a language.", "language": "en", "revision_id": 1
+        })
+        await get_wikipedia_content("https://en.wikipedia.org/wiki/Python")
+
+        with patch.object(content_extractor.title_cache, "_load") as load:
+            await get_wikipedia_content("https://en.wikipedia.org/wiki/Python")
+
+        load.assert_not_called()
+        mock_client.fetch_page.assert_awaited_once()
@@ -0,0 +1,184 @@
+# Translation micro-batching tests: batch windows, limits, fan-out of results
+import asyncio
+import json
+import pytest
+import sys
+import os
+from unittest.mock import AsyncMock, MagicMock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.translation_batcher import TranslationBatcher
+
+
+def recorder(delay=0.0):
+    """Flush function translating to upper case, recording each batch it receives"""
+    batches = []
+
+    async def flush(target_language, texts):
+        batches.append((target_language, list(texts)))
+        await asyncio.sleep(delay)
+        return [text.upper() for text in texts]
+
+    return flush, batches
+
+
+class TestTranslationBatcher:
+    """Test gathering of concurrent requests into batches"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_call(self):
+        """Test requests within the window are flushed together and each gets its own result"""
+        flush, batches = recorder()
+        batcher = TranslationBatcher(flush, window=0.01)
+
+        results = await asyncio.gather(*(batcher.submit(f"label {i}", "French") for i in range(5)))
+
+        assert results == [f"LABEL {i}" for i in range(5)]
+        assert len(batches) == 1
+        assert batcher.stats() == {"requests": 5, "coalesced": 0, "batches": 1, "provider_calls_saved": 4}
+
+    @pytest.mark.asyncio
+    async def test_batches_per_language(self):
+        """Test languages are batched separately, whatever their spelling"""
+        flush, batches = recorder()
+        batcher = TranslationBatcher(flush, window=0.01)
+
+        await asyncio.gather(
+            batcher.submit("Yes", "French"), batcher.submit("No", " french "), batcher.submit("Yes", "Spanish")
+        )
+
+        assert sorted(batches) == [("French", ["Yes", "No"]), ("Spanish", ["Yes"])]
+
+    @pytest.mark.asyncio
+    async def test_identical_texts_coalesced(self):
+        """Test the same text requested twice in a batch is translated once"""
+        flush, batches = recorder()
+        batcher = TranslationBatcher(flush, window=0.01)
+
+        results = await asyncio.gather(batcher.submit("Quiz", "French"), batcher.submit("Quiz", "French"))
+
+        assert results == ["QUIZ", "QUIZ"]
+        assert batches == [("French", ["Quiz"])]
+        assert batcher.stats()["coalesced"] == 1
+
+    @pytest.mark.asyncio
+    async def test_full_batch_sent_without_waiting(self):
+        """Test a batch reaching max_items is sent before its window ends"""
+        flush, batches = recorder()
+        batcher = TranslationBatcher(flush, window=10, max_items=3)
+
+        results = await asyncio.wait_for(
+            asyncio.gather(*(batcher.submit(f"item {i}", "French") for i in range(3))), 1
+        )
+
+        assert len(results) == 3
+        assert len(batches) == 1
+
+    @pytest.mark.asyncio
+    async def test_token_budget_splits_batches(self):
+        """Test a text that would overflow the batch's token budget starts a new batch"""
+        flush, batches = recorder()
+        batcher = TranslationBatcher(flush, window=0.01, max_tokens=5)
+
+        await asyncio.gather(*(batcher.submit(f"short label {i}", "French") for i in range(3)))
+
+        assert [len(texts) for _, texts in batches] == [1, 1, 1]
+
+    @pytest.mark.asyncio
+    async def test_per_text_errors_and_batch_errors(self):
+        """Test a failed text fails only its requesters, and a failed batch fails all of them"""
+        async def flush(target_language, texts):
+            if "boom" in texts:
+                raise RuntimeError("provider down")
+            return [ValueError("bad") if text == "bad" else text for text in texts]
+
+        batcher = TranslationBatcher(flush, window=0.01)
+        good, bad = await asyncio.gather(
+            batcher.submit("good", "French"), batcher.submit("bad", "French"), return_exceptions=True
+        )
+        failed = await asyncio.gather(
+            batcher.submit("boom", "French"), batcher.submit("other", "French"), return_exceptions=True
+        )
+
+        assert good == "good"
+        assert isinstance(bad, ValueError)
+        assert all(isinstance(result, RuntimeError) for result in failed)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_requester_does_not_cancel_batch(self):
+        """Test one requester giving up leaves the others served"""
+        flush, batches = recorder(delay=0.05)
+        batcher = TranslationBatcher(flush, window=0.01)
+
+        abandoned = asyncio.ensure_future(batcher.submit("gone", "French"))
+        kept = asyncio.ensure_future(batcher.submit("kept", "French"))
+        await asyncio.sleep(0.02)
+        abandoned.cancel()
+
+        assert await kept == "KEPT"
+        assert batches == [("French", ["gone", "kept"])]
+
+    def test_accepts_short_texts_only(self):
+        """Test long texts and a zero window bypass batching"""
+        flush, _ = recorder()
+        assert TranslationBatcher(flush, window=0.005, max_item_tokens=10).accepts("Save changes")
+        assert not TranslationBatcher(flush, window=0.005, max_item_tokens=10).accepts("word " * 50)
+        assert not TranslationBatcher(flush, window=0).accepts("Save changes")
+
+
+class TestBatchedTranslations:
+    """Test AsyncLLMService sends concurrent short translations as one Gemini call"""
+
+    @staticmethod
+    def gemini_client(answer):
+        gemini = MagicMock()
+        gemini.models.generate_content = AsyncMock(side_effect=lambda **kwargs: MagicMock(text=answer(kwargs)))
+        return gemini
+
+    @pytest.mark.asyncio
+    async def test_one_call_for_concurrent_labels(self):
+        """Test short labels are sent as one JSON array and answers fanned back in order"""
+        from app.services.llm_service import AsyncLLMService
+        gemini = self.gemini_client(lambda kwargs: json.dumps(["Enregistrer", "Annuler", "Suivant"]))
+        service = AsyncLLMService(groq_client=MagicMock(), gemini_client=gemini)
+
+        results = await asyncio.gather(*(
+            service.get_translation(label, "French") for label in ("Save", "Cancel", "Next")
+        ))
+
+        assert results == ["Enregistrer", "Annuler", "Suivant"]
+        gemini.models.generate_content.assert_awaited_once()
+        call = gemini.models.generate_content.await_args.kwargs
+        assert '["Save", "Cancel", "Next"]' in call["contents"]
+        assert call["config"].response_mime_type == "application/json"
+        assert await service.get_translation("Cancel", "French") == "Annuler"
+        gemini.models.generate_content.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_lone_request_uses_text_prompt(self):
+        """Test a request alone in its window is translated as before"""
+        from app.services.llm_service import AsyncLLMService
+        gemini = self.gemini_client(lambda kwargs: "Bonjour")
+        service = AsyncLLMService(groq_client=MagicMock(), gemini_client=gemini)
+
+        assert await service.get_translation("Hello", "French") == "Bonjour"
+        assert gemini.models.generate_content.await_args.kwargs["contents"] == "Translate the text to French : Hello"
+
+    @pytest.mark.asyncio
+    async def test_misaligned_answer_falls_back_per_text(self):
+        """Test an answer with the wrong number of translations is redone one text at a time"""
+        from app.services.llm_service import AsyncLLMService
+
+        def answer(kwargs):
+            if kwargs["contents"].startswith("Translate each text"):
+                return json.dumps(["Oui Non"])
+            return {"Yes": "Oui", "No": "Non"}[kwargs["contents"].rsplit(": ", 1)[1]]
+
+        gemini = self.gemini_client(answer)
+        service = AsyncLLMService(groq_client=MagicMock(), gemini_client=gemini)
+
+        results = await asyncio.gather(service.get_translation("Yes", "French"), service.get_translation("No", "French"))
+
+        assert results == ["Oui", "Non"]
+        assert gemini.models.generate_content.await_count == 3
@@ -0,0 +1,139 @@
+# Translation memory tests: exact and fuzzy sentence reuse
+import json
+import pytest
+import sys
+import os
+from unittest.mock import AsyncMock, MagicMock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.translation_memory import TranslationMemory
+
+MODEL = "gemini-3-flash-preview"
+
+
+class TestTranslationMemory:
+    """Test sentence lookups"""
+
+    @pytest.fixture
+    def memory(self):
+        memory = TranslationMemory(session_factory=None)
+        memory.store("french", MODEL, [
+            ("Python is a programming language.", "Python est un langage de programmation."),
+            ("It was released in 1991.", "Il a été publié en 1991."),
+        ])
+        return memory
+
+    def test_exact_match_ignores_whitespace(self, memory):
+        found = memory.lookup("french", MODEL, ["Python is a  programming language. "])
+        assert found == {0: "Python est un langage de programmation."}
+        assert memory.exact_hits == 1
+
+    def test_near_exact_match(self, memory):
+        """Test a one-character edit reuses the stored translation"""
+        found = memory.lookup("french", MODEL, ["Python is a programming language!"])
+        assert found == {0: "Python est un langage de programmation."}
+        assert memory.fuzzy_hits == 1
+
+    def test_numbers_must_match(self, memory):
+        assert memory.lookup("french", MODEL, ["It was released in 1992."]) == {}
+        assert memory.misses == 1
+
+    def test_scoped_by_language_and_model(self, memory):
+        assert memory.lookup("spanish", MODEL, ["It was released in 1991."]) == {}
+        assert memory.lookup("french", "other-model", ["It was released in 1991."]) == {}
+
+    def test_persistent_tier(self, sqlite_session_factory):
+        """Test exact and fuzzy matches are served from the database after a restart"""
+        TranslationMemory(session_factory=sqlite_session_factory).store("french", MODEL, [
+            ("Python is a programming language.", "Python est un langage de programmation."),
+        ])
+        fresh = TranslationMemory(session_factory=sqlite_session_factory)
+        found = fresh.lookup("french", MODEL, ["Python is a programming language.", "Python is a programming languages."])
+        assert found == {0: "Python est un langage de programmation.", 1: "Python est un langage de programmation."}
+        assert (fresh.exact_hits, fresh.fuzzy_hits) == (1, 1)
+
+    def test_fuzzy_candidates_fetched_in_one_query(self, sqlite_session_factory):
+        """Test fuzzy lookups of many sentences share one database query, each against its own length window"""
+        from sqlalchemy import event
+        TranslationMemory(session_factory=sqlite_session_factory).store("french", MODEL, [
+            ("Python is a programming language.", "Python est un langage de programmation."),
+            ("It was released in 1991.", "Il a été publié en 1991."),
+        ])
+        fresh = TranslationMemory(session_factory=sqlite_session_factory)
+        statements = []
+
+        def record(connection, cursor, statement, *args):
+            statements.append(statement)
+
+        with sqlite_session_factory() as db:
+            engine = db.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            found = fresh.lookup("french", MODEL, [
+                "Python is a programming languages.", "It was released in 1991!", "Something else entirely here.",
+            ])
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert found == {0: "Python est un langage de programmation.", 1: "Il a été publié en 1991."}
+        assert sum("UNION ALL" in statement for statement in statements) == 1
+        assert len(statements) == 2  # exact hashes, then every fuzzy candidate
+
+    def test_purge(self, memory, sqlite_session_factory):
+        """Test purge forgets both tiers"""
+        stored = TranslationMemory(session_factory=sqlite_session_factory)
+        stored.store("french", MODEL, [("Python is a programming language.", "Python est un langage.")])
+
+        assert stored.purge() == 1
+        assert memory.purge() == 2
+        assert TranslationMemory(session_factory=sqlite_session_factory).lookup(
+            "french", MODEL, ["Python is a programming language."]
+        ) == {}
+        assert memory.lookup("french", MODEL, ["It was released in 1991."]) == {}
+
+
+class TestGetTranslationWithMemory:
+    """Test only unmatched sentences are sent to Gemini"""
+
+    @pytest.fixture
+    def gemini(self):
+        def generate_content(model, config, contents):
+            sentences = json.loads(contents[contents.index("["):])
+            return MagicMock(text=json.dumps([f"FR({sentence})" for sentence in sentences]))
+
+        client = MagicMock()
+        client.models.generate_content = AsyncMock(side_effect=generate_content)
+        return client
+
+    def service(self, gemini):
+        from app.services.llm_service import AsyncLLMService
+        return AsyncLLMService(groq_client=MagicMock(), gemini_client=gemini)
+
+    def sent_sentences(self, gemini):
+        contents = gemini.models.generate_content.await_args.kwargs["contents"]
+        return json.loads(contents[contents.index("["):])
+
+    @pytest.mark.asyncio
+    async def test_edited_article_sends_only_changed_sentences(self, gemini):
+        service = self.service(gemini)
+        original = "Python is a language. It was created by Guido.\n\nIt is popular."
+        edited = "Python is a language. It was created by Guido van Rossum.\n\nIt is popular."
+
+        first = await service.get_translation(original, "French")
+        second = await service.get_translation(edited, "French")
+
+        assert first == "FR(Python is a language.) FR(It was created by Guido.)\n\nFR(It is popular.)"
+        assert second == "FR(Python is a language.) FR(It was created by Guido van Rossum.)\n\nFR(It is popular.)"
+        assert gemini.models.generate_content.await_count == 2
+        assert self.sent_sentences(gemini) == ["It was created by Guido van Rossum."]
+
+    @pytest.mark.asyncio
+    async def test_misaligned_output_falls_back_to_whole_text(self, gemini, isolated_translation_memory):
+        responses = iter(['["only one"]', "Texte complet traduit."])
+        gemini.models.generate_content.side_effect = lambda **kwargs: MagicMock(text=next(responses))
+
+        result = await self.service(gemini).get_translation("First sentence. Second sentence.", "French")
+
+        assert result == "Texte complet traduit."
+        assert len(isolated_translation_memory.memory) == 0
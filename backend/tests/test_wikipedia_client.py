@@ -0,0 +1,280 @@
+# Wikipedia API client tests
+import asyncio
+import pytest
+import httpx
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.wikipedia_client import WikipediaClient, USER_AGENT, extract_intro, validate_language, is_wikipedia_host
+from app.core.exceptions import (
+    WikipediaPageNotFoundException, WikipediaDisambiguationException, InvalidWikipediaLanguageException
+)
+
+
+def make_transport(pages, requests_log=None):
+    """Build a MockTransport answering action=query calls from a dict of pages"""
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = dict(request.url.params)
+        if requests_log is not None:
+            requests_log.append((request.url.host, params))
+        page = pages.get(params["titles"], {"title": params["titles"], "missing": True})
+        return httpx.Response(200, json={"query": {"pages": [page]}})
+    return httpx.MockTransport(handler)
+
+
+PYTHON_PAGE = {
+    "title": "Python (programming language)",
+    "fullurl": "https://en.wikipedia.org/wiki/Python_(programming_language)",
+    "revisions": [{"revid": 123}],
+    "extract": "Python is a language.\n\n== History ==\nCreated in 1991.",
+}
+
+
+class TestFetchPage:
+    """Test page fetching through the action API"""
+
+    @pytest.mark.asyncio
+    async def test_returns_content_dict(self):
+        """Test the returned dict matches get_wikipedia_content's shape"""
+        client = WikipediaClient(transport=make_transport({PYTHON_PAGE["title"]: PYTHON_PAGE}))
+        result = await client.fetch_page("en", "Python (programming language)")
+        await client.aclose()
+
+        assert result["title"] == "Python (programming language)"
+        assert result["summary"] == "Python is a language."
+        assert "Created in 1991." in result["content"]
+        assert result["url"] == PYTHON_PAGE["fullurl"]
+        assert result["language"] == "en"
+        assert result["revision_id"] == 123
+
+    @pytest.mark.asyncio
+    async def test_single_round_trip(self):
+        """Test content, summary, URL and revision come from one request"""
+        log = []
+        client = WikipediaClient(transport=make_transport({PYTHON_PAGE["title"]: PYTHON_PAGE}, log))
+        await client.fetch_page("en", "Python (programming language)")
+        await client.aclose()
+
+        assert len(log) == 1
+        assert set(log[0][1]["prop"].split("|")) >= {"extracts", "info", "revisions"}
+
+    @pytest.mark.asyncio
+    async def test_missing_page(self):
+        """Test a missing title raises WikipediaPageNotFoundException"""
+        client = WikipediaClient(transport=make_transport({}))
+        with pytest.raises(WikipediaPageNotFoundException) as exc_info:
+            await client.fetch_page("en", "Nope")
+        await client.aclose()
+        assert "introuvable" in str(exc_info.value)
+
+    @pytest.mark.asyncio
+    async def test_disambiguation_page(self):
+        """Test a disambiguation page raises with its options"""
+        page = {
+            "title": "Mercury",
+            "pageprops": {"disambiguation": ""},
+            "links": [{"title": "Mercury (planet)"}, {"title": "Mercury (element)"}],
+        }
+        client = WikipediaClient(transport=make_transport({"Mercury": page}))
+        with pytest.raises(WikipediaDisambiguationException) as exc_info:
+            await client.fetch_page("en", "Mercury")
+        await client.aclose()
+        assert exc_info.value.options == ["Mercury (planet)", "Mercury (element)"]
+
+
+class TestLazySections:
+    """Test outline and single-section fetching"""
+
+    @staticmethod
+    def _handler(log):
+        def handler(request):
+            params = dict(request.url.params)
+            log.append(params)
+            if params["action"] == "parse" and params.get("prop") == "sections":
+                return httpx.Response(200, json={"parse": {"title": "Python", "sections": [
+                    {"index": "1", "line": "<i>History</i>", "level": "2", "number": "1"},
+                    {"index": "2", "line": "Early years", "level": "3", "number": "1.1"},
+                    {"index": "T-1", "line": "From a template", "level": "2", "number": "2"},
+                ]}})
+            if params["action"] == "parse":
+                return httpx.Response(200, json={"parse": {
+                    "title": "Python", "revid": 123,
+                    "wikitext": "== History ==\n[[Guido van Rossum|Guido]] started it.",
+                }})
+            return httpx.Response(200, json={"query": {"pages": [
+                {**PYTHON_PAGE, "title": "Python", "extract": "Python is a language."}
+            ]}})
+        return handler
+
+    @pytest.mark.asyncio
+    async def test_outline_has_lead_and_table_of_contents(self):
+        """Test the outline carries no section bodies"""
+        log = []
+        client = WikipediaClient(transport=httpx.MockTransport(self._handler(log)))
+        outline = await client.fetch_outline("en", "Python")
+        await client.aclose()
+
+        assert outline["content"] == "Python is a language."
+        assert outline["revision_id"] == 123
+        assert [s["title"] for s in outline["sections"]] == ["Introduction", "History", "Early years"]
+        assert [s["index"] for s in outline["sections"]] == [0, 1, 2]
+        assert any(params.get("exintro") for params in log)
+
+    @pytest.mark.asyncio
+    async def test_outline_of_missing_page(self):
+        """Test a missing page is reported even though parse fails too"""
+        def handler(request):
+            if request.url.params["action"] == "parse":
+                return httpx.Response(200, json={"error": {"info": "missingtitle"}})
+            return httpx.Response(200, json={"query": {"pages": [{"title": "Nope", "missing": True}]}})
+
+        client = WikipediaClient(transport=httpx.MockTransport(handler))
+        with pytest.raises(WikipediaPageNotFoundException):
+            await client.fetch_outline("en", "Nope")
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_fetch_section_returns_plain_text(self):
+        """Test one section is fetched and converted to plain text"""
+        log = []
+        client = WikipediaClient(transport=httpx.MockTransport(self._handler(log)))
+        section = await client.fetch_section("en", "Python", 1)
+        await client.aclose()
+
+        assert log[0]["section"] == "1"
+        assert section["heading"] == "History"
+        assert "Guido started it." in section["content"]
+        assert section["revision_id"] == 123
+
+
+class TestResolveTitles:
+    """Test multi-title resolution"""
+
+    @pytest.mark.asyncio
+    async def test_resolves_redirects_missing_and_disambiguation(self):
+        """Test one query classifies every requested title"""
+        log = []
+
+        def handler(request):
+            log.append(dict(request.url.params))
+            return httpx.Response(200, json={"query": {
+                "normalized": [{"from": "python", "to": "Python"}],
+                "redirects": [{"from": "Python", "to": "Python (programming language)"}],
+                "pages": [
+                    {**PYTHON_PAGE},
+                    {"title": "Nope", "missing": True},
+                    {"title": "Mercury", "pageprops": {"disambiguation": ""}, "revisions": [{"revid": 7}]},
+                ],
+            }})
+
+        client = WikipediaClient(transport=httpx.MockTransport(handler))
+        resolved = await client.resolve_titles("en", ["python", "Nope", "Mercury"])
+        await client.aclose()
+
+        assert len(log) == 1
+        assert log[0]["titles"] == "python|Nope|Mercury"
+        assert resolved["python"]["title"] == "Python (programming language)"
+        assert resolved["python"]["revision_id"] == 123
+        assert resolved["Nope"]["missing"]
+        assert resolved["Mercury"]["disambiguation"]
+
+    @pytest.mark.asyncio
+    async def test_rejects_more_than_fifty_titles(self):
+        """Test the MediaWiki multi-title limit is enforced"""
+        client = WikipediaClient(transport=make_transport({}))
+        with pytest.raises(ValueError):
+            await client.resolve_titles("en", [f"T{i}" for i in range(51)])
+
+
+class TestPerLanguageClients:
+    """Test per-request language handling and pooling"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_languages_hit_their_own_host(self):
+        """Test concurrent fetches in different languages do not interfere"""
+        log = []
+        pages = {
+            "Python": {**PYTHON_PAGE, "title": "Python"},
+        }
+        client = WikipediaClient(transport=make_transport(pages, log))
+        await asyncio.gather(
+            client.fetch_page("en", "Python"),
+            client.fetch_page("fr", "Python"),
+            client.fetch_page("de", "Python"),
+        )
+        await client.aclose()
+
+        hosts = {host for host, _ in log}
+        assert hosts == {"en.wikipedia.org", "fr.wikipedia.org", "de.wikipedia.org"}
+
+    def test_client_is_reused_per_language(self):
+        """Test one pooled client is kept per language host"""
+        client = WikipediaClient()
+        assert client._client("en") is client._client("en")
+        assert client._client("en") is not client._client("fr")
+        assert client._client("en").headers["User-Agent"] == USER_AGENT
+        asyncio.run(client.aclose())
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_client_closed(self):
+        """Test the number of pooled clients is capped and the evicted one gets closed"""
+        client = WikipediaClient(timeout=0.01, max_clients=2)
+        english = client._client("en")
+        client._client("fr")
+        client._client("en")
+        french = client._client("fr")
+        client._client("de")
+
+        assert list(client._clients) == ["fr", "de"]
+        assert client._client("fr") is french
+        await asyncio.sleep(0.05)
+        assert english.is_closed
+        await client.aclose()
+        assert french.is_closed
+
+    def test_language_codes_validated(self):
+        """Test only language-code shaped subdomains can become API hosts"""
+        for language in ("en", "simple", "zh-min-nan", "be-tarask"):
+            assert validate_language(language) == language
+        client = WikipediaClient()
+        for language in ("169.254.169.254#", "evil.com#", "EN", "english", "en/..", "en\n", ""):
+            with pytest.raises(InvalidWikipediaLanguageException) as error:
+                client._client(language)
+            assert error.value.status_code == 422
+        assert client._clients == {}
+
+    def test_wikipedia_hosts(self):
+        """Test host checks reject look-alike domains"""
+        assert is_wikipedia_host("en.wikipedia.org")
+        assert is_wikipedia_host("fr.m.wikipedia.org")
+        assert not is_wikipedia_host("wikipedia.org.evil.com")
+        assert not is_wikipedia_host("evilwikipedia.org")
+        assert not is_wikipedia_host(None)
+
+    @pytest.mark.asyncio
+    async def test_api_error_is_raised(self):
+        """Test MediaWiki error payloads surface as exceptions"""
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(200, json={"error": {"info": "Bad title"}})
+        )
+        client = WikipediaClient(transport=transport)
+        with pytest.raises(Exception, match="Bad title"):
+            await client.query("en", action="query", titles="<")
+        await client.aclose()
+
+
+class TestExtractIntro:
+    """Test lead section extraction from plain-text extracts"""
+
+    def test_intro_stops_at_first_heading(self):
+        content = "Lead paragraph.\nSecond line.\n\n\n== History ==\nOld.\n\n=== Early ===\nOlder."
+        assert extract_intro(content) == "Lead paragraph.\nSecond line."
+
+    def test_no_heading_returns_everything(self):
+        assert extract_intro("  Only a lead.  ") == "Only a lead."
+
+    def test_equals_sign_in_text_is_not_a_heading(self):
+        content = "E = mc2 is famous.\n== Derivation ==\nMaths."
+        assert extract_intro(content) == "E = mc2 is famous."
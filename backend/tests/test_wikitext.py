@@ -0,0 +1,60 @@
+# Wikitext conversion tests
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.wikitext import wikitext_to_text, extract_sections
+
+
+class TestWikitextToText:
+    """Test wikitext to plain text conversion"""
+
+    def test_links_keep_their_label(self):
+        """Test internal links are replaced by their text"""
+        assert wikitext_to_text("[[Guido van Rossum|Guido]] wrote [[Python]].") == "Guido wrote Python."
+
+    def test_nested_templates_removed(self):
+        """Test nested templates disappear entirely"""
+        text = "{{Infobox|name={{lang|en|Python}}}}Python is a language."
+        assert wikitext_to_text(text) == "Python is a language."
+
+    def test_references_and_comments_removed(self):
+        """Test references and HTML comments are dropped"""
+        text = "Fact.<ref name=\"a\">Source</ref> More.<ref name=\"b\"/><!-- hidden -->"
+        assert wikitext_to_text(text) == "Fact. More."
+
+    def test_emphasis_and_external_links(self):
+        """Test bold/italic quotes and external links are flattened"""
+        text = "'''Python''' is ''great'', see [https://python.org the site]."
+        assert wikitext_to_text(text) == "Python is great, see the site."
+
+    def test_apostrophe_before_bold(self):
+        """Test the French apostrophe-then-bold idiom keeps its apostrophe"""
+        assert wikitext_to_text("L''''intelligence artificielle''' (IA)") == "L'intelligence artificielle (IA)"
+
+    def test_files_and_categories_removed(self):
+        """Test media and category links are dropped"""
+        text = "[[File:Logo.png|thumb|The [[logo]]]]Text.\n[[Category:Languages]]"
+        assert wikitext_to_text(text) == "Text."
+
+    def test_headings_kept(self):
+        """Test section headings survive as == Title == lines"""
+        assert "== History ==" in wikitext_to_text("Lead.\n\n== History ==\nOld.")
+
+
+class TestExtractSections:
+    """Test section structure extraction"""
+
+    def test_sections_with_levels_and_offsets(self):
+        text = "Lead.\n\n== History ==\nOld.\n\n=== Early years ===\nOlder."
+        sections = extract_sections(text)
+        assert [s["title"] for s in sections] == ["Introduction", "History", "Early years"]
+        assert [s["level"] for s in sections] == [1, 2, 3]
+        assert text[sections[1]["offset"]:].startswith("== History ==")
+
+    def test_no_heading_only_lead(self):
+        assert extract_sections("Only a lead.") == [
+            {"index": 0, "title": "Introduction", "level": 1, "offset": 0}
+        ]